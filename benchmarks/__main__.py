@@ -0,0 +1,71 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import executor
+from benchmarks.casos import Contexto, selecionar
+
+
+def executar(args) -> int:
+    tamanhos = [int(t) for t in args.tamanhos.split(",") if t]
+    casos = selecionar(args.filtro)
+    resultados = {}
+    for tamanho in tamanhos:
+        print(f"\n=== {tamanho} linhas ({args.garcons} garçons) ===")
+        ctx = Contexto(tamanho, args.garcons, args.semente)
+        for caso in casos:
+            if caso.max_linhas and tamanho > caso.max_linhas and not args.todos:
+                print(f"  {caso.nome:<45} (ignorado acima de {caso.max_linhas} linhas; use --todos)")
+                continue
+            medicao = executor.medir(caso.preparar(ctx), repeticoes=args.repeticoes, aquecimento=args.aquecimento)
+            resultados[f"{caso.nome}@{tamanho}"] = {"caso": caso.nome, "grupo": caso.grupo, "linhas": tamanho, **medicao}
+            print(f"  {caso.nome:<45} {executor.formatar_tempo(medicao['mediana'])}  (min {executor.formatar_tempo(medicao['min']).strip()})")
+    meta = executor.metadados(tamanhos=tamanhos, garcons=args.garcons, semente=args.semente, repeticoes=args.repeticoes)
+    executor.salvar(args.saida, meta, resultados)
+    print(f"\nResultados salvos em {args.saida}")
+    return 0
+
+
+def comparar(args) -> int:
+    comparacoes = executor.comparar(executor.carregar(args.base), executor.carregar(args.novo), args.limite)
+    regressoes = 0
+    for c in comparacoes:
+        if c["situacao"] == "REGRESSÃO":
+            regressoes += 1
+        print(f"{c['situacao']:<10} {c['caso']:<55} {executor.formatar_tempo(c['base'])} -> "
+              f"{executor.formatar_tempo(c['novo'])}  ({c['razao']:.2f}x)")
+    print(f"\n{len(comparacoes)} casos comparados, {regressoes} regressões (limite {args.limite:.0%})")
+    return 1 if regressoes else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmarks do Sistema de Salários")
+    sub = parser.add_subparsers(dest="comando")
+
+    run = sub.add_parser("run", help="executa os benchmarks e salva o resultado em JSON")
+    run.add_argument("--tamanhos", default="1000,10000,100000", help="quantidades de linhas, separadas por vírgula")
+    run.add_argument("--garcons", type=int, default=300, help="quantidade de garçons distintos")
+    run.add_argument("--repeticoes", type=int, default=5)
+    run.add_argument("--aquecimento", type=int, default=1)
+    run.add_argument("--semente", type=int, default=42)
+    run.add_argument("--filtro", nargs="*", help="nomes (ou trechos) de casos ou grupos a executar")
+    run.add_argument("--todos", action="store_true", help="não ignora casos lentos nos tamanhos grandes")
+    run.add_argument("--saida", default="benchmark_resultados.json")
+
+    cmp = sub.add_parser("compare", help="compara dois resultados e aponta regressões")
+    cmp.add_argument("base")
+    cmp.add_argument("novo")
+    cmp.add_argument("--limite", type=float, default=0.10, help="variação tolerada da mediana (0.10 = 10%%)")
+
+    args = parser.parse_args(argv)
+    if args.comando == "compare":
+        return comparar(args)
+    if args.comando is None:
+        args = run.parse_args([])
+    return executar(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Callable, List
+import uuid
+from config.settings import settings
+from data.models.funcionario import Funcionario, HistoricoPagamento, HistoricoPresenca
+from benchmarks.dados import gerar_linhas
+
+FABRICA_FAKE = "data.repositories.fake_supabase:create_client"
+
+
+@dataclass
+class Caso:
+    nome: str
+    grupo: str
+    preparar: Callable[["Contexto"], Callable[[], object]]
+    max_linhas: int = None
+
+
+class Contexto:
+    """Dados sintéticos de um tamanho, gerados uma vez e compartilhados entre os casos."""
+
+    def __init__(self, tamanho: int, garcons: int, semente: int):
+        self.tamanho = tamanho
+        self.garcons = garcons
+        self.semente = semente
+        self.linhas = gerar_linhas(tamanho, garcons, semente)
+        self._funcionarios = None
+        self._repository = None
+
+    @property
+    def funcionarios(self) -> List[Funcionario]:
+        if self._funcionarios is None:
+            self._funcionarios = [Funcionario.from_dict(linha) for linha in self.linhas]
+        return self._funcionarios
+
+    @property
+    def dia(self) -> date:
+        return self.funcionarios[0].dia_trabalho
+
+    def repository(self):
+        if self._repository is None:
+            from data.repositories import fake_supabase
+            from data.repositories.instrumentacao import instrumentacao
+            from data.repositories.supabase_repository import SupabaseRepository
+            settings.SUPABASE_CLIENT_FACTORY = FABRICA_FAKE
+            settings.SUPABASE_PAGE_SIZE = self.tamanho + 1
+            settings.LOCAL_REPLICA_ENABLED = False
+            settings.QUERY_CACHE_ENABLED = False
+            instrumentacao.ativa = False
+            url = f"benchmark://{self.tamanho}/{self.semente}"
+            banco = fake_supabase.obter_banco(url)
+            banco.latencia_ms = banco.variacao_ms = 0
+            if not banco.tabela("funcionarios").linhas:
+                banco.carregar("funcionarios", self.linhas)
+            self._repository = SupabaseRepository()
+            self._repository._client = fake_supabase.create_client(url, "")
+        return self._repository
+
+
+# ===== DECODIFICAÇÃO =====
+def _from_dict(ctx: Contexto):
+    linhas = ctx.linhas
+    return lambda: [Funcionario.from_dict(linha) for linha in linhas]
+
+
+def _decodificador(metodo: str):
+    def preparar(ctx: Contexto):
+        from data.models import decoders
+        linhas = ctx.linhas
+        funcao = getattr(decoders, f"decodificar_{metodo}")
+        return lambda: funcao(linhas)
+    return preparar
+
+
+def linha_para_presenca(item: dict, hoje: date = None) -> HistoricoPresenca:
+    """Conversão linha a linha anterior aos decoders, mantida só como referência de comparação."""
+    hoje = hoje or date.today()
+    hp = HistoricoPresenca(
+        id=uuid.UUID(item["id"]) if item.get("id") else None,
+        nome=item.get("nome", ""),
+        dia_trabalho=date.fromisoformat(item["dia_trabalho"]) if item.get("dia_trabalho") else None,
+        hora_entrada=item.get("hora_entrada", "08:00"),
+        hora_saida=item.get("hora_saida", "16:00"),
+        valor_10_percent=float(item.get("valor_10_percent", 0)),
+        observacao=item.get("observacao", ""),
+        created_at=item.get("created_at"),
+        dia_formatado=""
+    )
+    if hp.dia_trabalho == hoje:
+        hp.dia_formatado = "Hoje"
+    elif hp.dia_trabalho == hoje - timedelta(days=1):
+        hp.dia_formatado = "Ontem"
+    else:
+        hp.dia_formatado = hp.dia_trabalho.strftime("%d/%m/%Y") if hp.dia_trabalho else ""
+    return hp
+
+
+def linha_para_pagamento(item: dict) -> HistoricoPagamento:
+    return HistoricoPagamento(
+        id=uuid.UUID(item["id"]) if item.get("id") else None,
+        nome=item.get("nome", ""),
+        dia_trabalho=date.fromisoformat(item["dia_trabalho"]) if item.get("dia_trabalho") else None,
+        valor_10_percent=float(item.get("valor_10_percent", 0)),
+        vale=float(item["vale"]) if item.get("vale") is not None else None,
+        tipo_pagamento=item.get("tipo_pagamento", "pix"),
+        pago=bool(item.get("pago", False)),
+        data_pagamento=item.get("updated_at"),
+        status_pagamento="Pago" if item.get("pago") else "Pendente",
+        numero_parcela=0
+    )
+
+
+def _por_linha(converter: Callable[[dict], object]):
+    def preparar(ctx: Contexto):
+        linhas = ctx.linhas
+        return lambda: [converter(linha) for linha in linhas]
+    return preparar
+
+
+def _frame(ctx: Contexto):
+    from data.models.frame import FuncionarioFrame
+    linhas = ctx.linhas
+    return lambda: FuncionarioFrame.from_dicts(linhas)
+
+
+# ===== AGREGAÇÕES DO REPOSITÓRIO =====
+def _agregacao(metodo: str, usar_rpc: bool = False, **kwargs):
+    def preparar(ctx: Contexto):
+        repo = ctx.repository()
+
+        def executar():
+            anterior = settings.SUPABASE_USE_RPC
+            settings.SUPABASE_USE_RPC = usar_rpc
+            try:
+                return getattr(repo, metodo)(**kwargs)
+            finally:
+                settings.SUPABASE_USE_RPC = anterior
+        return executar
+    return preparar
+
+
+# ===== RELATÓRIOS =====
+def _relatorio(formato: str):
+    def preparar(ctx: Contexto):
+        from services.report_generator import ReportGenerator
+        settings.REPORT_CACHE_ENABLED = False
+        report = ReportGenerator(ctx.funcionarios, ctx.dia)
+        return getattr(report, f"generate_{formato}")
+    return preparar
+
+
+def _relatorio_cacheado(ctx: Contexto):
+    from services.report_cache import ReportCache
+    from services import report_generator
+    settings.REPORT_CACHE_ENABLED = True
+    report_generator.report_cache = ReportCache(64 * 1024 * 1024)
+    report_generator.ReportGenerator(ctx.funcionarios, ctx.dia).generate_all(paralelo=False)
+    return lambda: report_generator.ReportGenerator(ctx.funcionarios, ctx.dia).generate_all()
+
+
+# ===== E-MAIL =====
+def _template_email(ctx: Contexto):
+    from services.email_service import EmailService
+    servico = EmailService("benchmark@example.com", "")
+    funcionarios = ctx.funcionarios
+    dia = ctx.dia
+    dia_semana = settings.DIAS_SEMANA.get(dia.weekday(), "")
+    total = sum(f.valor_10_percent for f in funcionarios)
+    return lambda: servico._criar_template_html(funcionarios, dia, dia_semana, total, "Observação de teste")
+
+
+CASOS: List[Caso] = [
+    Caso("funcionario.from_dict", "decodificacao", _from_dict),
+    Caso("decoders.decodificar_funcionarios", "decodificacao", _decodificador("funcionarios")),
+    Caso("referencia.linha_para_presenca", "decodificacao", _por_linha(linha_para_presenca)),
+    Caso("decoders.decodificar_presencas", "decodificacao", _decodificador("presencas")),
+    Caso("referencia.linha_para_pagamento", "decodificacao", _por_linha(linha_para_pagamento)),
+    Caso("decoders.decodificar_pagamentos", "decodificacao", _decodificador("pagamentos")),
+    Caso("funcionario_frame.from_dicts", "decodificacao", _frame),
+    Caso("repository.get_total_funcionarios", "agregacao", _agregacao("get_total_funcionarios")),
+    Caso("repository.listar_ranking_pagamentos", "agregacao", _agregacao("listar_ranking_pagamentos")),
+    Caso("repository.listar_data_cadastramento", "agregacao", _agregacao("listar_data_cadastramento")),
+    Caso("repository.listar_historico_presenca", "agregacao", _agregacao("listar_historico_presenca", limite=200)),
+    Caso("repository.listar_historico_pagamentos", "agregacao", _agregacao("listar_historico_pagamentos", limite=200)),
+    Caso("repository.get_historico_snapshot", "agregacao", _agregacao("get_historico_snapshot")),
+    Caso("repository.get_historico_snapshot[rpc]", "agregacao", _agregacao("get_historico_snapshot", usar_rpc=True)),
+    Caso("report.generate_docx", "relatorio", _relatorio("docx"), max_linhas=1000),
+    Caso("report.generate_excel", "relatorio", _relatorio("excel"), max_linhas=10000),
+    Caso("report.generate_csv", "relatorio", _relatorio("csv")),
+    Caso("report.generate_json", "relatorio", _relatorio("json")),
+    Caso("report.generate_xml", "relatorio", _relatorio("xml"), max_linhas=10000),
+    Caso("report.generate_html", "relatorio", _relatorio("html")),
+    Caso("report.generate_all", "relatorio", _relatorio("all"), max_linhas=1000),
+    Caso("report_cache.generate_all", "relatorio", _relatorio_cacheado, max_linhas=1000),
+    Caso("email._criar_template_html", "email", _template_email),
+]
+
+
+def selecionar(filtros: List[str] = None) -> List[Caso]:
+    if not filtros:
+        return list(CASOS)
+    return [caso for caso in CASOS if any(f in caso.nome or f == caso.grupo for f in filtros)]
+
@@ -0,0 +1,55 @@
+import random
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from typing import List
+from data.models.funcionario import Funcionario
+
+DIA_INICIAL = date(2025, 1, 1)
+PRENOMES = ("Ana", "Bruno", "Carla", "Diego", "Elisa", "Felipe", "Gabriela", "Heitor", "Isabela", "João",
+            "Karina", "Lucas", "Marina", "Nicolas", "Olívia", "Paulo", "Rafaela", "Samuel", "Tatiana", "Vitor")
+SOBRENOMES = ("Silva", "Souza", "Oliveira", "Santos", "Pereira", "Lima", "Costa", "Ferreira", "Almeida",
+              "Ribeiro", "Carvalho", "Gomes", "Martins", "Rocha", "Barbosa")
+
+
+def gerar_nomes(quantidade: int, semente: int = 42) -> List[str]:
+    aleatorio = random.Random(semente)
+    nomes = set()
+    while len(nomes) < quantidade:
+        nomes.add(f"{aleatorio.choice(PRENOMES)} {aleatorio.choice(SOBRENOMES)} {len(nomes) + 1}")
+    return sorted(nomes)
+
+
+def gerar_linhas(quantidade: int, garcons: int = 300, semente: int = 42) -> List[dict]:
+    """Linhas no formato devolvido pelo PostgREST para a tabela funcionarios (um turno por garçom e dia)."""
+    aleatorio = random.Random(semente)
+    nomes = gerar_nomes(min(garcons, quantidade), semente)
+    por_dia = max(1, len(nomes) // 3)
+    linhas = []
+    for i in range(quantidade):
+        dia = DIA_INICIAL + timedelta(days=i // por_dia)
+        nome = nomes[i % len(nomes)]
+        entrada = time(aleatorio.choice((8, 10, 12, 16, 18)), aleatorio.choice((0, 30)))
+        duracao = aleatorio.choice((6, 7, 8, 9))
+        saida = time((entrada.hour + duracao) % 24, entrada.minute)
+        criado = datetime.combine(dia, saida, tzinfo=timezone.utc).isoformat()
+        vale = round(aleatorio.uniform(10, 80), 2) if aleatorio.random() < 0.15 else None
+        linhas.append({
+            "id": str(uuid.UUID(int=aleatorio.getrandbits(128), version=4)),
+            "nome": nome,
+            "valor_10_percent": round(aleatorio.uniform(40, 320), 2),
+            "hora_entrada": entrada.strftime("%H:%M"),
+            "hora_saida": saida.strftime("%H:%M"),
+            "dia_trabalho": dia.isoformat(),
+            "observacao": "Cobriu o salão" if aleatorio.random() < 0.05 else "",
+            "vale": vale,
+            "tipo_vale": "pix" if vale else None,
+            "pago": aleatorio.random() < 0.6,
+            "tipo_pagamento": aleatorio.choice(("pix", "dinheiro")),
+            "created_at": criado,
+            "updated_at": criado
+        })
+    return linhas
+
+
+def gerar_funcionarios(quantidade: int, garcons: int = 300, semente: int = 42) -> List[Funcionario]:
+    return [Funcionario.from_dict(linha) for linha in gerar_linhas(quantidade, garcons, semente)]
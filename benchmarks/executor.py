@@ -0,0 +1,84 @@
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+
+def medir(funcao: Callable[[], object], repeticoes: int = 5, aquecimento: int = 1) -> dict:
+    for _ in range(aquecimento):
+        funcao()
+    tempos = []
+    gc_ativo = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            funcao()
+            tempos.append(time.perf_counter() - inicio)
+    finally:
+        if gc_ativo:
+            gc.enable()
+    return {
+        "repeticoes": repeticoes,
+        "min": min(tempos),
+        "mediana": statistics.median(tempos),
+        "media": statistics.fmean(tempos),
+        "max": max(tempos),
+        "desvio": statistics.stdev(tempos) if len(tempos) > 1 else 0.0
+    }
+
+
+def metadados(**extras) -> dict:
+    return {
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "implementacao": platform.python_implementation(),
+        "plataforma": platform.platform(),
+        "processador": platform.processor() or platform.machine(),
+        **extras
+    }
+
+
+def salvar(caminho: str, meta: dict, resultados: Dict[str, dict]):
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "resultados": resultados}, f, indent=2, ensure_ascii=False)
+
+
+def carregar(caminho: str) -> dict:
+    with open(caminho, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def comparar(base: dict, novo: dict, limite: float = 0.10) -> List[dict]:
+    comparacoes = []
+    for chave, atual in novo["resultados"].items():
+        anterior = base["resultados"].get(chave)
+        if anterior is None or not anterior.get("mediana"):
+            continue
+        razao = atual["mediana"] / anterior["mediana"]
+        if razao > 1 + limite:
+            situacao = "REGRESSÃO"
+        elif razao < 1 - limite:
+            situacao = "melhora"
+        else:
+            situacao = "="
+        comparacoes.append({
+            "caso": chave,
+            "base": anterior["mediana"],
+            "novo": atual["mediana"],
+            "razao": razao,
+            "situacao": situacao
+        })
+    return comparacoes
+
+
+def formatar_tempo(segundos: float) -> str:
+    if segundos < 1e-3:
+        return f"{segundos * 1e6:8.1f} µs"
+    if segundos < 1:
+        return f"{segundos * 1e3:8.2f} ms"
+    return f"{segundos:8.3f} s "
@@ -1,3 +1,4 @@
+import importlib
 import os
 from dotenv import load_dotenv
 
@@ -12,6 +13,12 @@ def get_secret(key: str, default: str = "") -> str:
         pass
     return os.environ.get(key, default)
 
+def get_bool_secret(key: str, default: bool = False) -> bool:
+    valor = get_secret(key, "")
+    if not valor:
+        return default
+    return valor.strip().lower() in ("1", "true", "sim", "yes", "on")
+
 class Settings:
     SUPABASE_URL: str = get_secret("SUPABASE_URL", "")
     SUPABASE_KEY: str = get_secret("SUPABASE_KEY", "")
@@ -21,7 +28,46 @@ class Settings:
     SMTP_HOST: str = get_secret("SMTP_HOST", "smtp.gmail.com")
     SMTP_PORT: int = int(get_secret("SMTP_PORT", "587") or "587")
     
-    REPORT_FORMATS: list = ["docx", "excel", "csv", "json", "xml", "html"]
+    SUPABASE_CLIENT_FACTORY: str = get_secret("SUPABASE_CLIENT_FACTORY", "supabase:create_client")
+    FAKE_SUPABASE_LATENCY_MS: float = float(get_secret("FAKE_SUPABASE_LATENCY_MS", "0") or "0")
+    FAKE_SUPABASE_JITTER_MS: float = float(get_secret("FAKE_SUPABASE_JITTER_MS", "0") or "0")
+    
+    SUPABASE_PAGE_SIZE: int = int(get_secret("SUPABASE_PAGE_SIZE", "1000") or "1000")
+    SUPABASE_USE_RPC: bool = get_bool_secret("SUPABASE_USE_RPC", True)
+    
+    LOCAL_REPLICA_ENABLED: bool = get_bool_secret("LOCAL_REPLICA_ENABLED", False)
+    LOCAL_REPLICA_PATH: str = get_secret("LOCAL_REPLICA_PATH", os.path.join(os.path.expanduser("~"), ".automacao_email", "replica.db"))
+    LOCAL_REPLICA_MAX_STALENESS: int = int(get_secret("LOCAL_REPLICA_MAX_STALENESS", "60") or "60")
+    LOCAL_REPLICA_RECONCILE_SECONDS: int = int(get_secret("LOCAL_REPLICA_RECONCILE_SECONDS", "900") or "900")
+    LOCAL_REPLICA_OVERLAP_SECONDS: float = float(get_secret("LOCAL_REPLICA_OVERLAP_SECONDS", "60") or "60")
+    
+    TABLE_BROWSER_PAGE_SIZE: int = int(get_secret("TABLE_BROWSER_PAGE_SIZE", "100") or "100")
+    TABLE_STATS_TTL_SECONDS: int = int(get_secret("TABLE_STATS_TTL_SECONDS", "30") or "30")
+    
+    INSTRUMENTATION_ENABLED: bool = get_bool_secret("INSTRUMENTATION_ENABLED", False)
+    
+    QUERY_CACHE_ENABLED: bool = get_bool_secret("QUERY_CACHE_ENABLED", False)
+    QUERY_CACHE_MAX_ENTRIES: int = int(get_secret("QUERY_CACHE_MAX_ENTRIES", "256") or "256")
+    
+    LOG_BUFFER_ENABLED: bool = get_bool_secret("LOG_BUFFER_ENABLED", True)
+    LOG_BUFFER_BATCH_SIZE: int = int(get_secret("LOG_BUFFER_BATCH_SIZE", "50") or "50")
+    LOG_BUFFER_FLUSH_SECONDS: float = float(get_secret("LOG_BUFFER_FLUSH_SECONDS", "2") or "2")
+    LOG_BUFFER_MAX_QUEUE: int = int(get_secret("LOG_BUFFER_MAX_QUEUE", "5000") or "5000")
+    LOG_BUFFER_SPILL_PATH: str = get_secret("LOG_BUFFER_SPILL_PATH", os.path.join(os.path.expanduser("~"), ".automacao_email", "logs_pendentes.jsonl"))
+    
+    LOGS_TAIL_INTERVAL_MS: int = int(get_secret("LOGS_TAIL_INTERVAL_MS", "3000") or "3000")
+    LOGS_TAIL_MAX_ROWS: int = int(get_secret("LOGS_TAIL_MAX_ROWS", "500") or "500")
+    LOGS_TAIL_OVERLAP_SECONDS: float = float(get_secret("LOGS_TAIL_OVERLAP_SECONDS", "10") or "10")
+    
+    REPORT_FORMATS: list = [f.strip() for f in get_secret("REPORT_FORMATS", "docx,excel,csv,json,xml,html").split(",") if f.strip()]
+    REPORT_PARALLEL: bool = get_bool_secret("REPORT_PARALLEL", False)
+    REPORT_WORKERS: int = int(get_secret("REPORT_WORKERS", "0") or "0")
+    REPORT_TIMEOUT_SECONDS: float = float(get_secret("REPORT_TIMEOUT_SECONDS", "60") or "60")
+    REPORT_CACHE_ENABLED: bool = get_bool_secret("REPORT_CACHE_ENABLED", True)
+    REPORT_CACHE_MEMORY_MB: int = int(get_secret("REPORT_CACHE_MEMORY_MB", "32") or "32")
+    REPORT_CACHE_DISK_MB: int = int(get_secret("REPORT_CACHE_DISK_MB", "0") or "0")
+    REPORT_CACHE_DISK_TTL_SECONDS: int = int(get_secret("REPORT_CACHE_DISK_TTL_SECONDS", "86400") or "86400")
+    REPORT_CACHE_DIR: str = get_secret("REPORT_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".automacao_email", "relatorios"))
     
     DIAS_SEMANA: dict = {
         0: "Segunda-feira",
@@ -34,3 +80,8 @@ class Settings:
     }
 
 settings = Settings()
+
+def create_supabase_client(url: str = None, key: str = None):
+    modulo, _, nome = settings.SUPABASE_CLIENT_FACTORY.partition(":")
+    fabrica = getattr(importlib.import_module(modulo), nome or "create_client")
+    return fabrica(url or settings.SUPABASE_URL, key or settings.SUPABASE_KEY)
@@ -0,0 +1,132 @@
+from datetime import date, timedelta
+from typing import Iterable, List, Optional
+import uuid
+from data.models.funcionario import Funcionario, HistoricoPresenca, HistoricoPagamento
+
+
+class UUIDPreguicoso(uuid.UUID):
+    """UUID que guarda o texto vindo do banco e só o converte para inteiro quando for comparado ou inspecionado."""
+
+    __slots__ = ("_texto",)
+
+    def __init__(self, texto: str):
+        object.__setattr__(self, "_texto", texto)
+
+    def __getattr__(self, nome):
+        if nome == "int":
+            valor = uuid.UUID(self._texto).int
+            object.__setattr__(self, "int", valor)
+            return valor
+        if nome == "is_safe":
+            return uuid.SafeUUID.unknown
+        raise AttributeError(nome)
+
+    def __str__(self) -> str:
+        texto = self._texto
+        if len(texto) == 36 and texto[8] == texto[13] == texto[18] == texto[23] == "-":
+            return texto.lower()
+        return super().__str__()
+
+    def __repr__(self) -> str:
+        return f"UUID('{self}')"
+
+    def __reduce__(self):
+        return uuid.UUID, (str(self),)
+
+
+class Decodificador:
+    """Converte linhas do Supabase em modelos, reaproveitando datas e rótulos já vistos na mesma chamada."""
+
+    def __init__(self, hoje: date = None, uuid_preguicoso: bool = True):
+        self.hoje = hoje or date.today()
+        self.uuid_preguicoso = uuid_preguicoso
+        self._datas = {}
+        self._rotulos = {
+            self.hoje.isoformat(): "Hoje",
+            (self.hoje - timedelta(days=1)).isoformat(): "Ontem"
+        }
+
+    # ===== CAMPOS =====
+    def data(self, texto: Optional[str]) -> Optional[date]:
+        if not texto:
+            return None
+        valor = self._datas.get(texto)
+        if valor is None:
+            valor = self._datas[texto] = date.fromisoformat(texto)
+        return valor
+
+    def uuid(self, texto: Optional[str]) -> Optional[uuid.UUID]:
+        if not texto:
+            return None
+        return UUIDPreguicoso(texto) if self.uuid_preguicoso else uuid.UUID(texto)
+
+    def rotulo_dia(self, texto: Optional[str]) -> str:
+        if not texto:
+            return ""
+        rotulo = self._rotulos.get(texto)
+        if rotulo is None:
+            rotulo = self._rotulos[texto] = self.data(texto).strftime("%d/%m/%Y")
+        return rotulo
+
+    # ===== MODELOS =====
+    def funcionario(self, data: dict) -> Funcionario:
+        vale = data.get("vale")
+        return Funcionario(
+            id=self.uuid(data.get("id")),
+            nome=data.get("nome", ""),
+            valor_10_percent=float(data.get("valor_10_percent", 0)),
+            hora_entrada=data.get("hora_entrada", "08:00"),
+            hora_saida=data.get("hora_saida", "16:00"),
+            dia_trabalho=self.data(data.get("dia_trabalho")),
+            observacao=data.get("observacao", ""),
+            vale=float(vale) if vale is not None else None,
+            tipo_vale=data.get("tipo_vale"),
+            pago=bool(data.get("pago", False)),
+            tipo_pagamento=data.get("tipo_pagamento", "pix"),
+            created_at=data.get("created_at"),
+            updated_at=data.get("updated_at")
+        )
+
+    def presenca(self, item: dict) -> HistoricoPresenca:
+        dia = item.get("dia_trabalho")
+        return HistoricoPresenca(
+            id=self.uuid(item.get("id")),
+            nome=item.get("nome", ""),
+            dia_trabalho=self.data(dia),
+            hora_entrada=item.get("hora_entrada", "08:00"),
+            hora_saida=item.get("hora_saida", "16:00"),
+            valor_10_percent=float(item.get("valor_10_percent", 0)),
+            observacao=item.get("observacao", ""),
+            created_at=item.get("created_at"),
+            dia_formatado=self.rotulo_dia(dia)
+        )
+
+    def pagamento(self, item: dict) -> HistoricoPagamento:
+        vale = item.get("vale")
+        return HistoricoPagamento(
+            id=self.uuid(item.get("id")),
+            nome=item.get("nome", ""),
+            dia_trabalho=self.data(item.get("dia_trabalho")),
+            valor_10_percent=float(item.get("valor_10_percent", 0)),
+            vale=float(vale) if vale is not None else None,
+            tipo_pagamento=item.get("tipo_pagamento", "pix"),
+            pago=bool(item.get("pago", False)),
+            data_pagamento=item.get("updated_at"),
+            status_pagamento="Pago" if item.get("pago") else "Pendente",
+            numero_parcela=0
+        )
+
+
+def decodificar_funcionarios(linhas: Iterable[dict], hoje: date = None) -> List[Funcionario]:
+    decodificador = Decodificador(hoje)
+    return [decodificador.funcionario(linha) for linha in linhas]
+
+
+def decodificar_presencas(linhas: Iterable[dict], hoje: date = None) -> List[HistoricoPresenca]:
+    decodificador = Decodificador(hoje)
+    return [decodificador.presenca(linha) for linha in linhas]
+
+
+def decodificar_pagamentos(linhas: Iterable[dict], hoje: date = None) -> List[HistoricoPagamento]:
+    decodificador = Decodificador(hoje)
+    return [decodificador.pagamento(linha) for linha in linhas]
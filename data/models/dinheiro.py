@@ -0,0 +1,82 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import Iterable
+
+CENTAVO = Decimal("0.01")
+
+
+def para_centavos(valor) -> int:
+    """Converte reais (float, str, Decimal ou int) em centavos inteiros, arredondando meio centavo para cima."""
+    if valor is None or valor == "":
+        return 0
+    if isinstance(valor, int) and not isinstance(valor, bool):
+        return valor * 100
+    if isinstance(valor, float):
+        return _float_para_centavos(valor)
+    try:
+        decimal = valor if isinstance(valor, Decimal) else Decimal(str(valor))
+    except InvalidOperation:
+        return 0
+    return int(decimal.quantize(CENTAVO, rounding=ROUND_HALF_UP) * 100)
+
+
+@lru_cache(maxsize=4096)
+def _float_para_centavos(valor: float) -> int:
+    try:
+        return int(Decimal(repr(valor)).quantize(CENTAVO, rounding=ROUND_HALF_UP) * 100)
+    except (InvalidOperation, ValueError, OverflowError):
+        return 0
+
+
+def de_centavos(centavos: int) -> float:
+    return centavos / 100
+
+
+def somar_centavos(valores: Iterable) -> int:
+    return sum(para_centavos(v) for v in valores)
+
+
+@dataclass(slots=True, frozen=True)
+class ResumoValores:
+    """Totais de um conjunto de registros, calculados uma vez em centavos e compartilhados por relatórios, e-mail e telas."""
+
+    quantidade: int = 0
+    pagos: int = 0
+    total_centavos: int = 0
+    vales_centavos: int = 0
+    pago_centavos: int = 0
+    pendente_centavos: int = 0
+
+    @classmethod
+    def de_funcionarios(cls, funcionarios: Iterable) -> "ResumoValores":
+        quantidade = pagos = total = vales = pago = 0
+        for f in funcionarios:
+            valor = f.valor_centavos
+            quantidade += 1
+            total += valor
+            vales += f.vale_centavos or 0
+            if f.pago:
+                pagos += 1
+                pago += valor
+        return cls(quantidade, pagos, total, vales, pago, total - pago)
+
+    @property
+    def pendentes(self) -> int:
+        return self.quantidade - self.pagos
+
+    @property
+    def total(self) -> float:
+        return de_centavos(self.total_centavos)
+
+    @property
+    def total_vales(self) -> float:
+        return de_centavos(self.vales_centavos)
+
+    @property
+    def total_pago(self) -> float:
+        return de_centavos(self.pago_centavos)
+
+    @property
+    def total_pendente(self) -> float:
+        return de_centavos(self.pendente_centavos)
@@ -0,0 +1,237 @@
+from array import array
+from datetime import date
+from typing import Iterable, Iterator, List, Optional
+import sys
+import uuid
+from data.models.dinheiro import ResumoValores, de_centavos, para_centavos
+from data.models.funcionario import Funcionario
+from data.models.horarios import duracao_turno, formatar_minutos, para_minutos
+
+UUID_NULO = bytes(16)
+SEM_VALE = -(2 ** 63)
+SEM_HORARIO = -1
+
+CAMPOS_FUNCIONARIO = ("id", "nome", "valor_10_percent", "hora_entrada", "hora_saida", "dia_trabalho",
+                      "observacao", "vale", "tipo_vale", "pago", "tipo_pagamento", "created_at", "updated_at")
+
+
+def _internar(valor: Optional[str]) -> Optional[str]:
+    return sys.intern(valor) if isinstance(valor, str) else valor
+
+
+class LinhaFuncionario:
+    """Visão leve de uma linha do FuncionarioFrame; os valores são lidos das colunas sob demanda."""
+
+    __slots__ = ("_frame", "_indice")
+
+    def __init__(self, frame: "FuncionarioFrame", indice: int):
+        self._frame = frame
+        self._indice = indice
+
+    @property
+    def id(self) -> Optional[uuid.UUID]:
+        bruto = bytes(self._frame._ids[self._indice * 16:(self._indice + 1) * 16])
+        return uuid.UUID(bytes=bruto) if bruto != UUID_NULO else None
+
+    @property
+    def nome(self) -> str:
+        return self._frame._nomes[self._indice]
+
+    @property
+    def valor_centavos(self) -> int:
+        return self._frame._valores[self._indice]
+
+    @property
+    def valor_10_percent(self) -> float:
+        return de_centavos(self.valor_centavos)
+
+    @property
+    def minutos_entrada(self) -> Optional[int]:
+        minutos = self._frame._minutos_entrada[self._indice]
+        return None if minutos == SEM_HORARIO else minutos
+
+    @property
+    def minutos_saida(self) -> Optional[int]:
+        minutos = self._frame._minutos_saida[self._indice]
+        return None if minutos == SEM_HORARIO else minutos
+
+    @property
+    def minutos_trabalhados(self) -> Optional[int]:
+        return duracao_turno(self.minutos_entrada, self.minutos_saida)
+
+    @property
+    def hora_entrada(self) -> str:
+        return formatar_minutos(self.minutos_entrada)
+
+    @property
+    def hora_saida(self) -> str:
+        return formatar_minutos(self.minutos_saida)
+
+    @property
+    def dia_trabalho(self) -> Optional[date]:
+        ordinal = self._frame._dias[self._indice]
+        return date.fromordinal(ordinal) if ordinal else None
+
+    @property
+    def observacao(self) -> str:
+        return self._frame._observacoes[self._indice]
+
+    @property
+    def vale_centavos(self) -> Optional[int]:
+        centavos = self._frame._vales[self._indice]
+        return None if centavos == SEM_VALE else centavos
+
+    @property
+    def vale(self) -> Optional[float]:
+        centavos = self.vale_centavos
+        return None if centavos is None else de_centavos(centavos)
+
+    @property
+    def tipo_vale(self) -> Optional[str]:
+        return self._frame._tipos_vale[self._indice]
+
+    @property
+    def pago(self) -> bool:
+        return bool(self._frame._pagos[self._indice])
+
+    @property
+    def tipo_pagamento(self) -> str:
+        return self._frame._tipos_pagamento[self._indice]
+
+    @property
+    def created_at(self) -> Optional[str]:
+        return self._frame._criados[self._indice]
+
+    @property
+    def updated_at(self) -> Optional[str]:
+        return self._frame._atualizados[self._indice]
+
+    def to_funcionario(self) -> Funcionario:
+        return Funcionario(**{campo: getattr(self, campo) for campo in CAMPOS_FUNCIONARIO})
+
+    def to_dict(self) -> dict:
+        return self.to_funcionario().to_dict()
+
+    def __repr__(self) -> str:
+        return f"LinhaFuncionario({self._indice}, nome={self.nome!r}, dia_trabalho={self.dia_trabalho!r})"
+
+
+class FuncionarioFrame:
+    """Linhas de funcionarios guardadas por coluna: valores em centavos, horários em minutos e datas em arrays tipados, UUIDs em bytes e textos internados."""
+
+    def __init__(self):
+        self._ids = bytearray()
+        self._nomes: List[str] = []
+        self._valores = array("q")
+        self._minutos_entrada = array("h")
+        self._minutos_saida = array("h")
+        self._dias = array("l")
+        self._observacoes: List[str] = []
+        self._vales = array("q")
+        self._tipos_vale: List[Optional[str]] = []
+        self._pagos = array("b")
+        self._tipos_pagamento: List[str] = []
+        self._criados: List[Optional[str]] = []
+        self._atualizados: List[Optional[str]] = []
+
+    # ===== CONSTRUÇÃO =====
+    @classmethod
+    def from_dicts(cls, linhas: Iterable[dict]) -> "FuncionarioFrame":
+        frame = cls()
+        for linha in linhas:
+            frame.append_dict(linha)
+        return frame
+
+    @classmethod
+    def from_funcionarios(cls, funcionarios: Iterable[Funcionario]) -> "FuncionarioFrame":
+        frame = cls()
+        for func in funcionarios:
+            frame.append(func)
+        return frame
+
+    def append_dict(self, data: dict):
+        dia = data.get("dia_trabalho")
+        self._adicionar(
+            uuid.UUID(data["id"]).bytes if data.get("id") else UUID_NULO,
+            data.get("nome", ""),
+            para_centavos(data.get("valor_10_percent", 0)),
+            para_minutos(data.get("hora_entrada", "08:00")),
+            para_minutos(data.get("hora_saida", "16:00")),
+            date.fromisoformat(dia).toordinal() if dia else 0,
+            data.get("observacao", ""),
+            para_centavos(data["vale"]) if data.get("vale") is not None else SEM_VALE,
+            data.get("tipo_vale"),
+            bool(data.get("pago", False)),
+            data.get("tipo_pagamento", "pix"),
+            data.get("created_at"),
+            data.get("updated_at")
+        )
+
+    def append(self, func: Funcionario):
+        self._adicionar(
+            func.id.bytes if func.id else UUID_NULO,
+            func.nome,
+            func.valor_centavos,
+            func.minutos_entrada,
+            func.minutos_saida,
+            func.dia_trabalho.toordinal() if func.dia_trabalho else 0,
+            func.observacao,
+            func.vale_centavos if func.vale_centavos is not None else SEM_VALE,
+            func.tipo_vale,
+            func.pago,
+            func.tipo_pagamento,
+            func.created_at,
+            func.updated_at
+        )
+
+    def _adicionar(self, id_bytes, nome, valor, minutos_entrada, minutos_saida, dia, observacao, vale,
+                   tipo_vale, pago, tipo_pagamento, created_at, updated_at):
+        self._ids += id_bytes
+        self._nomes.append(_internar(nome))
+        self._valores.append(valor)
+        self._minutos_entrada.append(SEM_HORARIO if minutos_entrada is None else minutos_entrada)
+        self._minutos_saida.append(SEM_HORARIO if minutos_saida is None else minutos_saida)
+        self._dias.append(dia)
+        self._observacoes.append(_internar(observacao))
+        self._vales.append(vale)
+        self._tipos_vale.append(_internar(tipo_vale))
+        self._pagos.append(1 if pago else 0)
+        self._tipos_pagamento.append(_internar(tipo_pagamento))
+        self._criados.append(created_at)
+        self._atualizados.append(updated_at)
+
+    # ===== ACESSO =====
+    def __len__(self) -> int:
+        return len(self._nomes)
+
+    def __getitem__(self, indice: int) -> LinhaFuncionario:
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("índice fora do FuncionarioFrame")
+        return LinhaFuncionario(self, indice)
+
+    def __iter__(self) -> Iterator[LinhaFuncionario]:
+        for indice in range(len(self)):
+            yield LinhaFuncionario(self, indice)
+
+    def to_funcionarios(self) -> List[Funcionario]:
+        return [linha.to_funcionario() for linha in self]
+
+    def minutos_trabalhados(self) -> List[Optional[int]]:
+        return [
+            None if entrada == SEM_HORARIO or saida == SEM_HORARIO else duracao_turno(entrada, saida)
+            for entrada, saida in zip(self._minutos_entrada, self._minutos_saida)
+        ]
+
+    def resumo(self) -> ResumoValores:
+        total = sum(self._valores)
+        pago = sum(valor for valor, pago in zip(self._valores, self._pagos) if pago)
+        vales = sum(vale for vale in self._vales if vale != SEM_VALE)
+        return ResumoValores(len(self), sum(self._pagos), total, vales, pago, total - pago)
+
+    def total_valores(self) -> float:
+        return de_centavos(sum(self._valores))
+
+    def nomes_unicos(self) -> set:
+        return set(self._nomes)
@@ -1,30 +1,89 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date
 from typing import Optional
 import uuid
+from data.models.dinheiro import de_centavos, para_centavos
+from data.models.horarios import duracao_turno, formatar_minutos, para_minutos
 
-@dataclass
+@dataclass(slots=True, init=False)
 class Funcionario:
+    """Horários em minutos desde a meia-noite e valores em centavos, convertidos uma vez na criação; os campos de exibição são derivados deles."""
+
     id: Optional[uuid.UUID] = None
     nome: str = ""
-    valor_10_percent: float = 0.0
-    hora_entrada: str = "08:00"
-    hora_saida: str = "16:00"
+    valor_centavos: int = 0
+    minutos_entrada: Optional[int] = None
+    minutos_saida: Optional[int] = None
     dia_trabalho: Optional[date] = None
     observacao: str = ""
-    vale: Optional[float] = None
+    vale_centavos: Optional[int] = None
     tipo_vale: Optional[str] = None
     pago: bool = False
     tipo_pagamento: str = "pix"
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
 
+    def __init__(self, id: Optional[uuid.UUID] = None, nome: str = "", valor_10_percent: float = 0.0,
+                 hora_entrada: str = "08:00", hora_saida: str = "16:00", dia_trabalho: Optional[date] = None,
+                 observacao: str = "", vale: Optional[float] = None, tipo_vale: Optional[str] = None,
+                 pago: bool = False, tipo_pagamento: str = "pix", created_at: Optional[str] = None,
+                 updated_at: Optional[str] = None):
+        self.id = id
+        self.nome = nome
+        self.valor_centavos = para_centavos(valor_10_percent)
+        self.minutos_entrada = para_minutos(hora_entrada)
+        self.minutos_saida = para_minutos(hora_saida)
+        self.dia_trabalho = dia_trabalho
+        self.observacao = observacao
+        self.vale_centavos = para_centavos(vale) if vale is not None else None
+        self.tipo_vale = tipo_vale
+        self.pago = pago
+        self.tipo_pagamento = tipo_pagamento
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+    @property
+    def hora_entrada(self) -> str:
+        return formatar_minutos(self.minutos_entrada)
+
+    @hora_entrada.setter
+    def hora_entrada(self, texto: str):
+        self.minutos_entrada = para_minutos(texto)
+
+    @property
+    def hora_saida(self) -> str:
+        return formatar_minutos(self.minutos_saida)
+
+    @hora_saida.setter
+    def hora_saida(self, texto: str):
+        self.minutos_saida = para_minutos(texto)
+
+    @property
+    def minutos_trabalhados(self) -> Optional[int]:
+        return duracao_turno(self.minutos_entrada, self.minutos_saida)
+
+    @property
+    def valor_10_percent(self) -> float:
+        return de_centavos(self.valor_centavos)
+
+    @valor_10_percent.setter
+    def valor_10_percent(self, valor: float):
+        self.valor_centavos = para_centavos(valor)
+
+    @property
+    def vale(self) -> Optional[float]:
+        return de_centavos(self.vale_centavos) if self.vale_centavos is not None else None
+
+    @vale.setter
+    def vale(self, valor: Optional[float]):
+        self.vale_centavos = para_centavos(valor) if valor is not None else None
+
     def to_dict(self) -> dict:
         data = {
             "nome": self.nome,
             "valor_10_percent": self.valor_10_percent,
-            "hora_entrada": self.hora_entrada,
-            "hora_saida": self.hora_saida,
+            "hora_entrada": self.hora_entrada or None,
+            "hora_saida": self.hora_saida or None,
             "dia_trabalho": self.dia_trabalho.isoformat() if self.dia_trabalho else None,
             "observacao": self.observacao,
             "vale": self.vale,
@@ -239,7 +298,7 @@ class Log:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class HistoricoPresenca:
     id: Optional[uuid.UUID] = None
     nome: str = ""
@@ -250,6 +309,10 @@ class HistoricoPresenca:
     observacao: str = ""
     created_at: Optional[str] = None
     dia_formatado: str = ""
+    minutos_trabalhados: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.minutos_trabalhados = duracao_turno(para_minutos(self.hora_entrada), para_minutos(self.hora_saida))
 
     @classmethod
     def from_dict(cls, data: dict) -> "HistoricoPresenca":
@@ -266,7 +329,7 @@ class HistoricoPresenca:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class HistoricoPagamento:
     id: Optional[uuid.UUID] = None
     nome: str = ""
@@ -358,6 +421,7 @@ class RankingPagamento:
     menor_diaria: float = 0.0
     total_pago: float = 0.0
     total_pendente: float = 0.0
+    total_horas: float = 0.0
 
     @classmethod
     def from_dict(cls, data: dict) -> "RankingPagamento":
@@ -370,5 +434,27 @@ class RankingPagamento:
             maior_diaria=float(data.get("maior_diaria", 0)),
             menor_diaria=float(data.get("menor_diaria", 0)),
             total_pago=float(data.get("total_pago", 0)),
-            total_pendente=float(data.get("total_pendente", 0))
+            total_pendente=float(data.get("total_pendente", 0)),
+            total_horas=float(data.get("total_horas") or 0)
         )
+
+
+@dataclass
+class HistoricoSnapshot:
+    total: TotalFuncionarios = None
+    ranking: list = None
+    presenca: list = None
+    pagamentos: list = None
+    cadastramento: list = None
+
+    def __post_init__(self):
+        if self.total is None:
+            self.total = TotalFuncionarios()
+        if self.ranking is None:
+            self.ranking = []
+        if self.presenca is None:
+            self.presenca = []
+        if self.pagamentos is None:
+            self.pagamentos = []
+        if self.cadastramento is None:
+            self.cadastramento = []
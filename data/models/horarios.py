@@ -0,0 +1,57 @@
+from functools import lru_cache
+from typing import Iterable, List, Optional
+
+MINUTOS_DIA = 24 * 60
+
+
+@lru_cache(maxsize=2048)
+def para_minutos(texto: Optional[str]) -> Optional[int]:
+    """Converte "HH:MM" ou "HH:MM:SS" (formato do TIME do Postgres) em minutos desde a meia-noite; vazio é None e texto ilegível levanta ValueError."""
+    if texto is None or not str(texto).strip():
+        return None
+    partes = str(texto).strip().split(":")
+    try:
+        if not 2 <= len(partes) <= 3:
+            raise ValueError
+        horas, minutos = int(partes[0]), int(partes[1])
+        segundos = float(partes[2]) if len(partes) == 3 else 0
+    except ValueError:
+        raise ValueError(f"Horário inválido: {texto!r} (use HH:MM)") from None
+    # 24:00 é o fim do dia que o TIME do Postgres aceita; equivale à meia-noite
+    if (horas, minutos, segundos) == (24, 0, 0):
+        return 0
+    if not (0 <= horas <= 23 and 0 <= minutos <= 59 and 0 <= segundos < 60):
+        raise ValueError(f"Horário fora do intervalo 00:00-23:59: {texto!r}")
+    return horas * 60 + minutos
+
+
+def formatar_minutos(minutos: Optional[int]) -> str:
+    if minutos is None:
+        return ""
+    return f"{minutos // 60:02d}:{minutos % 60:02d}"
+
+
+def duracao_turno(entrada: Optional[int], saida: Optional[int]) -> Optional[int]:
+    """Minutos entre entrada e saída; saída menor que a entrada é turno que vira a noite."""
+    if entrada is None or saida is None:
+        return None
+    duracao = saida - entrada
+    return duracao + MINUTOS_DIA if duracao < 0 else duracao
+
+
+def formatar_duracao(minutos: Optional[int]) -> str:
+    if minutos is None:
+        return "-"
+    return f"{minutos // 60}h{minutos % 60:02d}"
+
+
+def minutos_trabalhados(funcionarios: Iterable) -> List[Optional[int]]:
+    return [duracao_turno(f.minutos_entrada, f.minutos_saida) for f in funcionarios]
+
+
+def total_minutos(minutos: Iterable[Optional[int]]) -> int:
+    return sum(m for m in minutos if m is not None)
+
+
+def horas(minutos: Optional[int]) -> Optional[float]:
+    return round(minutos / 60, 2) if minutos is not None else None
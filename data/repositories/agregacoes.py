@@ -0,0 +1,141 @@
+from datetime import date
+from typing import Iterable, List, Optional
+from data.models.dinheiro import de_centavos, para_centavos
+from data.models.horarios import duracao_turno, para_minutos
+from data.models.funcionario import TotalFuncionarios, DataCadastramento, RankingPagamento
+
+COLUNAS_HISTORICO = ("id", "nome", "dia_trabalho", "hora_entrada", "hora_saida", "valor_10_percent",
+                     "observacao", "vale", "tipo_pagamento", "pago", "created_at", "updated_at")
+
+
+class AgregadorHistorico:
+    """Acumula linhas de funcionarios uma a uma e produz os totais, o ranking e o cadastramento."""
+
+    def __init__(self):
+        self.nomes_unicos = set()
+        self.dias_unicos = set()
+        self.total_registros = 0
+        self.total_centavos = 0
+        self.pago_centavos = 0
+        self.pendente_centavos = 0
+        self.total_minutos = 0
+        self.primeiro_registro: Optional[str] = None
+        self.ultimo_registro: Optional[str] = None
+        self.por_funcionario = {}
+
+    def adicionar(self, item: dict):
+        self._acumular(
+            item.get("nome", ""),
+            item.get("dia_trabalho"),
+            para_centavos(item.get("valor_10_percent")),
+            bool(item.get("pago")),
+            item.get("created_at"),
+            duracao_turno(para_minutos(item.get("hora_entrada")), para_minutos(item.get("hora_saida")))
+        )
+
+    def _acumular(self, nome: str, dia: Optional[str], valor: int, pago: bool, criado: Optional[str], minutos: Optional[int]):
+        self.total_registros += 1
+        self.nomes_unicos.add(nome)
+        self.total_centavos += valor
+        if pago:
+            self.pago_centavos += valor
+        else:
+            self.pendente_centavos += valor
+        if minutos is not None:
+            self.total_minutos += minutos
+        if dia:
+            self.dias_unicos.add(dia)
+            if self.primeiro_registro is None or dia < self.primeiro_registro:
+                self.primeiro_registro = dia
+            if self.ultimo_registro is None or dia > self.ultimo_registro:
+                self.ultimo_registro = dia
+
+        func = self.por_funcionario.get(nome)
+        if func is None:
+            func = self.por_funcionario[nome] = {
+                "dias_trabalhados": 0,
+                "total_recebido": 0,
+                "maior_diaria": 0,
+                "menor_diaria": None,
+                "total_pago": 0,
+                "total_pendente": 0,
+                "total_minutos": 0,
+                "primeiro_dia": None,
+                "ultimo_dia": None,
+                "data_cadastro": None,
+                "dias": set()
+            }
+        func["dias_trabalhados"] += 1
+        func["total_recebido"] += valor
+        if valor > func["maior_diaria"]:
+            func["maior_diaria"] = valor
+        if func["menor_diaria"] is None or valor < func["menor_diaria"]:
+            func["menor_diaria"] = valor
+        if pago:
+            func["total_pago"] += valor
+        else:
+            func["total_pendente"] += valor
+        if minutos is not None:
+            func["total_minutos"] += minutos
+        if dia:
+            func["dias"].add(dia)
+            if func["primeiro_dia"] is None or dia < func["primeiro_dia"]:
+                func["primeiro_dia"] = dia
+            if func["ultimo_dia"] is None or dia > func["ultimo_dia"]:
+                func["ultimo_dia"] = dia
+        if criado and (func["data_cadastro"] is None or criado < func["data_cadastro"]):
+            func["data_cadastro"] = criado
+
+    def adicionar_todos(self, linhas: Iterable[dict]) -> "AgregadorHistorico":
+        for item in linhas:
+            self.adicionar(item)
+        return self
+
+    def total(self) -> TotalFuncionarios:
+        if not self.total_registros:
+            return TotalFuncionarios()
+        return TotalFuncionarios(
+            total_cadastrados=len(self.nomes_unicos),
+            total_registros=self.total_registros,
+            total_dias_trabalhados=len(self.dias_unicos),
+            total_geral_pago=de_centavos(self.total_centavos),
+            total_pago=de_centavos(self.pago_centavos),
+            total_pendente=de_centavos(self.pendente_centavos),
+            primeiro_registro=date.fromisoformat(self.primeiro_registro) if self.primeiro_registro else None,
+            ultimo_registro=date.fromisoformat(self.ultimo_registro) if self.ultimo_registro else None
+        )
+
+    def ranking(self) -> List[RankingPagamento]:
+        resultados = []
+        for nome, func in self.por_funcionario.items():
+            resultados.append(RankingPagamento(
+                nome=nome,
+                dias_trabalhados=func["dias_trabalhados"],
+                total_recebido=de_centavos(func["total_recebido"]),
+                media_diaria=de_centavos(func["total_recebido"]) / func["dias_trabalhados"] if func["dias_trabalhados"] > 0 else 0,
+                maior_diaria=de_centavos(func["maior_diaria"]),
+                menor_diaria=de_centavos(func["menor_diaria"] or 0),
+                total_pago=de_centavos(func["total_pago"]),
+                total_pendente=de_centavos(func["total_pendente"]),
+                total_horas=func["total_minutos"] / 60
+            ))
+        resultados.sort(key=lambda x: (-x.total_recebido, x.nome))
+        for i, rp in enumerate(resultados, 1):
+            rp.posicao = i
+        return resultados
+
+    def cadastramento(self) -> List[DataCadastramento]:
+        resultados = []
+        for nome, func in self.por_funcionario.items():
+            resultados.append(DataCadastramento(
+                nome=nome,
+                primeiro_dia_trabalho=date.fromisoformat(func["primeiro_dia"]) if func["primeiro_dia"] else None,
+                ultimo_dia_trabalho=date.fromisoformat(func["ultimo_dia"]) if func["ultimo_dia"] else None,
+                total_dias_trabalhados=func["dias_trabalhados"],
+                total_recebido=de_centavos(func["total_recebido"]),
+                data_cadastro_banco=func["data_cadastro"],
+                dias_trabalhados=sorted(func["dias"])
+            ))
+        resultados.sort(key=lambda x: x.nome)
+        resultados.sort(key=lambda x: x.primeiro_dia_trabalho or date.min, reverse=True)
+        return resultados
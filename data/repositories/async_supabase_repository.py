@@ -0,0 +1,38 @@
+import asyncio
+import functools
+from typing import Any, Awaitable, Dict
+from data.repositories.supabase_repository import SupabaseRepository
+
+
+class AsyncSupabaseRepository:
+    """Versão assíncrona do SupabaseRepository: mesmos métodos e modelos, executados fora da thread principal."""
+
+    def __init__(self, repository: SupabaseRepository = None):
+        self.repository = repository or SupabaseRepository()
+
+    def __getattr__(self, nome: str):
+        if nome == "repository":
+            raise AttributeError(nome)
+        metodo = getattr(self.repository, nome)
+        if nome.startswith("_") or not callable(metodo):
+            return metodo
+
+        @functools.wraps(metodo)
+        async def chamar(*args, **kwargs):
+            return await asyncio.to_thread(metodo, *args, **kwargs)
+        return chamar
+
+    # ===== CONSULTAS CONCORRENTES =====
+    async def gather(self, return_exceptions: bool = False, **consultas: Awaitable) -> Dict[str, Any]:
+        self.repository.client
+        resultados = await asyncio.gather(*consultas.values(), return_exceptions=return_exceptions)
+        return dict(zip(consultas.keys(), resultados))
+
+    # ===== FACHADA SÍNCRONA (Tkinter / Streamlit) =====
+    def executar(self, aguardavel: Awaitable) -> Any:
+        async def _aguardar():
+            return await aguardavel
+        return asyncio.run(_aguardar())
+
+    def executar_em_paralelo(self, return_exceptions: bool = False, **consultas: Awaitable) -> Dict[str, Any]:
+        return asyncio.run(self.gather(return_exceptions=return_exceptions, **consultas))
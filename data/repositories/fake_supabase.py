@@ -0,0 +1,483 @@
+import dataclasses
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional
+
+COLUNAS_INDEXADAS = ("id", "nome", "dia_trabalho", "acao", "tabela")
+CHAVES_UNICAS = {"funcionarios": ("nome", "dia_trabalho")}
+TABELAS_COM_UPDATED_AT = ("funcionarios", "funcionarios_base", "configuracoes", "observacoes_gerais")
+
+
+class FakeAPIError(Exception):
+    """Erro no formato do postgrest.APIError (message + code)."""
+
+    def __init__(self, message: str, code: str = None):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+
+def _agora() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+# ===== TABELA EM MEMÓRIA =====
+class TabelaEmMemoria:
+    def __init__(self, nome: str):
+        self.nome = nome
+        self.linhas: Dict[str, dict] = {}
+        self.indices: Dict[str, Dict[object, set]] = {coluna: {} for coluna in COLUNAS_INDEXADAS}
+
+    def _indexar(self, linha: dict):
+        for coluna, indice in self.indices.items():
+            if coluna in linha:
+                indice.setdefault(linha[coluna], set()).add(linha["id"])
+
+    def _desindexar(self, linha: dict):
+        for coluna, indice in self.indices.items():
+            ids = indice.get(linha.get(coluna))
+            if ids is not None:
+                ids.discard(linha["id"])
+                if not ids:
+                    del indice[linha.get(coluna)]
+
+    def candidatos(self, coluna: str, valor) -> Optional[set]:
+        if coluna not in self.indices:
+            return None
+        return set(self.indices[coluna].get(valor, ()))
+
+    def buscar_unica(self, colunas: tuple, linha: dict) -> Optional[dict]:
+        ids = None
+        for coluna in colunas:
+            encontrados = self.candidatos(coluna, linha.get(coluna))
+            if encontrados is None:
+                encontrados = {i for i, l in self.linhas.items() if l.get(coluna) == linha.get(coluna)}
+            ids = encontrados if ids is None else ids & encontrados
+            if not ids:
+                return None
+        return self.linhas[next(iter(ids))] if ids else None
+
+    def inserir(self, linha: dict) -> dict:
+        linha = dict(linha)
+        linha["id"] = str(linha.get("id") or uuid.uuid4())
+        linha.setdefault("created_at", _agora())
+        if self.nome in TABELAS_COM_UPDATED_AT:
+            linha.setdefault("updated_at", linha["created_at"])
+        if linha["id"] in self.linhas:
+            raise FakeAPIError(f'duplicate key value violates unique constraint "{self.nome}_pkey"', "23505")
+        unica = CHAVES_UNICAS.get(self.nome)
+        if unica and self.buscar_unica(unica, linha) is not None:
+            raise FakeAPIError(f'duplicate key value violates unique constraint "{self.nome}_{"_".join(unica)}_key"', "23505")
+        self.linhas[linha["id"]] = linha
+        self._indexar(linha)
+        return linha
+
+    def atualizar(self, linha: dict, valores: dict) -> dict:
+        self._desindexar(linha)
+        linha.update({k: v for k, v in valores.items() if k != "id"})
+        if self.nome in TABELAS_COM_UPDATED_AT:
+            linha["updated_at"] = _agora()
+        self._indexar(linha)
+        return linha
+
+    def remover(self, linha: dict):
+        self._desindexar(linha)
+        del self.linhas[linha["id"]]
+
+
+# ===== FILTROS =====
+def _converter(valor_linha, valor):
+    if isinstance(valor, str):
+        if valor.startswith('"') and valor.endswith('"'):
+            valor = valor[1:-1]
+        if isinstance(valor_linha, bool):
+            return valor.lower() == "true"
+        if isinstance(valor_linha, (int, float)):
+            try:
+                return float(valor)
+            except ValueError:
+                return valor
+    if isinstance(valor, (date, uuid.UUID)):
+        return str(valor)
+    return valor
+
+
+def _like(padrao: str, ignorar_caixa: bool):
+    regex = "".join(".*" if c == "%" else "." if c == "_" else re.escape(c) for c in padrao)
+    return re.compile(f"^{regex}$", re.IGNORECASE | re.DOTALL if ignorar_caixa else re.DOTALL)
+
+
+def _comparar(operador: str, valor_linha, valor) -> bool:
+    if operador == "in":
+        return valor_linha in {_converter(valor_linha, v) for v in valor}
+    if operador == "is":
+        return valor_linha is None if str(valor).lower() == "null" else valor_linha == _converter(valor_linha, valor)
+    if operador in ("like", "ilike"):
+        return valor_linha is not None and bool(_like(str(valor), operador == "ilike").match(str(valor_linha)))
+    valor = _converter(valor_linha, valor)
+    if operador == "eq":
+        return valor_linha == valor
+    if operador == "neq":
+        return valor_linha != valor
+    if valor_linha is None:
+        return False
+    if operador == "gt":
+        return valor_linha > valor
+    if operador == "gte":
+        return valor_linha >= valor
+    if operador == "lt":
+        return valor_linha < valor
+    if operador == "lte":
+        return valor_linha <= valor
+    raise FakeAPIError(f"operador não suportado: {operador}", "PGRST100")
+
+
+def _dividir_nivel(texto: str) -> List[str]:
+    partes, atual, nivel, aspas = [], "", 0, False
+    for c in texto:
+        if c == '"':
+            aspas = not aspas
+        elif not aspas and c == "(":
+            nivel += 1
+        elif not aspas and c == ")":
+            nivel -= 1
+        elif not aspas and c == "," and nivel == 0:
+            partes.append(atual)
+            atual = ""
+            continue
+        atual += c
+    if atual:
+        partes.append(atual)
+    return partes
+
+
+def _compilar_logica(texto: str, conector: str = "or") -> Callable[[dict], bool]:
+    condicoes = []
+    for parte in _dividir_nivel(texto):
+        parte = parte.strip()
+        if parte.startswith(("and(", "or(")) and parte.endswith(")"):
+            interno = parte[parte.index("(") + 1:-1]
+            condicoes.append(_compilar_logica(interno, parte[:parte.index("(")]))
+            continue
+        coluna, operador, valor = parte.split(".", 2)
+        if operador == "in":
+            valor = [v.strip() for v in _dividir_nivel(valor.strip("()"))]
+        condicoes.append(lambda linha, c=coluna, o=operador, v=valor: _comparar(o, linha.get(c), v))
+    if conector == "and":
+        return lambda linha: all(cond(linha) for cond in condicoes)
+    return lambda linha: any(cond(linha) for cond in condicoes)
+
+
+# ===== QUERY BUILDER =====
+class FakeQuery:
+    def __init__(self, banco: "FakeSupabase", tabela: str):
+        self._banco = banco
+        self._tabela = tabela
+        self._operacao = "select"
+        self._colunas = None
+        self._dados = None
+        self._on_conflict = None
+        self._count = None
+        self._head = False
+        self._igualdades = []
+        self._filtros = []
+        self._ordens = []
+        self._inicio = 0
+        self._limite = None
+
+    # ----- operações -----
+    def select(self, *colunas: str, count: str = None, head: bool = False) -> "FakeQuery":
+        nomes = [c.strip() for coluna in colunas for c in coluna.split(",") if c.strip()]
+        self._colunas = None if not nomes or "*" in nomes else nomes
+        self._count = count
+        self._head = bool(head)
+        return self
+
+    def insert(self, dados, **kwargs) -> "FakeQuery":
+        self._operacao, self._dados = "insert", dados
+        return self
+
+    def upsert(self, dados, on_conflict: str = "", **kwargs) -> "FakeQuery":
+        self._operacao, self._dados = "upsert", dados
+        self._on_conflict = tuple(c.strip() for c in on_conflict.split(",") if c.strip()) or ("id",)
+        return self
+
+    def update(self, dados: dict, **kwargs) -> "FakeQuery":
+        self._operacao, self._dados = "update", dados
+        return self
+
+    def delete(self, **kwargs) -> "FakeQuery":
+        self._operacao = "delete"
+        return self
+
+    # ----- filtros -----
+    def _filtro(self, coluna: str, operador: str, valor) -> "FakeQuery":
+        self._filtros.append(lambda linha: _comparar(operador, linha.get(coluna), valor))
+        return self
+
+    def eq(self, coluna: str, valor) -> "FakeQuery":
+        self._igualdades.append((coluna, valor))
+        return self._filtro(coluna, "eq", valor)
+
+    def neq(self, coluna: str, valor) -> "FakeQuery":
+        return self._filtro(coluna, "neq", valor)
+
+    def gt(self, coluna: str, valor) -> "FakeQuery":
+        return self._filtro(coluna, "gt", valor)
+
+    def gte(self, coluna: str, valor) -> "FakeQuery":
+        return self._filtro(coluna, "gte", valor)
+
+    def lt(self, coluna: str, valor) -> "FakeQuery":
+        return self._filtro(coluna, "lt", valor)
+
+    def lte(self, coluna: str, valor) -> "FakeQuery":
+        return self._filtro(coluna, "lte", valor)
+
+    def like(self, coluna: str, padrao: str) -> "FakeQuery":
+        return self._filtro(coluna, "like", padrao)
+
+    def ilike(self, coluna: str, padrao: str) -> "FakeQuery":
+        return self._filtro(coluna, "ilike", padrao)
+
+    def in_(self, coluna: str, valores) -> "FakeQuery":
+        return self._filtro(coluna, "in", list(valores))
+
+    def is_(self, coluna: str, valor) -> "FakeQuery":
+        return self._filtro(coluna, "is", valor)
+
+    def or_(self, filtros: str, **kwargs) -> "FakeQuery":
+        self._filtros.append(_compilar_logica(filtros))
+        return self
+
+    # ----- ordenação e paginação -----
+    def order(self, coluna: str, desc: bool = False, **kwargs) -> "FakeQuery":
+        self._ordens.append((coluna, desc))
+        return self
+
+    def limit(self, quantidade: int, **kwargs) -> "FakeQuery":
+        self._limite = quantidade
+        return self
+
+    def range(self, inicio: int, fim: int, **kwargs) -> "FakeQuery":
+        self._inicio = inicio
+        self._limite = fim - inicio + 1
+        return self
+
+    # ----- execução -----
+    def _selecionar(self, tabela: TabelaEmMemoria) -> List[dict]:
+        ids = None
+        for coluna, valor in self._igualdades:
+            candidatos = tabela.candidatos(coluna, _converter("", valor) if not isinstance(valor, (int, float, bool)) else valor)
+            if candidatos is not None:
+                ids = candidatos if ids is None else ids & candidatos
+        linhas = [tabela.linhas[i] for i in ids] if ids is not None else list(tabela.linhas.values())
+        return [linha for linha in linhas if all(f(linha) for f in self._filtros)]
+
+    def _ordenar(self, linhas: List[dict]) -> List[dict]:
+        for coluna, desc in reversed(self._ordens):
+            linhas.sort(key=lambda l: (l.get(coluna) is None, l.get(coluna) if l.get(coluna) is not None else 0), reverse=desc)
+        return linhas
+
+    def _projetar(self, linha: dict) -> dict:
+        if self._colunas is None:
+            return dict(linha)
+        return {coluna: linha.get(coluna) for coluna in self._colunas}
+
+    def execute(self):
+        self._banco.simular_latencia()
+        with self._banco.lock:
+            tabela = self._banco.tabela(self._tabela)
+            if self._operacao == "insert":
+                dados = self._dados if isinstance(self._dados, list) else [self._dados]
+                resultado = [dict(tabela.inserir(self._serializar(d))) for d in dados]
+                return SimpleNamespace(data=resultado, count=None)
+            if self._operacao == "upsert":
+                dados = self._dados if isinstance(self._dados, list) else [self._dados]
+                resultado = []
+                for d in dados:
+                    d = self._serializar(d)
+                    existente = tabela.buscar_unica(self._on_conflict, d)
+                    linha = tabela.atualizar(existente, d) if existente else tabela.inserir(d)
+                    resultado.append(dict(linha))
+                return SimpleNamespace(data=resultado, count=None)
+
+            linhas = self._ordenar(self._selecionar(tabela))
+            total = len(linhas)
+            if self._limite is not None or self._inicio:
+                fim = None if self._limite is None else self._inicio + self._limite
+                linhas = linhas[self._inicio:fim]
+            if self._operacao == "update":
+                valores = self._serializar(self._dados)
+                resultado = [dict(tabela.atualizar(linha, valores)) for linha in linhas]
+                return SimpleNamespace(data=resultado, count=None)
+            if self._operacao == "delete":
+                resultado = [dict(linha) for linha in linhas]
+                for linha in linhas:
+                    tabela.remover(linha)
+                return SimpleNamespace(data=resultado, count=None)
+            dados = [] if self._head else [self._projetar(linha) for linha in linhas]
+            return SimpleNamespace(data=dados, count=total if self._count else None)
+
+    @staticmethod
+    def _serializar(dados: dict) -> dict:
+        resultado = {}
+        for chave, valor in dados.items():
+            if isinstance(valor, (date, datetime)):
+                valor = valor.isoformat()
+            elif isinstance(valor, uuid.UUID):
+                valor = str(valor)
+            elif valor == "now()":
+                valor = _agora()
+            resultado[chave] = valor
+        return resultado
+
+
+class FakeRpc:
+    def __init__(self, banco: "FakeSupabase", nome: str, params: dict):
+        self._banco = banco
+        self._nome = nome
+        self._params = params or {}
+
+    def execute(self):
+        self._banco.simular_latencia()
+        funcao = self._banco.rpcs.get(self._nome)
+        if funcao is None:
+            raise FakeAPIError(f"Could not find the function public.{self._nome}", "PGRST202")
+        with self._banco.lock:
+            return SimpleNamespace(data=funcao(self._banco, **self._params), count=None)
+
+
+# ===== AUTENTICAÇÃO =====
+class FakeAuth:
+    def __init__(self, banco: "FakeSupabase"):
+        self._banco = banco
+        self._sessao = None
+
+    def sign_up(self, credenciais: dict):
+        self._banco.simular_latencia()
+        self._banco.usuarios[credenciais["email"]] = credenciais["password"]
+        return SimpleNamespace(user=SimpleNamespace(id=str(uuid.uuid4()), email=credenciais["email"]), session=None)
+
+    def sign_in_with_password(self, credenciais: dict):
+        self._banco.simular_latencia()
+        email = credenciais.get("email")
+        if self._banco.usuarios and self._banco.usuarios.get(email) != credenciais.get("password"):
+            raise FakeAPIError("Invalid login credentials", "invalid_credentials")
+        usuario = SimpleNamespace(id=str(uuid.uuid5(uuid.NAMESPACE_URL, email or "")), email=email)
+        self._sessao = SimpleNamespace(access_token=uuid.uuid4().hex, user=usuario)
+        return SimpleNamespace(user=usuario, session=self._sessao)
+
+    def sign_out(self):
+        self._sessao = None
+
+    def get_session(self):
+        return self._sessao
+
+    def reset_password_for_email(self, email: str):
+        self._banco.simular_latencia()
+
+
+# ===== BANCO / CLIENTE =====
+class FakeSupabase:
+    """Backend em memória compartilhado por todos os clientes criados com a mesma URL."""
+
+    def __init__(self, latencia_ms: float = 0.0, variacao_ms: float = 0.0, semente: int = 0):
+        self.lock = threading.RLock()
+        self.tabelas: Dict[str, TabelaEmMemoria] = {}
+        self.usuarios: Dict[str, str] = {}
+        self.rpcs: Dict[str, Callable] = dict(RPCS_PADRAO)
+        self.latencia_ms = latencia_ms
+        self.variacao_ms = variacao_ms
+        self._aleatorio = random.Random(semente)
+        self.requisicoes = 0
+
+    def tabela(self, nome: str) -> TabelaEmMemoria:
+        if nome not in self.tabelas:
+            self.tabelas[nome] = TabelaEmMemoria(nome)
+        return self.tabelas[nome]
+
+    def carregar(self, tabela: str, linhas: List[dict]):
+        with self.lock:
+            destino = self.tabela(tabela)
+            for linha in linhas:
+                destino.inserir(FakeQuery._serializar(linha))
+
+    def limpar(self):
+        with self.lock:
+            self.tabelas.clear()
+            self.requisicoes = 0
+
+    def simular_latencia(self):
+        with self.lock:
+            self.requisicoes += 1
+            atraso = self.latencia_ms + (self._aleatorio.uniform(0, self.variacao_ms) if self.variacao_ms else 0)
+        if atraso > 0:
+            time.sleep(atraso / 1000)
+
+
+class FakeClient:
+    def __init__(self, banco: FakeSupabase):
+        self.banco = banco
+        self.auth = FakeAuth(banco)
+
+    def table(self, nome: str) -> FakeQuery:
+        return FakeQuery(self.banco, nome)
+
+    def from_(self, nome: str) -> FakeQuery:
+        return self.table(nome)
+
+    def rpc(self, nome: str, params: dict = None) -> FakeRpc:
+        return FakeRpc(self.banco, nome, params)
+
+
+_bancos: Dict[str, FakeSupabase] = {}
+_lock_bancos = threading.Lock()
+
+
+def obter_banco(url: str = "") -> FakeSupabase:
+    from config.settings import settings
+    with _lock_bancos:
+        if url not in _bancos:
+            _bancos[url] = FakeSupabase(settings.FAKE_SUPABASE_LATENCY_MS, settings.FAKE_SUPABASE_JITTER_MS)
+        return _bancos[url]
+
+
+def create_client(url: str, key: str, options=None) -> FakeClient:
+    return FakeClient(obter_banco(url))
+
+
+# ===== RPCs DE AGREGAÇÃO (mesma semântica de sql/agregacoes_rpc.sql) =====
+def _para_json(obj) -> dict:
+    return {k: v.isoformat() if isinstance(v, date) else v for k, v in dataclasses.asdict(obj).items()}
+
+
+def _agregar(banco: FakeSupabase, p_inicio: str = None, p_fim: str = None):
+    from data.repositories.agregacoes import AgregadorHistorico
+    linhas = [l for l in banco.tabela("funcionarios").linhas.values()
+              if (not p_inicio or (l.get("dia_trabalho") or "") >= p_inicio) and (not p_fim or (l.get("dia_trabalho") or "") <= p_fim)]
+    return AgregadorHistorico().adicionar_todos(linhas)
+
+
+def _rpc_total(banco, p_inicio=None, p_fim=None):
+    return [_para_json(_agregar(banco, p_inicio, p_fim).total())]
+
+
+def _rpc_ranking(banco, p_inicio=None, p_fim=None):
+    return [_para_json(r) for r in _agregar(banco, p_inicio, p_fim).ranking()]
+
+
+def _rpc_cadastramento(banco, p_inicio=None, p_fim=None):
+    return [_para_json(c) for c in _agregar(banco, p_inicio, p_fim).cadastramento()]
+
+
+RPCS_PADRAO = {
+    "fn_total_funcionarios": _rpc_total,
+    "fn_ranking_pagamentos": _rpc_ranking,
+    "fn_data_cadastramento": _rpc_cadastramento,
+}
@@ -0,0 +1,249 @@
+import functools
+import inspect
+import json
+import threading
+import time
+from collections import deque
+from typing import Dict, List
+from config.settings import settings
+
+MAX_AMOSTRAS = 1024
+QUANTIS = (0.5, 0.9, 0.99)
+
+
+class MetricasMetodo:
+    def __init__(self, nome: str):
+        self.nome = nome
+        self.chamadas = 0
+        self.erros = 0
+        self.tempo_total = 0.0
+        self.amostras = deque(maxlen=MAX_AMOSTRAS)
+        self.linhas = 0
+        self.bytes = 0
+        self.consultas = 0
+        self.tempo_consultas = 0.0
+
+    def quantil(self, q: float) -> float:
+        if not self.amostras:
+            return 0.0
+        ordenadas = sorted(self.amostras)
+        return ordenadas[min(len(ordenadas) - 1, int(q * len(ordenadas)))]
+
+    def to_dict(self) -> dict:
+        return {
+            "metodo": self.nome,
+            "chamadas": self.chamadas,
+            "erros": self.erros,
+            "tempo_total": self.tempo_total,
+            "p50": self.quantil(0.5),
+            "p90": self.quantil(0.9),
+            "p99": self.quantil(0.99),
+            "linhas": self.linhas,
+            "bytes": self.bytes,
+            "consultas": self.consultas,
+            "tempo_consultas": self.tempo_consultas
+        }
+
+
+class Instrumentacao:
+    """Métricas por método do repositório: chamadas, tempos, linhas devolvidas e bytes recebidos do backend."""
+
+    def __init__(self):
+        self.ativa = settings.INSTRUMENTATION_ENABLED
+        self._metricas: Dict[str, MetricasMetodo] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _pilha(self) -> List[MetricasMetodo]:
+        if not hasattr(self._local, "pilha"):
+            self._local.pilha = []
+        return self._local.pilha
+
+    def _metricas_de(self, nome: str) -> MetricasMetodo:
+        metricas = self._metricas.get(nome)
+        if metricas is None:
+            with self._lock:
+                metricas = self._metricas.setdefault(nome, MetricasMetodo(nome))
+        return metricas
+
+    # ===== REGISTRO =====
+    def iniciar(self, nome: str) -> MetricasMetodo:
+        metricas = self._metricas_de(nome)
+        self._pilha().append(metricas)
+        return metricas
+
+    def finalizar(self, metricas: MetricasMetodo, inicio: float, linhas: int, erro: bool):
+        duracao = time.perf_counter() - inicio
+        pilha = self._pilha()
+        for i in range(len(pilha) - 1, -1, -1):
+            if pilha[i] is metricas:
+                del pilha[i]
+                break
+        with self._lock:
+            metricas.chamadas += 1
+            metricas.erros += 1 if erro else 0
+            metricas.tempo_total += duracao
+            metricas.amostras.append(duracao)
+            metricas.linhas += linhas
+
+    def registrar_consulta(self, linhas: int, tamanho: int, duracao: float):
+        pilha = self._pilha()
+        if not pilha:
+            return
+        with self._lock:
+            for metricas in set(pilha):
+                metricas.consultas += 1
+                metricas.bytes += tamanho
+                metricas.tempo_consultas += duracao
+
+    def limpar(self):
+        with self._lock:
+            self._metricas.clear()
+
+    # ===== EXPORTAÇÃO =====
+    def snapshot(self) -> List[dict]:
+        with self._lock:
+            metricas = list(self._metricas.values())
+        return sorted((m.to_dict() for m in metricas), key=lambda m: -m["tempo_total"])
+
+    def exportar_json(self) -> str:
+        return json.dumps({"gerado_em": time.time(), "metodos": self.snapshot()}, indent=2, ensure_ascii=False)
+
+    def exportar_prometheus(self, prefixo: str = "supabase_repository") -> str:
+        with self._lock:
+            metricas = sorted(self._metricas.values(), key=lambda m: m.nome)
+            linhas = [
+                f"# HELP {prefixo}_duration_seconds Tempo de parede por chamada do método.",
+                f"# TYPE {prefixo}_duration_seconds summary"
+            ]
+            for m in metricas:
+                for q in QUANTIS:
+                    linhas.append(f'{prefixo}_duration_seconds{{metodo="{m.nome}",quantile="{q}"}} {m.quantil(q):.6f}')
+                linhas.append(f'{prefixo}_duration_seconds_sum{{metodo="{m.nome}"}} {m.tempo_total:.6f}')
+                linhas.append(f'{prefixo}_duration_seconds_count{{metodo="{m.nome}"}} {m.chamadas}')
+            contadores = (
+                ("errors_total", "Chamadas que terminaram com exceção.", "erros"),
+                ("rows_total", "Linhas (ou objetos) devolvidos pelo método.", "linhas"),
+                ("bytes_received_total", "Bytes de JSON recebidos do backend (estimados pela primeira linha quando o corpo HTTP não está disponível).", "bytes"),
+                ("queries_total", "Requisições feitas ao backend.", "consultas"),
+                ("query_seconds_total", "Tempo gasto esperando o backend.", "tempo_consultas")
+            )
+            for sufixo, ajuda, atributo in contadores:
+                linhas.append(f"# HELP {prefixo}_{sufixo} {ajuda}")
+                linhas.append(f"# TYPE {prefixo}_{sufixo} counter")
+                for m in metricas:
+                    linhas.append(f'{prefixo}_{sufixo}{{metodo="{m.nome}"}} {getattr(m, atributo)}')
+        return "\n".join(linhas) + "\n"
+
+
+instrumentacao = Instrumentacao()
+
+
+def _contar_linhas(resultado) -> int:
+    if resultado is None or isinstance(resultado, (bool, int, float, str)):
+        return 0
+    if isinstance(resultado, (list, tuple, set, dict)):
+        return len(resultado)
+    return 1
+
+
+def _tamanho_resposta(resposta, dados) -> int:
+    # Usa o corpo HTTP quando o cliente o expõe; senão estima pela primeira linha, sem serializar a resposta inteira
+    conteudo = getattr(resposta, "content", None)
+    if isinstance(conteudo, (bytes, str)):
+        return len(conteudo)
+    if not dados:
+        return 0
+    if isinstance(dados, list):
+        return len(json.dumps(dados[0], default=str).encode("utf-8")) * len(dados)
+    return len(json.dumps(dados, default=str).encode("utf-8"))
+
+
+def instrumentado(metodo):
+    nome = metodo.__qualname__
+
+    if inspect.isgeneratorfunction(metodo):
+        @functools.wraps(metodo)
+        def gerador(*args, **kwargs):
+            if not instrumentacao.ativa:
+                yield from metodo(*args, **kwargs)
+                return
+            metricas = instrumentacao.iniciar(nome)
+            inicio = time.perf_counter()
+            linhas = 0
+            erro = False
+            try:
+                for item in metodo(*args, **kwargs):
+                    linhas += 1
+                    yield item
+            except BaseException:
+                erro = True
+                raise
+            finally:
+                instrumentacao.finalizar(metricas, inicio, linhas, erro)
+        return gerador
+
+    @functools.wraps(metodo)
+    def wrapper(*args, **kwargs):
+        if not instrumentacao.ativa:
+            return metodo(*args, **kwargs)
+        metricas = instrumentacao.iniciar(nome)
+        inicio = time.perf_counter()
+        resultado = None
+        erro = False
+        try:
+            resultado = metodo(*args, **kwargs)
+            return resultado
+        except BaseException:
+            erro = True
+            raise
+        finally:
+            instrumentacao.finalizar(metricas, inicio, _contar_linhas(resultado), erro)
+    return wrapper
+
+
+def instrumentar_classe(cls):
+    for nome, atributo in list(vars(cls).items()):
+        if nome.startswith("_") or not inspect.isfunction(atributo):
+            continue
+        setattr(cls, nome, instrumentado(atributo))
+    return cls
+
+
+# ===== CLIENTE INSTRUMENTADO =====
+class _ConsultaInstrumentada:
+    def __init__(self, builder):
+        self._builder = builder
+
+    def execute(self):
+        inicio = time.perf_counter()
+        resposta = self._builder.execute()
+        duracao = time.perf_counter() - inicio
+        dados = getattr(resposta, "data", None)
+        instrumentacao.registrar_consulta(_contar_linhas(dados), _tamanho_resposta(resposta, dados), duracao)
+        return resposta
+
+    def __getattr__(self, nome):
+        atributo = getattr(self._builder, nome)
+        if not callable(atributo):
+            return atributo
+
+        @functools.wraps(atributo)
+        def encadear(*args, **kwargs):
+            resultado = atributo(*args, **kwargs)
+            return _ConsultaInstrumentada(resultado) if hasattr(resultado, "execute") else resultado
+        return encadear
+
+
+class ClienteInstrumentado:
+    def __init__(self, cliente):
+        self._cliente = cliente
+
+    def table(self, nome: str) -> _ConsultaInstrumentada:
+        return _ConsultaInstrumentada(self._cliente.table(nome))
+
+    def rpc(self, *args, **kwargs) -> _ConsultaInstrumentada:
+        return _ConsultaInstrumentada(self._cliente.rpc(*args, **kwargs))
+
+    def __getattr__(self, nome):
+        return getattr(self._cliente, nome)
@@ -0,0 +1,187 @@
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Iterable, List, Optional
+from data.models.funcionario import Funcionario
+from data.models.decoders import decodificar_funcionarios
+
+COLUNAS_FUNCIONARIOS = (
+    "id", "nome", "valor_10_percent", "hora_entrada", "hora_saida", "dia_trabalho",
+    "observacao", "vale", "tipo_vale", "pago", "tipo_pagamento", "created_at", "updated_at"
+)
+
+
+class ReplicaLocal:
+    """Cópia local (SQLite) da tabela funcionarios, sincronizada por updated_at."""
+
+    def __init__(self, caminho: str, max_staleness: int = 60, intervalo_reconciliacao: int = 900, sobreposicao: float = 60.0):
+        caminho = os.path.expanduser(caminho)
+        self.caminho = caminho
+        self.max_staleness = max_staleness
+        self.intervalo_reconciliacao = intervalo_reconciliacao
+        self.sobreposicao = timedelta(seconds=sobreposicao)
+        self._lock = threading.RLock()
+        if caminho != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+        self._conn = sqlite3.connect(caminho, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._criar_esquema()
+
+    def _criar_esquema(self):
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS funcionarios (
+                    id TEXT PRIMARY KEY,
+                    nome TEXT NOT NULL,
+                    valor_10_percent REAL NOT NULL DEFAULT 0,
+                    hora_entrada TEXT,
+                    hora_saida TEXT,
+                    dia_trabalho TEXT,
+                    observacao TEXT,
+                    vale REAL,
+                    tipo_vale TEXT,
+                    pago INTEGER NOT NULL DEFAULT 0,
+                    tipo_pagamento TEXT,
+                    created_at TEXT,
+                    updated_at TEXT
+                )""")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_funcionarios_dia ON funcionarios(dia_trabalho)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_funcionarios_nome ON funcionarios(nome)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS sync_estado (chave TEXT PRIMARY KEY, valor TEXT)")
+
+    # ===== ESTADO DA SINCRONIZAÇÃO =====
+    def _get_estado(self, chave: str) -> Optional[str]:
+        row = self._conn.execute("SELECT valor FROM sync_estado WHERE chave = ?", (chave,)).fetchone()
+        return row["valor"] if row else None
+
+    def _set_estado(self, chave: str, valor: str):
+        self._conn.execute(
+            "INSERT INTO sync_estado (chave, valor) VALUES (?, ?) "
+            "ON CONFLICT(chave) DO UPDATE SET valor = excluded.valor",
+            (chave, valor)
+        )
+
+    @property
+    def watermark(self) -> Optional[str]:
+        with self._lock:
+            return self._get_estado("watermark")
+
+    @property
+    def inicio_sincronizacao(self) -> Optional[str]:
+        # updated_at é carimbado no início da transação; uma linha que comita depois da leitura fica atrás do watermark, então a releitura recua a janela
+        watermark = self.watermark
+        if not watermark:
+            return None
+        try:
+            return (datetime.fromisoformat(watermark.replace("Z", "+00:00")) - self.sobreposicao).isoformat()
+        except ValueError:
+            return watermark
+
+    def ja_sincronizada(self) -> bool:
+        with self._lock:
+            return self._get_estado("ultima_sincronizacao") is not None
+
+    def precisa_sincronizar(self) -> bool:
+        with self._lock:
+            ultima = self._get_estado("ultima_sincronizacao")
+        return ultima is None or time.time() - float(ultima) >= self.max_staleness
+
+    def precisa_reconciliar(self) -> bool:
+        with self._lock:
+            ultima = self._get_estado("ultima_reconciliacao")
+        return ultima is None or time.time() - float(ultima) >= self.intervalo_reconciliacao
+
+    def marcar_sincronizada(self, reconciliada: bool = False):
+        agora = str(time.time())
+        with self._lock, self._conn:
+            self._set_estado("ultima_sincronizacao", agora)
+            if reconciliada:
+                self._set_estado("ultima_reconciliacao", agora)
+
+    # ===== ESCRITA =====
+    def aplicar(self, linhas: Iterable[dict], avancar_watermark: bool = True) -> int:
+        total = 0
+        with self._lock, self._conn:
+            watermark = self._get_estado("watermark")
+            for item in linhas:
+                if not item.get("id"):
+                    continue
+                self._conn.execute(
+                    f"INSERT OR REPLACE INTO funcionarios ({', '.join(COLUNAS_FUNCIONARIOS)}) "
+                    f"VALUES ({', '.join('?' for _ in COLUNAS_FUNCIONARIOS)})",
+                    (
+                        str(item["id"]),
+                        item.get("nome", ""),
+                        float(item.get("valor_10_percent") or 0),
+                        item.get("hora_entrada"),
+                        item.get("hora_saida"),
+                        item.get("dia_trabalho"),
+                        item.get("observacao"),
+                        float(item["vale"]) if item.get("vale") is not None else None,
+                        item.get("tipo_vale"),
+                        1 if item.get("pago") else 0,
+                        item.get("tipo_pagamento"),
+                        item.get("created_at"),
+                        item.get("updated_at")
+                    )
+                )
+                total += 1
+                atualizado = item.get("updated_at")
+                if avancar_watermark and atualizado and (watermark is None or atualizado > watermark):
+                    watermark = atualizado
+            if avancar_watermark and watermark:
+                self._set_estado("watermark", watermark)
+        return total
+
+    def remover(self, ids: Iterable[str]) -> int:
+        ids = [str(i) for i in ids]
+        if not ids:
+            return 0
+        with self._lock, self._conn:
+            cur = self._conn.executemany("DELETE FROM funcionarios WHERE id = ?", [(i,) for i in ids])
+            return cur.rowcount
+
+    def reconciliar(self, ids_remotos: Iterable[str]) -> int:
+        remotos = {str(i) for i in ids_remotos}
+        with self._lock:
+            locais = [row["id"] for row in self._conn.execute("SELECT id FROM funcionarios")]
+        removidos = self.remover([i for i in locais if i not in remotos])
+        with self._lock, self._conn:
+            self._set_estado("ultima_reconciliacao", str(time.time()))
+        return removidos
+
+    def limpar(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM funcionarios")
+            self._conn.execute("DELETE FROM sync_estado")
+
+    # ===== LEITURA =====
+    def _para_dict(self, row: sqlite3.Row) -> dict:
+        item = dict(row)
+        item["pago"] = bool(item["pago"])
+        return item
+
+    def listar(self, dia_trabalho: date = None) -> List[Funcionario]:
+        with self._lock:
+            if dia_trabalho:
+                rows = self._conn.execute(
+                    "SELECT * FROM funcionarios WHERE dia_trabalho = ?", (dia_trabalho.isoformat(),)
+                ).fetchall()
+            else:
+                rows = self._conn.execute("SELECT * FROM funcionarios ORDER BY nome").fetchall()
+        return decodificar_funcionarios(self._para_dict(row) for row in rows)
+
+    def buscar_por_nome(self, nome: str) -> List[Funcionario]:
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM funcionarios WHERE nome = ?", (nome,)).fetchall()
+        return decodificar_funcionarios(self._para_dict(row) for row in rows)
+
+    def contar(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM funcionarios").fetchone()[0]
+
+    def fechar(self):
+        with self._lock:
+            self._conn.close()
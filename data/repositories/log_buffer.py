@@ -0,0 +1,178 @@
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class BufferLogs:
+    """Fila limitada de logs enviada em lotes por uma thread; o que não puder ser enviado vai para um arquivo local."""
+
+    def __init__(self, enviar: Callable[[List[dict]], None], caminho_pendentes: str,
+                 tamanho_lote: int = 50, intervalo: float = 2.0, capacidade: int = 5000):
+        self.enviar = enviar
+        self.caminho_pendentes = os.path.expanduser(caminho_pendentes)
+        self.tamanho_lote = tamanho_lote
+        self.intervalo = intervalo
+        self._fila = queue.Queue(maxsize=capacidade)
+        self._lock_envio = threading.Lock()
+        self._lock_arquivo = threading.Lock()
+        self._parar = threading.Event()
+        self._thread = threading.Thread(target=self._executar, name="buffer-logs", daemon=True)
+        self._thread.start()
+
+    def registrar(self, registro: dict):
+        try:
+            self._fila.put_nowait(registro)
+        except queue.Full:
+            self._salvar_pendentes([registro])
+
+    # ===== THREAD DE ENVIO =====
+    def _executar(self):
+        while not self._parar.is_set():
+            lote, marcadores = self._coletar_lote()
+            if lote:
+                with self._lock_envio:
+                    self._enviar_lote(lote)
+            # A fila é FIFO: tudo que entrou antes do marcador de um flush já foi enviado ao chegar aqui
+            for marcador in marcadores:
+                marcador.set()
+
+    def _coletar_lote(self) -> Tuple[List[dict], List[threading.Event]]:
+        lote = []
+        marcadores = []
+        limite = time.monotonic() + self.intervalo
+        while len(lote) < self.tamanho_lote:
+            restante = limite - time.monotonic()
+            if restante <= 0 or self._parar.is_set():
+                break
+            try:
+                item = self._fila.get(timeout=restante)
+            except queue.Empty:
+                break
+            if isinstance(item, threading.Event):
+                marcadores.append(item)
+                break
+            lote.append(item)
+        return lote, marcadores
+
+    def _enviar_lote(self, lote: List[dict]) -> bool:
+        try:
+            self.enviar(lote)
+        except Exception as e:
+            print(f"Erro ao enviar logs, salvando localmente: {e}")
+            self._salvar_pendentes(lote)
+            return False
+        self._reenviar_pendentes()
+        return True
+
+    # ===== ARQUIVO DE PENDENTES =====
+    def _salvar_pendentes(self, lote: List[dict]):
+        try:
+            with self._lock_arquivo:
+                os.makedirs(os.path.dirname(os.path.abspath(self.caminho_pendentes)), exist_ok=True)
+                with open(self.caminho_pendentes, "a", encoding="utf-8") as f:
+                    for registro in lote:
+                        f.write(json.dumps(registro, ensure_ascii=False, default=str) + "\n")
+        except Exception as e:
+            print(f"Erro ao salvar logs pendentes: {e}")
+
+    def _reenviar_pendentes(self):
+        with self._lock_arquivo:
+            if not os.path.exists(self.caminho_pendentes):
+                return
+            enviados = 0
+            try:
+                with open(self.caminho_pendentes, encoding="utf-8") as f:
+                    pendentes = [json.loads(linha) for linha in f if linha.strip()]
+                while enviados < len(pendentes):
+                    self.enviar(pendentes[enviados:enviados + self.tamanho_lote])
+                    enviados += self.tamanho_lote
+                os.remove(self.caminho_pendentes)
+            except Exception as e:
+                print(f"Erro ao reenviar logs pendentes: {e}")
+                if enviados:
+                    with open(self.caminho_pendentes, "w", encoding="utf-8") as f:
+                        for registro in pendentes[enviados:]:
+                            f.write(json.dumps(registro, ensure_ascii=False, default=str) + "\n")
+
+    # ===== FLUSH / ENCERRAMENTO =====
+    def flush(self, timeout: float = 30.0):
+        """Espera o envio de tudo que foi registrado até agora, inclusive o lote que a thread já tirou da fila."""
+        if self._thread.is_alive() and not self._parar.is_set():
+            marcador = threading.Event()
+            try:
+                self._fila.put(marcador, timeout=timeout)
+            except queue.Full:
+                pass
+            else:
+                if marcador.wait(timeout):
+                    return
+        self._esvaziar()
+
+    def _esvaziar(self):
+        with self._lock_envio:
+            while True:
+                lote = []
+                while len(lote) < self.tamanho_lote:
+                    try:
+                        item = self._fila.get_nowait()
+                    except queue.Empty:
+                        break
+                    if isinstance(item, threading.Event):
+                        item.set()
+                    else:
+                        lote.append(item)
+                if not lote:
+                    break
+                self._enviar_lote(lote)
+
+    def fechar(self, timeout: float = 5.0):
+        self._parar.set()
+        self._thread.join(timeout)
+        self.flush()
+
+
+def _instante(texto: str) -> datetime:
+    return datetime.fromisoformat(texto.replace("Z", "+00:00"))
+
+
+class CursorLogs:
+    """Posição do tail de logs: maior created_at entregue e os ids já vistos dentro da janela de sobreposição."""
+
+    def __init__(self, sobreposicao: float = 10.0):
+        self.sobreposicao = timedelta(seconds=sobreposicao)
+        self.criado: Optional[datetime] = None
+        self.piso: Optional[datetime] = None
+        self._vistos: Dict[str, datetime] = {}
+
+    def __len__(self) -> int:
+        return len(self._vistos)
+
+    @property
+    def inicio(self) -> Optional[str]:
+        # O servidor carimba created_at na inserção; commits fora de ordem caem atrás do cursor, então a releitura recua a janela
+        return (self.criado - self.sobreposicao).isoformat() if self.criado else None
+
+    def filtrar_novos(self, logs: list, truncado: bool = False) -> list:
+        """Descarta os ids já entregues; `truncado` marca uma primeira leitura cortada pelo limite, cujas linhas mais antigas ficam de fora depois."""
+        novos = []
+        for log in logs:
+            log_id = str(log.id)
+            if log_id in self._vistos or not log.created_at:
+                continue
+            instante = _instante(log.created_at)
+            if self.piso is not None and instante < self.piso:
+                continue
+            novos.append(log)
+            self._vistos[log_id] = instante
+            if self.criado is None or instante > self.criado:
+                self.criado = instante
+        if truncado and novos and self.piso is None:
+            self.piso = _instante(novos[0].created_at)
+        if self.criado is not None:
+            limite = self.criado - self.sobreposicao
+            self._vistos = {log_id: instante for log_id, instante in self._vistos.items() if instante >= limite}
+        return novos
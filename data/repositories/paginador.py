@@ -0,0 +1,152 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+PAGINAS_EM_MEMORIA = 5
+
+COLUNAS_TABELAS = {
+    'funcionarios': ['id', 'nome', 'valor_10_percent', 'hora_entrada', 'hora_saida',
+                     'dia_trabalho', 'observacao', 'vale', 'tipo_vale', 'pago', 'tipo_pagamento', 'created_at'],
+    'configuracoes': ['id', 'email_destinatario', 'email_remetente', 'senha_app', 'smtp_host', 'smtp_port', 'created_at'],
+    'observacoes_gerais': ['id', 'dia_trabalho', 'observacao', 'created_at'],
+    'registros_trabalho': ['id', 'dia_trabalho', 'dia_semana', 'total_funcionarios', 'total_valores', 'email_enviado', 'data_envio'],
+    'logs': ['id', 'acao', 'tabela', 'registro_id', 'dados_anteriores', 'dados_novos', 'usuario', 'created_at']
+}
+
+# Só colunas TEXT aceitam ilike no Postgres; uuid, numéricas, booleanas, datas e jsonb são filtradas por igualdade
+COLUNAS_TEXTO = {
+    'funcionarios': {'nome', 'observacao', 'tipo_vale', 'tipo_pagamento'},
+    'configuracoes': {'email_destinatario', 'email_remetente', 'senha_app', 'smtp_host'},
+    'observacoes_gerais': {'observacao'},
+    'registros_trabalho': {'dia_semana'},
+    'logs': {'acao', 'tabela', 'registro_id', 'usuario'}
+}
+
+# Um único executor para a pré-carga de todos os paginadores (a interface web guarda um por tabela na sessão)
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="paginador")
+
+
+def filtro_coluna(tabela: str, coluna: str, texto: str, contem: bool = True) -> dict:
+    texto = (texto or "").strip()
+    if not coluna or not texto:
+        return {}
+    if contem and coluna in COLUNAS_TEXTO.get(tabela, ()):
+        return {coluna: ("ilike", f"%{texto}%")}
+    return {coluna: texto}
+
+
+class PaginadorTabela:
+    """Navega uma tabela por páginas (range no servidor), com ordenação e filtros remotos e a próxima página pré-carregada."""
+
+    def __init__(self, repository, tabela: str, colunas: List[str] = None, tamanho_pagina: int = 100,
+                 ordenar_por: str = None, desc: bool = None, filtros: dict = None, pre_carregar: bool = True):
+        self.repository = repository
+        self.tabela = tabela
+        self.colunas = colunas
+        self.tamanho_pagina = max(1, tamanho_pagina)
+        if ordenar_por is None:
+            ordenar_por = "created_at" if colunas and "created_at" in colunas else "id"
+        self.ordenar_por = ordenar_por
+        self.desc = (ordenar_por == "created_at") if desc is None else desc
+        self.filtros = dict(filtros or {})
+        self.pre_carregar = pre_carregar
+        self.pagina_atual = 0
+        self.total: Optional[int] = None
+        self._paginas: "OrderedDict[int, List[dict]]" = OrderedDict()
+        self._pendentes: Dict[int, Future] = {}
+        self._geracao = 0
+        self._lock = threading.Lock()
+
+    # ===== CONSULTA =====
+    def _buscar(self, numero: int, geracao: int) -> List[dict]:
+        inicio = numero * self.tamanho_pagina
+        try:
+            linhas, total = self.repository.listar_pagina(
+                self.tabela, inicio, inicio + self.tamanho_pagina - 1, colunas=self.colunas,
+                ordenar_por=self.ordenar_por, desc=self.desc, filtros=self.filtros,
+                contar=self.total is None
+            )
+        except Exception:
+            with self._lock:
+                if geracao == self._geracao:
+                    self._pendentes.pop(numero, None)
+            raise
+        with self._lock:
+            if geracao == self._geracao:
+                if total is not None:
+                    self.total = total
+                self._guardar(numero, linhas)
+                self._pendentes.pop(numero, None)
+        return linhas
+
+    def _guardar(self, numero: int, linhas: List[dict]):
+        self._paginas[numero] = linhas
+        self._paginas.move_to_end(numero)
+        while len(self._paginas) > PAGINAS_EM_MEMORIA:
+            self._paginas.popitem(last=False)
+
+    def _agendar(self, numero: int):
+        with self._lock:
+            if numero in self._paginas or numero in self._pendentes:
+                return
+            self._pendentes[numero] = _executor.submit(self._buscar, numero, self._geracao)
+
+    def pagina(self, numero: int = None) -> List[dict]:
+        numero = self.pagina_atual if numero is None else max(0, numero)
+        with self._lock:
+            linhas = self._paginas.get(numero)
+            if linhas is not None:
+                self._paginas.move_to_end(numero)
+            futuro = self._pendentes.get(numero)
+            geracao = self._geracao
+        if linhas is None:
+            linhas = futuro.result() if futuro is not None else self._buscar(numero, geracao)
+        self.pagina_atual = numero
+        if self.pre_carregar and numero + 1 < self.total_paginas:
+            self._agendar(numero + 1)
+        return linhas
+
+    # ===== NAVEGAÇÃO =====
+    @property
+    def total_paginas(self) -> int:
+        if not self.total:
+            return 1
+        return (self.total + self.tamanho_pagina - 1) // self.tamanho_pagina
+
+    def proxima(self) -> List[dict]:
+        return self.pagina(min(self.pagina_atual + 1, self.total_paginas - 1))
+
+    def anterior(self) -> List[dict]:
+        return self.pagina(max(self.pagina_atual - 1, 0))
+
+    def ordenar(self, coluna: str, desc: bool = None):
+        if desc is None:
+            desc = not self.desc if coluna == self.ordenar_por else False
+        self.ordenar_por = coluna
+        self.desc = desc
+        self.recarregar(manter_total=True)
+
+    def filtrar(self, filtros: dict = None):
+        self.filtros = dict(filtros or {})
+        self.recarregar()
+
+    def recarregar(self, manter_total: bool = False):
+        with self._lock:
+            self._geracao += 1
+            self._paginas.clear()
+            self._pendentes.clear()
+            if not manter_total:
+                self.total = None
+        self.pagina_atual = 0
+
+    def filtro_texto(self, coluna: str, texto: str, contem: bool = True):
+        self.filtrar(filtro_coluna(self.tabela, coluna, texto, contem))
+
+    def fechar(self):
+        with self._lock:
+            self._geracao += 1
+            for futuro in self._pendentes.values():
+                futuro.cancel()
+            self._pendentes.clear()
+            self._paginas.clear()
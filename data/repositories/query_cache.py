@@ -0,0 +1,103 @@
+import copy
+import functools
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Tuple
+
+_AUSENTE = object()
+
+
+class QueryCache:
+    """Cache LRU com TTL por entrada; cada entrada pertence a uma tabela para ser invalidada nas escritas."""
+
+    def __init__(self, max_entradas: int = 256):
+        self.max_entradas = max_entradas
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expiradas = 0
+        self.removidas = 0
+        self.invalidadas = 0
+
+    def get(self, chave) -> Tuple[bool, Any]:
+        with self._lock:
+            entrada = self._entradas.get(chave, _AUSENTE)
+            if entrada is _AUSENTE:
+                self.misses += 1
+                return False, None
+            expira_em, _, valor = entrada
+            if expira_em <= time.monotonic():
+                del self._entradas[chave]
+                self.expiradas += 1
+                self.misses += 1
+                return False, None
+            self._entradas.move_to_end(chave)
+            self.hits += 1
+            return True, copy.deepcopy(valor)
+
+    def set(self, chave, tabela: str, valor: Any, ttl: float):
+        with self._lock:
+            self._entradas[chave] = (time.monotonic() + ttl, tabela, copy.deepcopy(valor))
+            self._entradas.move_to_end(chave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+                self.removidas += 1
+
+    def invalidar(self, *tabelas: str):
+        with self._lock:
+            chaves = [chave for chave, (_, tabela, _) in self._entradas.items() if tabela in tabelas]
+            for chave in chaves:
+                del self._entradas[chave]
+            self.invalidadas += len(chaves)
+
+    def limpar(self):
+        with self._lock:
+            self._entradas.clear()
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            consultas = self.hits + self.misses
+            return {
+                "entradas": len(self._entradas),
+                "max_entradas": self.max_entradas,
+                "hits": self.hits,
+                "misses": self.misses,
+                "taxa_acerto": self.hits / consultas if consultas else 0.0,
+                "expiradas": self.expiradas,
+                "removidas_lru": self.removidas,
+                "invalidadas": self.invalidadas
+            }
+
+
+def cacheado(tabela: str, ttl: float):
+    def decorador(metodo):
+        @functools.wraps(metodo)
+        def wrapper(self, *args, **kwargs):
+            cache = getattr(self, "_cache", None)
+            if cache is None:
+                return metodo(self, *args, **kwargs)
+            chave = (metodo.__name__, args, tuple(sorted(kwargs.items())))
+            encontrado, valor = cache.get(chave)
+            if encontrado:
+                return valor
+            valor = metodo(self, *args, **kwargs)
+            cache.set(chave, tabela, valor, ttl)
+            return valor
+        return wrapper
+    return decorador
+
+
+def invalida(*tabelas: str):
+    def decorador(metodo):
+        @functools.wraps(metodo)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return metodo(self, *args, **kwargs)
+            finally:
+                cache = getattr(self, "_cache", None)
+                if cache is not None:
+                    cache.invalidar(*tabelas)
+        return wrapper
+    return decorador
@@ -1,50 +1,224 @@
-from supabase import create_client, Client
-from typing import List, Optional
-from datetime import date, timedelta
+from supabase import Client
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+import threading
+import time
 import uuid
-from config.settings import settings
-from data.models.funcionario import Funcionario, FuncionarioBase, RegistroDiario, ObservacaoGeral, Configuracao, RegistroTrabalho, Log, HistoricoPresenca, HistoricoPagamento, TotalFuncionarios, DataCadastramento, RankingPagamento
+from config.settings import settings, create_supabase_client
+from data.models.funcionario import Funcionario, FuncionarioBase, RegistroDiario, ObservacaoGeral, Configuracao, RegistroTrabalho, Log, HistoricoPresenca, HistoricoPagamento, TotalFuncionarios, DataCadastramento, RankingPagamento, HistoricoSnapshot
+from data.models.decoders import Decodificador, decodificar_funcionarios, decodificar_presencas, decodificar_pagamentos
+from data.models.frame import FuncionarioFrame
+from data.repositories.agregacoes import AgregadorHistorico, COLUNAS_HISTORICO
+from data.repositories.local_replica import ReplicaLocal
+from data.repositories.log_buffer import BufferLogs, CursorLogs
+from data.repositories.query_cache import QueryCache, cacheado, invalida
+from data.repositories.instrumentacao import ClienteInstrumentado, instrumentacao, instrumentar_classe
 
+TAMANHO_PAGINA_SYNC = 1000
+TAMANHO_LOTE_UPSERT = 500
+TAMANHO_LOTE_DELETE = 200
+RPC_CODIGOS_INEXISTENTE = ("PGRST202", "42883")
+CACHE_TTL_CONFIGURACAO = 300
+CACHE_TTL_FUNCIONARIOS_BASE = 120
+CACHE_TTL_OBSERVACOES = 60
+CACHE_TTL_REGISTROS = 60
+TABELAS_SISTEMA = ("funcionarios", "configuracoes", "observacoes_gerais", "registros_trabalho", "logs")
+
+@instrumentar_classe
 class SupabaseRepository:
     def __init__(self):
         self._client: Optional[Client] = None
+        self._replica: Optional[ReplicaLocal] = None
+        self._rpc_indisponiveis = set()
+        self._buffer_logs: Optional[BufferLogs] = None
+        self._lock_logs = threading.Lock()
+        self._estatisticas_tabelas: Optional[Tuple[float, Dict[str, Optional[int]]]] = None
+        self._cache: Optional[QueryCache] = QueryCache(settings.QUERY_CACHE_MAX_ENTRIES) if settings.QUERY_CACHE_ENABLED else None
+        if settings.LOCAL_REPLICA_ENABLED:
+            try:
+                self._replica = ReplicaLocal(
+                    settings.LOCAL_REPLICA_PATH,
+                    max_staleness=settings.LOCAL_REPLICA_MAX_STALENESS,
+                    intervalo_reconciliacao=settings.LOCAL_REPLICA_RECONCILE_SECONDS,
+                    sobreposicao=settings.LOCAL_REPLICA_OVERLAP_SECONDS
+                )
+            except Exception as e:
+                print(f"Erro ao abrir réplica local: {e}")
 
     @property
     def client(self) -> Client:
         if self._client is None:
-            self._client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+            self._client = create_supabase_client()
+            if instrumentacao.ativa:
+                self._client = ClienteInstrumentado(self._client)
         return self._client
 
+    # ===== CACHE DE CONSULTAS =====
+    def invalidar_cache(self, *tabelas: str):
+        self._estatisticas_tabelas = None
+        if self._cache is not None:
+            if tabelas:
+                self._cache.invalidar(*tabelas)
+            else:
+                self._cache.limpar()
+
+    def estatisticas_cache(self) -> Optional[dict]:
+        return self._cache.estatisticas() if self._cache is not None else None
+
+    # ===== RÉPLICA LOCAL (SQLite) =====
+    def sincronizar_replica(self, forcar: bool = False) -> int:
+        if self._replica is None:
+            return 0
+        if not forcar and not self._replica.precisa_sincronizar():
+            return 0
+        total = 0
+        desde = self._replica.inicio_sincronizacao
+        inicio = 0
+        while True:
+            query = self.client.table("funcionarios").select("*")
+            if desde:
+                query = query.gte("updated_at", desde)
+            data = query.order("updated_at").order("id").range(inicio, inicio + TAMANHO_PAGINA_SYNC - 1).execute()
+            total += self._replica.aplicar(data.data)
+            if len(data.data) < TAMANHO_PAGINA_SYNC:
+                break
+            inicio += TAMANHO_PAGINA_SYNC
+        if desde and self._replica.precisa_reconciliar():
+            self._reconciliar_replica()
+        self._replica.marcar_sincronizada(reconciliada=desde is None)
+        return total
+
+    def _reconciliar_replica(self):
+        ids = []
+        inicio = 0
+        while True:
+            data = self.client.table("funcionarios").select("id").order("id").range(inicio, inicio + TAMANHO_PAGINA_SYNC - 1).execute()
+            ids.extend(item["id"] for item in data.data)
+            if len(data.data) < TAMANHO_PAGINA_SYNC:
+                break
+            inicio += TAMANHO_PAGINA_SYNC
+        self._replica.reconciliar(ids)
+
+    def _replica_pronta(self) -> Optional[ReplicaLocal]:
+        if self._replica is None:
+            return None
+        try:
+            self.sincronizar_replica()
+        except Exception as e:
+            print(f"Erro ao sincronizar réplica local: {e}")
+        return self._replica if self._replica.ja_sincronizada() else None
+
     # ===== FUNCIONÁRIOS (usa tabela funcionários) =====
     def cadastrar_funcionario(self, func: Funcionario) -> Funcionario:
         if not func.id:
             func.id = uuid.uuid4()
         data = self.client.table("funcionarios").insert(func.to_dict()).execute()
         if data.data:
+            if self._replica is not None:
+                self._replica.aplicar(data.data, avancar_watermark=False)
             return Funcionario.from_dict(data.data[0])
         raise Exception("Erro ao cadastrar")
 
     def listar_funcionarios(self, dia_trabalho: date = None) -> List[Funcionario]:
+        replica = self._replica_pronta()
+        if replica is not None:
+            return replica.listar(dia_trabalho)
         query = self.client.table("funcionarios").select("*")
         if dia_trabalho:
             query = query.eq("dia_trabalho", dia_trabalho.isoformat())
         data = query.execute()
-        return [Funcionario.from_dict(item) for item in data.data]
+        return decodificar_funcionarios(data.data)
 
     def listar_todos_funcionarios(self) -> List[Funcionario]:
-        data = self.client.table("funcionarios").select("*").order("nome").execute()
-        return [Funcionario.from_dict(item) for item in data.data]
+        replica = self._replica_pronta()
+        if replica is not None:
+            return replica.listar()
+        return sorted(self.iter_funcionarios(), key=lambda f: f.nome)
+
+    def iter_funcionarios(self, page_size: int = None, since: date = None, until: date = None, desc: bool = False) -> Iterator[Funcionario]:
+        decodificador = Decodificador()
+        for item in self._iter_linhas_funcionarios("*", page_size=page_size, since=since, until=until, desc=desc):
+            yield decodificador.funcionario(item)
+
+    def carregar_frame_funcionarios(self, *colunas: str, since: date = None, until: date = None, desc: bool = False) -> FuncionarioFrame:
+        return FuncionarioFrame.from_dicts(self._iter_linhas_funcionarios(*(colunas or ("*",)), since=since, until=until, desc=desc))
+
+    def _iter_linhas_funcionarios(self, *colunas: str, page_size: int = None, since: date = None,
+                                  until: date = None, desc: bool = False) -> Iterator[dict]:
+        page_size = page_size or settings.SUPABASE_PAGE_SIZE
+        if "*" not in colunas:
+            colunas = tuple(colunas) + tuple(c for c in ("dia_trabalho", "id") if c not in colunas)
+        op = "lt" if desc else "gt"
+        ultimo = None
+        while True:
+            query = self.client.table("funcionarios").select(*colunas)
+            if since:
+                query = query.gte("dia_trabalho", since.isoformat())
+            if until:
+                query = query.lte("dia_trabalho", until.isoformat())
+            if ultimo:
+                dia, func_id = ultimo
+                query = query.or_(f"dia_trabalho.{op}.{dia},and(dia_trabalho.eq.{dia},id.{op}.{func_id})")
+            data = query.order("dia_trabalho", desc=desc).order("id", desc=desc).limit(page_size).execute()
+            yield from data.data
+            if len(data.data) < page_size:
+                break
+            ultimo = (data.data[-1]["dia_trabalho"], data.data[-1]["id"])
 
     def atualizar_funcionario(self, func: Funcionario) -> Funcionario:
         data = self.client.table("funcionarios").update(func.to_dict()).eq("id", str(func.id)).execute()
         if data.data:
+            if self._replica is not None:
+                self._replica.aplicar(data.data, avancar_watermark=False)
             return Funcionario.from_dict(data.data[0])
         raise Exception("Erro ao atualizar")
 
     def deletar_funcionario(self, func_id: str) -> bool:
         self.client.table("funcionarios").delete().eq("id", func_id).execute()
+        if self._replica is not None:
+            self._replica.remover([func_id])
         return True
 
+    def deletar_funcionarios_por_ids(self, ids: Iterable[str], progresso: Callable[[int, int], None] = None) -> int:
+        return self._deletar_em_lotes("funcionarios", ids, progresso)
+
+    def _deletar_em_lotes(self, tabela: str, ids: Iterable[str], progresso: Callable[[int, int], None] = None) -> int:
+        ids = [str(i) for i in ids]
+        total = len(ids)
+        removidos = 0
+        if progresso:
+            progresso(0, total)
+        for inicio in range(0, total, TAMANHO_LOTE_DELETE):
+            lote = ids[inicio:inicio + TAMANHO_LOTE_DELETE]
+            self.client.table(tabela).delete().in_("id", lote).execute()
+            if tabela == "funcionarios" and self._replica is not None:
+                self._replica.remover(lote)
+            removidos += len(lote)
+            if progresso:
+                progresso(removidos, total)
+        return removidos
+
+    def upsert_funcionarios(self, funcionarios: List[Funcionario]) -> List[Funcionario]:
+        registros = {}
+        for func in funcionarios:
+            registro = func.to_dict()
+            registro.pop("id", None)
+            registros[(registro["nome"], registro["dia_trabalho"])] = registro
+        registros = list(registros.values())
+        salvos = []
+        for inicio in range(0, len(registros), TAMANHO_LOTE_UPSERT):
+            lote = registros[inicio:inicio + TAMANHO_LOTE_UPSERT]
+            data = self.client.table("funcionarios").upsert(
+                lote, on_conflict="nome,dia_trabalho", default_to_null=False
+            ).execute()
+            if not data.data:
+                raise Exception("Erro ao salvar registros")
+            if self._replica is not None:
+                self._replica.aplicar(data.data, avancar_watermark=False)
+            salvos.extend(decodificar_funcionarios(data.data))
+        return salvos
+
     def buscar_funcionario_por_nome(self, nome: str) -> Optional[Funcionario]:
         data = self.client.table("funcionarios").select("*").eq("nome", nome).execute()
         if data.data:
@@ -58,10 +232,12 @@ class SupabaseRepository:
         return None
 
     # ===== FUNCIONÁRIOS BASE (lista fixa de funcionários) =====
+    @cacheado("funcionarios_base", CACHE_TTL_FUNCIONARIOS_BASE)
     def listar_funcionarios_base(self) -> List[FuncionarioBase]:
         data = self.client.table("funcionarios_base").select("*").order("nome").execute()
         return [FuncionarioBase.from_dict(item) for item in data.data]
 
+    @invalida("funcionarios_base")
     def cadastrar_funcionario_base(self, func: FuncionarioBase) -> FuncionarioBase:
         if not func.id:
             func.id = uuid.uuid4()
@@ -70,16 +246,28 @@ class SupabaseRepository:
             return FuncionarioBase.from_dict(data.data[0])
         raise Exception("Erro ao cadastrar funcionário base")
 
+    @invalida("funcionarios_base")
     def atualizar_funcionario_base(self, func: FuncionarioBase) -> FuncionarioBase:
         data = self.client.table("funcionarios_base").update(func.to_dict()).eq("id", str(func.id)).execute()
         if data.data:
             return FuncionarioBase.from_dict(data.data[0])
         raise Exception("Erro ao atualizar funcionário base")
 
+    @invalida("funcionarios_base")
     def deletar_funcionario_base(self, func_id: str) -> bool:
         self.client.table("funcionarios_base").delete().eq("id", func_id).execute()
         return True
 
+    @invalida("funcionarios_base")
+    def deletar_funcionarios_base_por_ids(self, ids: Iterable[str], progresso: Callable[[int, int], None] = None) -> int:
+        return self._deletar_em_lotes("funcionarios_base", ids, progresso)
+
+    @invalida("funcionarios_base")
+    def deletar_funcionario_base_por_nome(self, nome: str) -> int:
+        data = self.client.table("funcionarios_base").delete().eq("nome", nome).execute()
+        return len(data.data or [])
+
+    @cacheado("funcionarios_base", CACHE_TTL_FUNCIONARIOS_BASE)
     def buscar_funcionario_base_por_nome(self, nome: str) -> Optional[FuncionarioBase]:
         data = self.client.table("funcionarios_base").select("*").eq("nome", nome).execute()
         if data.data:
@@ -87,12 +275,14 @@ class SupabaseRepository:
         return None
 
     # ===== CONFIGURAÇÕES =====
+    @cacheado("configuracoes", CACHE_TTL_CONFIGURACAO)
     def get_configuracao(self) -> Optional[Configuracao]:
         data = self.client.table("configuracoes").select("*").limit(1).execute()
         if data.data:
             return Configuracao.from_dict(data.data[0])
         return None
 
+    @invalida("configuracoes")
     def salvar_configuracao(self, config: Configuracao) -> Configuracao:
         existing = self.get_configuracao()
         if existing:
@@ -113,6 +303,7 @@ class SupabaseRepository:
         raise Exception("Erro ao salvar configuração")
 
     # ===== OBSERVAÇÕES GERAIS =====
+    @invalida("observacoes_gerais")
     def salvar_observacao_geral(self, obs: ObservacaoGeral) -> ObservacaoGeral:
         existing = self.get_observacao_geral(obs.dia_trabalho)
         if existing:
@@ -126,6 +317,7 @@ class SupabaseRepository:
             return ObservacaoGeral.from_dict(data.data[0])
         raise Exception("Erro ao salvar observação")
 
+    @cacheado("observacoes_gerais", CACHE_TTL_OBSERVACOES)
     def get_observacao_geral(self, dia_trabalho: date) -> Optional[ObservacaoGeral]:
         if dia_trabalho is None:
             return None
@@ -135,6 +327,7 @@ class SupabaseRepository:
         return None
 
     # ===== REGISTROS DE ENVIO =====
+    @invalida("registros_trabalho")
     def registrar_envio(self, dia_trabalho: date, dia_semana: str, total_func: int, total_valores: float) -> RegistroTrabalho:
         data = self.client.table("registros_trabalho").insert({
             "dia_trabalho": dia_trabalho.isoformat(),
@@ -148,6 +341,7 @@ class SupabaseRepository:
             return RegistroTrabalho.from_dict(data.data[0])
         raise Exception("Erro ao registrar envio")
 
+    @cacheado("registros_trabalho", CACHE_TTL_REGISTROS)
     def listar_registros(self) -> List[RegistroTrabalho]:
         data = self.client.table("registros_trabalho").select("*").order("dia_trabalho", desc=True).execute()
         return [RegistroTrabalho.from_dict(item) for item in data.data]
@@ -155,25 +349,56 @@ class SupabaseRepository:
     # ===== LOGS DO SISTEMA =====
     def salvar_log(self, acao: str, tabela: str, registro_id: str = None, 
                    dados_anteriores: dict = None, dados_novos: dict = None, 
-                   usuario: str = "sistema", ip_origem: str = None) -> Log:
+                   usuario: str = "sistema", ip_origem: str = None) -> Optional[Log]:
+        """Com LOG_BUFFER_ENABLED o log só é enfileirado: retorna None, pois id e created_at só existem depois do envio do lote."""
+        registro = {
+            "acao": acao,
+            "tabela": tabela,
+            "registro_id": registro_id,
+            "dados_anteriores": str(dados_anteriores) if dados_anteriores else None,
+            "dados_novos": str(dados_novos) if dados_novos else None,
+            "usuario": usuario,
+            "ip_origem": ip_origem
+        }
         try:
-            data = self.client.table("logs").insert({
-                "acao": acao,
-                "tabela": tabela,
-                "registro_id": registro_id,
-                "dados_anteriores": str(dados_anteriores) if dados_anteriores else None,
-                "dados_novos": str(dados_novos) if dados_novos else None,
-                "usuario": usuario,
-                "ip_origem": ip_origem
-            }).execute()
+            if settings.LOG_BUFFER_ENABLED:
+                self._get_buffer_logs().registrar(registro)
+                return None
+            data = self.client.table("logs").insert(registro).execute()
             if data.data:
                 return Log.from_dict(data.data[0])
         except Exception as e:
             print(f"Erro ao salvar log: {e}")
         return None
 
+    def _get_buffer_logs(self) -> BufferLogs:
+        with self._lock_logs:
+            if self._buffer_logs is None:
+                self._buffer_logs = BufferLogs(
+                    self._inserir_logs,
+                    settings.LOG_BUFFER_SPILL_PATH,
+                    tamanho_lote=settings.LOG_BUFFER_BATCH_SIZE,
+                    intervalo=settings.LOG_BUFFER_FLUSH_SECONDS,
+                    capacidade=settings.LOG_BUFFER_MAX_QUEUE
+                )
+            return self._buffer_logs
+
+    def _inserir_logs(self, registros: List[dict]):
+        self.client.table("logs").insert(registros).execute()
+
+    def flush_logs(self):
+        if self._buffer_logs is not None:
+            self._buffer_logs.flush()
+
+    def fechar(self):
+        with self._lock_logs:
+            buffer_logs, self._buffer_logs = self._buffer_logs, None
+        if buffer_logs is not None:
+            buffer_logs.fechar()
+
     def listar_logs(self, limite: int = 100) -> List[Log]:
         try:
+            self.flush_logs()
             data = self.client.table("logs").select("*").order("created_at", desc=True).limit(limite).execute()
             return [Log.from_dict(item) for item in data.data]
         except:
@@ -181,6 +406,7 @@ class SupabaseRepository:
 
     def listar_logs_por_tabela(self, tabela: str, limite: int = 100) -> List[Log]:
         try:
+            self.flush_logs()
             data = self.client.table("logs").select("*").eq("tabela", tabela).order("created_at", desc=True).limit(limite).execute()
             return [Log.from_dict(item) for item in data.data]
         except:
@@ -188,11 +414,32 @@ class SupabaseRepository:
 
     def listar_logs_por_acao(self, acao: str, limite: int = 100) -> List[Log]:
         try:
+            self.flush_logs()
             data = self.client.table("logs").select("*").eq("acao", acao).order("created_at", desc=True).limit(limite).execute()
             return [Log.from_dict(item) for item in data.data]
         except:
             return []
 
+    def listar_logs_novos(self, cursor: Optional[CursorLogs] = None, acao: str = None,
+                          tabela: str = None, limite: int = 200) -> List[Log]:
+        try:
+            self.flush_logs()
+            query = self.client.table("logs").select("*")
+            if acao:
+                query = query.eq("acao", acao)
+            if tabela:
+                query = query.eq("tabela", tabela)
+            if cursor is None or cursor.inicio is None:
+                data = query.order("created_at", desc=True).order("id", desc=True).limit(limite).execute()
+                logs = [Log.from_dict(item) for item in reversed(data.data)]
+                return cursor.filtrar_novos(logs, truncado=len(logs) >= limite) if cursor is not None else logs
+            query = query.gte("created_at", cursor.inicio)
+            data = query.order("created_at").order("id").limit(limite + len(cursor)).execute()
+            return cursor.filtrar_novos([Log.from_dict(item) for item in data.data])
+        except Exception as e:
+            print(f"Erro ao listar logs novos: {e}")
+            return []
+
     def limpar_logs(self) -> bool:
         try:
             self.client.table("logs").delete().execute()
@@ -200,31 +447,56 @@ class SupabaseRepository:
         except:
             return False
 
+    # ===== CONTAGENS =====
+    @staticmethod
+    def _aplicar_filtros(query, filtros: dict = None):
+        for coluna, valor in (filtros or {}).items():
+            if isinstance(valor, tuple):
+                operador, valor = valor
+                query = getattr(query, operador)(coluna, valor)
+            else:
+                query = query.eq(coluna, valor)
+        return query
+
+    def contar_registros(self, tabela: str, filtros: dict = None) -> int:
+        query = self.client.table(tabela).select("id", count="exact", head=True)
+        return self._aplicar_filtros(query, filtros).execute().count or 0
+
+    def listar_pagina(self, tabela: str, inicio: int, fim: int, colunas: List[str] = None,
+                      ordenar_por: str = "id", desc: bool = False, filtros: dict = None,
+                      contar: bool = False) -> Tuple[List[dict], Optional[int]]:
+        query = self.client.table(tabela).select(",".join(colunas) if colunas else "*",
+                                                 count="exact" if contar else None)
+        query = self._aplicar_filtros(query, filtros).order(ordenar_por, desc=desc)
+        if ordenar_por != "id":
+            query = query.order("id", desc=desc)
+        resposta = query.range(inicio, fim).execute()
+        return resposta.data or [], resposta.count
+
+    def estatisticas_tabelas(self, tabelas: Tuple[str, ...] = TABELAS_SISTEMA, forcar: bool = False) -> Dict[str, Optional[int]]:
+        agora = time.monotonic()
+        if not forcar and self._estatisticas_tabelas is not None:
+            expira_em, contagens = self._estatisticas_tabelas
+            if expira_em > agora and all(t in contagens for t in tabelas):
+                return {t: contagens[t] for t in tabelas}
+
+        def contar(tabela):
+            try:
+                return self.contar_registros(tabela)
+            except Exception as e:
+                print(f"Erro ao contar {tabela}: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=len(tabelas) or 1) as executor:
+            contagens = dict(zip(tabelas, executor.map(contar, tabelas)))
+        self._estatisticas_tabelas = (agora + settings.TABLE_STATS_TTL_SECONDS, contagens)
+        return contagens
+
     # ===== HISTÓRICO DE PRESENÇA =====
     def listar_historico_presenca(self, limite: int = 100) -> List[HistoricoPresenca]:
         try:
             data = self.client.table("funcionarios").select("*").order("dia_trabalho", desc=True).limit(limite).execute()
-            resultados = []
-            for item in data.data:
-                hp = HistoricoPresenca(
-                    id=uuid.UUID(item["id"]) if item.get("id") else None,
-                    nome=item.get("nome", ""),
-                    dia_trabalho=date.fromisoformat(item["dia_trabalho"]) if item.get("dia_trabalho") else None,
-                    hora_entrada=item.get("hora_entrada", "08:00"),
-                    hora_saida=item.get("hora_saida", "16:00"),
-                    valor_10_percent=float(item.get("valor_10_percent", 0)),
-                    observacao=item.get("observacao", ""),
-                    created_at=item.get("created_at"),
-                    dia_formatado=""
-                )
-                if hp.dia_trabalho == date.today():
-                    hp.dia_formatado = "Hoje"
-                elif hp.dia_trabalho == date.today() - timedelta(days=1):
-                    hp.dia_formatado = "Ontem"
-                else:
-                    hp.dia_formatado = hp.dia_trabalho.strftime("%d/%m/%Y") if hp.dia_trabalho else ""
-                resultados.append(hp)
-            return resultados
+            return decodificar_presencas(data.data)
         except Exception as e:
             print(f"Erro ao listar histórico de presença: {e}")
             return []
@@ -233,201 +505,129 @@ class SupabaseRepository:
     def listar_historico_pagamentos(self, limite: int = 100) -> List[HistoricoPagamento]:
         try:
             data = self.client.table("funcionarios").select("*").order("dia_trabalho", desc=True).limit(limite).execute()
-            resultados = []
-            for item in data.data:
-                hp = HistoricoPagamento(
-                    id=uuid.UUID(item["id"]) if item.get("id") else None,
-                    nome=item.get("nome", ""),
-                    dia_trabalho=date.fromisoformat(item["dia_trabalho"]) if item.get("dia_trabalho") else None,
-                    valor_10_percent=float(item.get("valor_10_percent", 0)),
-                    vale=float(item["vale"]) if item.get("vale") is not None else None,
-                    tipo_pagamento=item.get("tipo_pagamento", "pix"),
-                    pago=bool(item.get("pago", False)),
-                    data_pagamento=item.get("updated_at"),
-                    status_pagamento="Pago" if item.get("pago") else "Pendente",
-                    numero_parcela=0
-                )
-                resultados.append(hp)
-            return resultados
+            return decodificar_pagamentos(data.data)
         except Exception as e:
             print(f"Erro ao listar histórico de pagamentos: {e}")
             return []
 
+    # ===== AGREGAÇÕES NO SERVIDOR (RPC) =====
+    def _chamar_rpc(self, funcao: str, inicio: date = None, fim: date = None) -> Optional[list]:
+        if not settings.SUPABASE_USE_RPC or funcao in self._rpc_indisponiveis:
+            return None
+        params = {
+            "p_inicio": inicio.isoformat() if inicio else None,
+            "p_fim": fim.isoformat() if fim else None
+        }
+        try:
+            return self.client.rpc(funcao, params).execute().data
+        except Exception as e:
+            if getattr(e, "code", None) in RPC_CODIGOS_INEXISTENTE:
+                self._rpc_indisponiveis.add(funcao)
+            else:
+                print(f"Erro ao chamar {funcao}: {e}")
+            return None
+
+    def _agregar_em_python(self, *colunas: str, inicio: date = None, fim: date = None) -> AgregadorHistorico:
+        linhas = self._iter_linhas_funcionarios(*colunas, since=inicio, until=fim)
+        return AgregadorHistorico().adicionar_todos(linhas)
+
     # ===== TOTAL DE FUNCIONÁRIOS =====
-    def get_total_funcionarios(self) -> TotalFuncionarios:
+    def get_total_funcionarios(self, inicio: date = None, fim: date = None) -> TotalFuncionarios:
         try:
-            data = self.client.table("funcionarios").select("nome", "dia_trabalho", "valor_10_percent", "pago", "created_at").execute()
-            if not data.data:
-                return TotalFuncionarios()
-            
-            nomes_unicos = set()
-            total_valores = 0.0
-            total_pago = 0.0
-            total_pendente = 0.0
-            primeiro_registro = None
-            ultimo_registro = None
-            
-            for item in data.data:
-                nomes_unicos.add(item.get("nome"))
-                valor = float(item.get("valor_10_percent", 0))
-                total_valores += valor
-                if item.get("pago"):
-                    total_pago += valor
-                else:
-                    total_pendente += valor
-                
-                dia = item.get("dia_trabalho")
-                if dia:
-                    dia_date = date.fromisoformat(dia)
-                    if primeiro_registro is None or dia_date < primeiro_registro:
-                        primeiro_registro = dia_date
-                    if ultimo_registro is None or dia_date > ultimo_registro:
-                        ultimo_registro = dia_date
-            
-            return TotalFuncionarios(
-                total_cadastrados=len(nomes_unicos),
-                total_registros=len(data.data),
-                total_dias_trabalhados=len(set(date.fromisoformat(item["dia_trabalho"]) for item in data.data if item.get("dia_trabalho"))),
-                total_geral_pago=total_valores,
-                total_pago=total_pago,
-                total_pendente=total_pendente,
-                primeiro_registro=primeiro_registro,
-                ultimo_registro=ultimo_registro
-            )
+            linhas = self._chamar_rpc("fn_total_funcionarios", inicio, fim)
+            if linhas is not None:
+                return TotalFuncionarios.from_dict(linhas[0]) if linhas and linhas[0].get("total_registros") else TotalFuncionarios()
+            return self._agregar_em_python("nome", "valor_10_percent", "pago", inicio=inicio, fim=fim).total()
         except Exception as e:
             print(f"Erro ao get total funcionários: {e}")
             return TotalFuncionarios()
 
     # ===== DATA DE CADASTRAMENTO =====
-    def listar_data_cadastramento(self) -> List[DataCadastramento]:
+    def listar_data_cadastramento(self, inicio: date = None, fim: date = None) -> List[DataCadastramento]:
         try:
-            data = self.client.table("funcionarios").select("nome", "dia_trabalho", "valor_10_percent", "created_at").execute()
-            if not data.data:
-                return []
-            
-            funcionarios_dict = {}
-            for item in data.data:
-                nome = item.get("nome", "")
-                if nome not in funcionarios_dict:
-                    funcionarios_dict[nome] = {
-                        "nome": nome,
-                        "primeiro_dia_trabalho": item.get("dia_trabalho"),
-                        "ultimo_dia_trabalho": item.get("dia_trabalho"),
-                        "total_dias_trabalhados": 0,
-                        "total_recebido": 0.0,
-                        "data_cadastro_banco": item.get("created_at"),
-                        "dias_trabalhados": set()
-                    }
-                
-                func = funcionarios_dict[nome]
-                func["total_dias_trabalhados"] += 1
-                func["total_recebido"] += float(item.get("valor_10_percent", 0))
-                func["dias_trabalhados"].add(item.get("dia_trabalho"))
-                
-                if item.get("dia_trabalho"):
-                    if func["primeiro_dia_trabalho"] is None or item["dia_trabalho"] < func["primeiro_dia_trabalho"]:
-                        func["primeiro_dia_trabalho"] = item["dia_trabalho"]
-                    if func["ultimo_dia_trabalho"] is None or item["dia_trabalho"] > func["ultimo_dia_trabalho"]:
-                        func["ultimo_dia_trabalho"] = item["dia_trabalho"]
-            
-            resultados = []
-            for func in funcionarios_dict.values():
-                dc = DataCadastramento(
-                    nome=func["nome"],
-                    primeiro_dia_trabalho=date.fromisoformat(func["primeiro_dia_trabalho"]) if func["primeiro_dia_trabalho"] else None,
-                    ultimo_dia_trabalho=date.fromisoformat(func["ultimo_dia_trabalho"]) if func["ultimo_dia_trabalho"] else None,
-                    total_dias_trabalhados=func["total_dias_trabalhados"],
-                    total_recebido=func["total_recebido"],
-                    data_cadastro_banco=func["data_cadastro_banco"],
-                    dias_trabalhados=list(func["dias_trabalhados"])
-                )
-                resultados.append(dc)
-            
-            resultados.sort(key=lambda x: x.primeiro_dia_trabalho or date.min, reverse=True)
-            return resultados
+            linhas = self._chamar_rpc("fn_data_cadastramento", inicio, fim)
+            if linhas is not None:
+                return [DataCadastramento.from_dict(item) for item in linhas]
+            return self._agregar_em_python("nome", "valor_10_percent", "created_at", inicio=inicio, fim=fim).cadastramento()
         except Exception as e:
             print(f"Erro ao listar data cadastramento: {e}")
             return []
 
     # ===== RANKING DE PAGAMENTOS =====
-    def listar_ranking_pagamentos(self) -> List[RankingPagamento]:
+    def listar_ranking_pagamentos(self, inicio: date = None, fim: date = None) -> List[RankingPagamento]:
         try:
-            data = self.client.table("funcionarios").select("nome", "dia_trabalho", "valor_10_percent", "pago").execute()
-            if not data.data:
-                return []
-            
-            funcionarios_dict = {}
-            for item in data.data:
-                nome = item.get("nome", "")
-                if nome not in funcionarios_dict:
-                    funcionarios_dict[nome] = {
-                        "nome": nome,
-                        "dias_trabalhados": 0,
-                        "total_recebido": 0.0,
-                        "maior_diaria": 0.0,
-                        "menor_diaria": float("inf"),
-                        "total_pago": 0.0,
-                        "total_pendente": 0.0
-                    }
-                
-                func = funcionarios_dict[nome]
-                valor = float(item.get("valor_10_percent", 0))
-                func["dias_trabalhados"] += 1
-                func["total_recebido"] += valor
-                if valor > func["maior_diaria"]:
-                    func["maior_diaria"] = valor
-                if valor < func["menor_diaria"]:
-                    func["menor_diaria"] = valor
-                if item.get("pago"):
-                    func["total_pago"] += valor
-                else:
-                    func["total_pendente"] += valor
-            
-            resultados = []
-            for func in funcionarios_dict.values():
-                if func["menor_diaria"] == float("inf"):
-                    func["menor_diaria"] = 0.0
-                rp = RankingPagamento(
-                    nome=func["nome"],
-                    dias_trabalhados=func["dias_trabalhados"],
-                    total_recebido=func["total_recebido"],
-                    media_diaria=func["total_recebido"] / func["dias_trabalhados"] if func["dias_trabalhados"] > 0 else 0,
-                    maior_diaria=func["maior_diaria"],
-                    menor_diaria=func["menor_diaria"],
-                    total_pago=func["total_pago"],
-                    total_pendente=func["total_pendente"]
-                )
-                resultados.append(rp)
-            
-            resultados.sort(key=lambda x: x.total_recebido, reverse=True)
-            for i, rp in enumerate(resultados, 1):
-                rp.posicao = i
-            
-            return resultados
+            linhas = self._chamar_rpc("fn_ranking_pagamentos", inicio, fim)
+            if linhas is not None:
+                return [RankingPagamento.from_dict(item) for item in linhas]
+            return self._agregar_em_python("nome", "valor_10_percent", "pago", "hora_entrada", "hora_saida", inicio=inicio, fim=fim).ranking()
         except Exception as e:
             print(f"Erro ao listar ranking: {e}")
             return []
 
+    # ===== SNAPSHOT DO HISTÓRICO (uma única leitura) =====
+    def get_historico_snapshot(self, limite_presenca: int = 200, limite_pagamentos: int = 200) -> HistoricoSnapshot:
+        try:
+            snapshot = self._snapshot_via_rpc(limite_presenca, limite_pagamentos)
+            if snapshot is not None:
+                return snapshot
+            agregador = AgregadorHistorico()
+            presenca = []
+            pagamentos = []
+            decodificador = Decodificador()
+            for item in self._iter_linhas_funcionarios(*COLUNAS_HISTORICO, desc=True):
+                agregador.adicionar(item)
+                if limite_presenca is None or len(presenca) < limite_presenca:
+                    presenca.append(decodificador.presenca(item))
+                if limite_pagamentos is None or len(pagamentos) < limite_pagamentos:
+                    pagamentos.append(decodificador.pagamento(item))
+            return HistoricoSnapshot(
+                total=agregador.total(),
+                ranking=agregador.ranking(),
+                presenca=presenca,
+                pagamentos=pagamentos,
+                cadastramento=agregador.cadastramento()
+            )
+        except Exception as e:
+            print(f"Erro ao montar snapshot do histórico: {e}")
+            return HistoricoSnapshot()
+
+    def _snapshot_via_rpc(self, limite_presenca: Optional[int], limite_pagamentos: Optional[int]) -> Optional[HistoricoSnapshot]:
+        if limite_presenca is None or limite_pagamentos is None:
+            return None
+        if not settings.SUPABASE_USE_RPC or self._rpc_indisponiveis:
+            return None
+        # As três RPCs e as linhas recentes não dependem umas das outras: saem juntas em vez de em série
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            total = executor.submit(self._chamar_rpc, "fn_total_funcionarios")
+            ranking = executor.submit(self._chamar_rpc, "fn_ranking_pagamentos")
+            cadastramento = executor.submit(self._chamar_rpc, "fn_data_cadastramento")
+            recentes = executor.submit(self._listar_linhas_recentes, max(limite_presenca, limite_pagamentos))
+        total, ranking, cadastramento, recentes = (f.result() for f in (total, ranking, cadastramento, recentes))
+        if None in (total, ranking, cadastramento):
+            return None
+        return self._montar_snapshot(total, ranking, cadastramento, recentes, limite_presenca, limite_pagamentos)
+
+    def _listar_linhas_recentes(self, limite: int) -> list:
+        if limite <= 0:
+            return []
+        return self.client.table("funcionarios").select(*COLUNAS_HISTORICO).order("dia_trabalho", desc=True).order("id", desc=True).limit(limite).execute().data
+
+    def _montar_snapshot(self, total: list, ranking: list, cadastramento: list, recentes: list,
+                         limite_presenca: int, limite_pagamentos: int) -> HistoricoSnapshot:
+        decodificador = Decodificador()
+        return HistoricoSnapshot(
+            total=TotalFuncionarios.from_dict(total[0]) if total and total[0].get("total_registros") else TotalFuncionarios(),
+            ranking=[RankingPagamento.from_dict(item) for item in ranking],
+            presenca=[decodificador.presenca(item) for item in recentes[:limite_presenca]],
+            pagamentos=[decodificador.pagamento(item) for item in recentes[:limite_pagamentos]],
+            cadastramento=[DataCadastramento.from_dict(item) for item in cadastramento]
+        )
+
     # ===== BUSCAR HISTÓRICO POR FUNCIONÁRIO =====
     def buscar_historico_funcionario(self, nome: str) -> List[HistoricoPagamento]:
         try:
             data = self.client.table("funcionarios").select("*").ilike("nome", f"%{nome}%").order("dia_trabalho", desc=True).execute()
-            resultados = []
-            for item in data.data:
-                hp = HistoricoPagamento(
-                    id=uuid.UUID(item["id"]) if item.get("id") else None,
-                    nome=item.get("nome", ""),
-                    dia_trabalho=date.fromisoformat(item["dia_trabalho"]) if item.get("dia_trabalho") else None,
-                    valor_10_percent=float(item.get("valor_10_percent", 0)),
-                    vale=float(item["vale"]) if item.get("vale") is not None else None,
-                    tipo_pagamento=item.get("tipo_pagamento", "pix"),
-                    pago=bool(item.get("pago", False)),
-                    data_pagamento=item.get("updated_at"),
-                    status_pagamento="Pago" if item.get("pago") else "Pendente",
-                    numero_parcela=0
-                )
-                resultados.append(hp)
-            return resultados
+            return decodificar_pagamentos(data.data)
         except Exception as e:
             print(f"Erro ao buscar histórico: {e}")
             return []
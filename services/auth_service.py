@@ -1,13 +1,10 @@
 import os
-from supabase import create_client, Client
-from config.settings import settings
+from supabase import Client
+from config.settings import settings, create_supabase_client
 
 class AuthService:
     def __init__(self):
-        self.supabase: Client = create_client(
-            settings.SUPABASE_URL,
-            settings.SUPABASE_KEY
-        )
+        self.supabase: Client = create_supabase_client()
         self.session = None
         self.user = None
     
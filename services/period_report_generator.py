@@ -0,0 +1,309 @@
+import csv
+import io
+import json
+from calendar import monthrange
+from datetime import date, timedelta
+from typing import BinaryIO, Callable, Dict, Iterator, Optional, TextIO, Tuple, Union
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill
+from openpyxl.utils import get_column_letter
+from data.models.dinheiro import de_centavos
+from data.models.funcionario import Funcionario
+from data.models.horarios import horas
+from config.settings import settings
+
+COLUNAS_EXCEL = ['Data', 'Dia da Semana', 'Nome', '10% (R$)', 'Entrada', 'Saída', 'Horas', 'Vale (R$)', 'Pago', 'Observação']
+LARGURAS_EXCEL = [12, 15, 25, 12, 9, 9, 8, 11, 7, 30]
+FORMATO_REAIS = '"R$" #,##0.00'
+FORMATO_DATA = 'DD/MM/YYYY'
+FONTE_CABECALHO = Font(bold=True, color="FFFFFF")
+FUNDO_CABECALHO = PatternFill("solid", fgColor="1565C0")
+FONTE_NEGRITO = Font(bold=True)
+
+FORMATOS_PERIODO = {"excel": "xlsx", "csv": "csv", "jsonl": "jsonl"}
+
+
+def periodo_semana(dia: date) -> Tuple[date, date]:
+    segunda = dia - timedelta(days=dia.weekday())
+    return segunda, segunda + timedelta(days=6)
+
+
+def periodo_mes(dia: date) -> Tuple[date, date]:
+    return dia.replace(day=1), dia.replace(day=monthrange(dia.year, dia.month)[1])
+
+
+class Subtotal:
+    __slots__ = ("registros", "centavos", "vales", "minutos")
+
+    def __init__(self):
+        self.registros = 0
+        self.centavos = 0
+        self.vales = 0
+        self.minutos = 0
+
+    def adicionar(self, f: Funcionario):
+        self.registros += 1
+        self.centavos += f.valor_centavos
+        self.vales += f.vale_centavos or 0
+        self.minutos += f.minutos_trabalhados or 0
+
+    def somar(self, outro: "Subtotal"):
+        self.registros += outro.registros
+        self.centavos += outro.centavos
+        self.vales += outro.vales
+        self.minutos += outro.minutos
+
+    def to_dict(self) -> dict:
+        return {
+            "registros": self.registros,
+            "total": de_centavos(self.centavos),
+            "vales": de_centavos(self.vales),
+            "horas": horas(self.minutos)
+        }
+
+
+class AcumuladorPeriodo:
+    """Totais por funcionário, por dia e do período, somados em centavos enquanto as linhas passam."""
+
+    __slots__ = ("por_funcionario", "por_dia", "total")
+
+    def __init__(self):
+        self.por_funcionario: Dict[str, Subtotal] = {}
+        self.por_dia: Dict[date, Subtotal] = {}
+        self.total = Subtotal()
+
+    def adicionar(self, f: Funcionario):
+        self.por_funcionario.setdefault(f.nome, Subtotal()).adicionar(f)
+        self.por_dia.setdefault(f.dia_trabalho, Subtotal()).adicionar(f)
+        self.total.adicionar(f)
+
+
+class PeriodReportGenerator:
+    """Relatório de um intervalo de datas lido do repositório página a página e escrito em streaming, sem carregar o período inteiro."""
+
+    def __init__(self, repository, inicio: date, fim: date, page_size: int = None):
+        if fim < inicio:
+            raise ValueError("fim do período anterior ao início")
+        self.repository = repository
+        self.inicio = inicio
+        self.fim = fim
+        self.page_size = page_size
+        self.acumulador = AcumuladorPeriodo()
+
+    @classmethod
+    def semana(cls, repository, dia: date, **kwargs) -> "PeriodReportGenerator":
+        return cls(repository, *periodo_semana(dia), **kwargs)
+
+    @classmethod
+    def mes(cls, repository, dia: date, **kwargs) -> "PeriodReportGenerator":
+        return cls(repository, *periodo_mes(dia), **kwargs)
+
+    def _linhas(self) -> Iterator[Funcionario]:
+        """Percorre o período em ordem de data, acumulando os totais de cada linha entregue."""
+        self.acumulador = acumulador = AcumuladorPeriodo()
+        for f in self.repository.iter_funcionarios(page_size=self.page_size, since=self.inicio, until=self.fim):
+            if f.dia_trabalho is None:
+                continue
+            acumulador.adicionar(f)
+            yield f
+
+    def resumir(self) -> AcumuladorPeriodo:
+        for _ in self._linhas():
+            pass
+        return self.acumulador
+
+    def generate_format(self, formato: str, destino=None) -> Optional[bytes]:
+        if formato not in FORMATOS_PERIODO:
+            raise ValueError(f"formato de período desconhecido: {formato}")
+        return getattr(self, f"generate_{formato}")(destino)
+
+    @staticmethod
+    def _saida_texto(destino: Union[str, TextIO, None], escrever: Callable[[TextIO], None]) -> Optional[bytes]:
+        if destino is None:
+            buffer = io.StringIO()
+            escrever(buffer)
+            return buffer.getvalue().encode('utf-8')
+        if isinstance(destino, str):
+            with open(destino, 'w', encoding='utf-8', newline='') as arquivo:
+                escrever(arquivo)
+        else:
+            escrever(destino)
+        return None
+
+    # ===== CSV =====
+    def generate_csv(self, destino: Union[str, TextIO] = None) -> Optional[bytes]:
+        return self._saida_texto(destino, self._escrever_csv)
+
+    def _escrever_csv(self, arquivo: TextIO):
+        writer = csv.writer(arquivo)
+        writer.writerow(COLUNAS_EXCEL)
+        for f in self._linhas():
+            minutos = f.minutos_trabalhados
+            writer.writerow([
+                f.dia_trabalho.isoformat(),
+                settings.DIAS_SEMANA.get(f.dia_trabalho.weekday(), ""),
+                f.nome,
+                f"{f.valor_10_percent:.2f}",
+                f.hora_entrada,
+                f.hora_saida,
+                f"{horas(minutos):.2f}" if minutos is not None else "",
+                f"{f.vale:.2f}" if f.vale is not None else "",
+                "Sim" if f.pago else "Não",
+                f.observacao or ""
+            ])
+
+    # ===== JSON LINES =====
+    def generate_jsonl(self, destino: Union[str, TextIO] = None) -> Optional[bytes]:
+        return self._saida_texto(destino, self._escrever_jsonl)
+
+    def _escrever_jsonl(self, arquivo: TextIO):
+        def linha(dados: dict):
+            arquivo.write(json.dumps(dados, ensure_ascii=False))
+            arquivo.write("\n")
+
+        dia_atual = None
+        for f in self._linhas():
+            if f.dia_trabalho != dia_atual:
+                # As linhas chegam em ordem de data: o total do dia anterior já está fechado
+                if dia_atual is not None:
+                    linha({"tipo": "dia", "data": dia_atual.isoformat(), **self.acumulador.por_dia[dia_atual].to_dict()})
+                dia_atual = f.dia_trabalho
+            linha({
+                "tipo": "registro",
+                "data": f.dia_trabalho.isoformat(),
+                "nome": f.nome,
+                "valor_10_percent": f.valor_10_percent,
+                "hora_entrada": f.hora_entrada,
+                "hora_saida": f.hora_saida,
+                "horas_trabalhadas": horas(f.minutos_trabalhados),
+                "vale": f.vale,
+                "pago": f.pago,
+                "observacao": f.observacao
+            })
+        if dia_atual is not None:
+            linha({"tipo": "dia", "data": dia_atual.isoformat(), **self.acumulador.por_dia[dia_atual].to_dict()})
+        for nome in sorted(self.acumulador.por_funcionario):
+            linha({"tipo": "funcionario", "nome": nome, **self.acumulador.por_funcionario[nome].to_dict()})
+        linha({"tipo": "periodo", "inicio": self.inicio.isoformat(), "fim": self.fim.isoformat(),
+               **self.acumulador.total.to_dict()})
+
+    # ===== EXCEL (write-only, uma aba por semana) =====
+    def generate_excel(self, destino: Union[str, BinaryIO] = None) -> Optional[bytes]:
+        wb = openpyxl.Workbook(write_only=True)
+        ws = None
+        semana = None
+        subtotais: Dict[str, Subtotal] = {}
+
+        for f in self._linhas():
+            chave = f.dia_trabalho.isocalendar()[:2]
+            if chave != semana:
+                if ws is not None:
+                    self._escrever_subtotais(ws, subtotais)
+                semana = chave
+                subtotais = {}
+                ws = self._nova_aba(wb, f.dia_trabalho)
+            ws.append(self._linha_excel(ws, f))
+            subtotais.setdefault(f.nome, Subtotal()).adicionar(f)
+
+        if ws is not None:
+            self._escrever_subtotais(ws, subtotais)
+        self._escrever_resumo(wb)
+        self._escrever_resumo_dias(wb)
+
+        if destino is not None:
+            wb.save(destino)
+            return None
+        buffer = io.BytesIO()
+        wb.save(buffer)
+        return buffer.getvalue()
+
+    def _nova_aba(self, wb, dia: date):
+        segunda, domingo = periodo_semana(dia)
+        inicio = max(segunda, self.inicio)
+        fim = min(domingo, self.fim)
+        ano, numero, _ = dia.isocalendar()
+        ws = wb.create_sheet(f"{ano}-S{numero:02d} {inicio.strftime('%d.%m')}-{fim.strftime('%d.%m')}")
+        for i, largura in enumerate(LARGURAS_EXCEL):
+            ws.column_dimensions[get_column_letter(i + 1)].width = largura
+        ws.freeze_panes = 'A2'
+        ws.append([self._cabecalho(ws, titulo) for titulo in COLUNAS_EXCEL])
+        return ws
+
+    @staticmethod
+    def _cabecalho(ws, valor) -> WriteOnlyCell:
+        cell = WriteOnlyCell(ws, value=valor)
+        cell.font = FONTE_CABECALHO
+        cell.fill = FUNDO_CABECALHO
+        return cell
+
+    @staticmethod
+    def _reais(ws, centavos: int, negrito: bool = False) -> WriteOnlyCell:
+        cell = WriteOnlyCell(ws, value=de_centavos(centavos))
+        cell.number_format = FORMATO_REAIS
+        if negrito:
+            cell.font = FONTE_NEGRITO
+        return cell
+
+    @staticmethod
+    def _data(ws, dia: date) -> WriteOnlyCell:
+        cell = WriteOnlyCell(ws, value=dia)
+        cell.number_format = FORMATO_DATA
+        return cell
+
+    def _linha_excel(self, ws, f: Funcionario) -> list:
+        return [
+            self._data(ws, f.dia_trabalho),
+            settings.DIAS_SEMANA.get(f.dia_trabalho.weekday(), ""),
+            f.nome,
+            self._reais(ws, f.valor_centavos),
+            f.hora_entrada,
+            f.hora_saida,
+            horas(f.minutos_trabalhados),
+            self._reais(ws, f.vale_centavos) if f.vale_centavos is not None else None,
+            "Sim" if f.pago else "Não",
+            f.observacao or ""
+        ]
+
+    def _escrever_subtotais(self, ws, subtotais: Dict[str, Subtotal]):
+        ws.append([])
+        ws.append([self._cabecalho(ws, t) for t in ('Subtotal', '', 'Funcionário', '10% (R$)', 'Dias', '', 'Horas', 'Vale (R$)')])
+        total = Subtotal()
+        for nome in sorted(subtotais):
+            sub = subtotais[nome]
+            ws.append(['', '', nome, self._reais(ws, sub.centavos), sub.registros, '', horas(sub.minutos),
+                       self._reais(ws, sub.vales)])
+            total.somar(sub)
+        rotulo = WriteOnlyCell(ws, value="Total da semana")
+        rotulo.font = FONTE_NEGRITO
+        ws.append([rotulo, '', '', self._reais(ws, total.centavos, True), total.registros, '', horas(total.minutos),
+                   self._reais(ws, total.vales, True)])
+
+    def _escrever_resumo(self, wb):
+        por_funcionario = self.acumulador.por_funcionario
+        total = self.acumulador.total
+        ws = wb.create_sheet("Resumo do Período")
+        for letra, largura in zip("ABCDE", (25, 14, 8, 10, 14)):
+            ws.column_dimensions[letra].width = largura
+        titulo = WriteOnlyCell(ws, value=f"Período: {self.inicio.strftime('%d/%m/%Y')} a {self.fim.strftime('%d/%m/%Y')}")
+        titulo.font = Font(size=14, bold=True)
+        ws.append([titulo])
+        ws.append([])
+        ws.append([self._cabecalho(ws, t) for t in ('Funcionário', '10% (R$)', 'Dias', 'Horas', 'Vale (R$)')])
+        for nome in sorted(por_funcionario):
+            sub = por_funcionario[nome]
+            ws.append([nome, self._reais(ws, sub.centavos), sub.registros, horas(sub.minutos), self._reais(ws, sub.vales)])
+        rotulo = WriteOnlyCell(ws, value="Total do período")
+        rotulo.font = FONTE_NEGRITO
+        ws.append([rotulo, self._reais(ws, total.centavos, True), total.registros, horas(total.minutos),
+                   self._reais(ws, total.vales, True)])
+
+    def _escrever_resumo_dias(self, wb):
+        ws = wb.create_sheet("Resumo por Dia")
+        for letra, largura in zip("ABCDEF", (12, 15, 11, 14, 10, 14)):
+            ws.column_dimensions[letra].width = largura
+        ws.freeze_panes = 'A2'
+        ws.append([self._cabecalho(ws, t) for t in ('Data', 'Dia da Semana', 'Registros', '10% (R$)', 'Horas', 'Vale (R$)')])
+        for dia, sub in sorted(self.acumulador.por_dia.items()):
+            ws.append([self._data(ws, dia), settings.DIAS_SEMANA.get(dia.weekday(), ""), sub.registros,
+                       self._reais(ws, sub.centavos), horas(sub.minutos), self._reais(ws, sub.vales)])
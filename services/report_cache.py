@@ -0,0 +1,211 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+from config.settings import settings
+
+EXTENSAO = ".bin"
+
+
+def chave_relatorio(*partes) -> str:
+    """Hash SHA-256 das entradas do relatório; mesma entrada gera a mesma chave em qualquer processo."""
+    resumo = hashlib.sha256()
+    for parte in partes:
+        resumo.update(repr(parte).encode("utf-8"))
+        resumo.update(b"\x1f")
+    return resumo.hexdigest()
+
+
+class ReportCache:
+    """Cache de relatórios gerados endereçado pelo conteúdo: LRU em memória limitado em bytes e, opcionalmente, cópia em disco privada com validade e remoção por tamanho."""
+
+    def __init__(self, max_memoria_bytes: int, diretorio: str = "", max_disco_bytes: int = 0, ttl_disco: float = 0):
+        self.max_memoria_bytes = max_memoria_bytes
+        self.diretorio = os.path.expanduser(diretorio) if diretorio else ""
+        self.max_disco_bytes = max_disco_bytes
+        self.ttl_disco = ttl_disco
+        self._memoria = OrderedDict()
+        self._bytes_memoria = 0
+        self._lock = threading.Lock()
+        self._lock_disco = threading.Lock()
+        self.hits_memoria = 0
+        self.hits_disco = 0
+        self.misses = 0
+        self.removidos_memoria = 0
+        self.removidos_disco = 0
+
+    @property
+    def disco_ativo(self) -> bool:
+        return bool(self.diretorio) and self.max_disco_bytes > 0
+
+    # ===== ACESSO =====
+    def get(self, chave: str) -> Optional[bytes]:
+        with self._lock:
+            conteudo = self._memoria.get(chave)
+            if conteudo is not None:
+                self._memoria.move_to_end(chave)
+                self.hits_memoria += 1
+                return conteudo
+        conteudo = self._ler_disco(chave)
+        with self._lock:
+            if conteudo is None:
+                self.misses += 1
+                return None
+            self.hits_disco += 1
+            self._guardar_memoria(chave, conteudo)
+        return conteudo
+
+    def set(self, chave: str, conteudo: bytes):
+        with self._lock:
+            self._guardar_memoria(chave, conteudo)
+        self._gravar_disco(chave, conteudo)
+
+    def obter_ou_gerar(self, chave: str, gerar: Callable[[], bytes]) -> bytes:
+        conteudo = self.get(chave)
+        if conteudo is None:
+            conteudo = gerar()
+            self.set(chave, conteudo)
+        return conteudo
+
+    def limpar(self):
+        with self._lock:
+            self._memoria.clear()
+            self._bytes_memoria = 0
+        if self.disco_ativo:
+            with self._lock_disco:
+                for caminho, _, _, _ in self._arquivos_disco():
+                    try:
+                        os.remove(caminho)
+                    except OSError:
+                        pass
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            consultas = self.hits_memoria + self.hits_disco + self.misses
+            return {
+                "entradas_memoria": len(self._memoria),
+                "bytes_memoria": self._bytes_memoria,
+                "max_memoria_bytes": self.max_memoria_bytes,
+                "hits_memoria": self.hits_memoria,
+                "hits_disco": self.hits_disco,
+                "misses": self.misses,
+                "taxa_acerto": (self.hits_memoria + self.hits_disco) / consultas if consultas else 0.0,
+                "removidos_memoria": self.removidos_memoria,
+                "removidos_disco": self.removidos_disco
+            }
+
+    # ===== MEMÓRIA =====
+    def _guardar_memoria(self, chave: str, conteudo: bytes):
+        if len(conteudo) > self.max_memoria_bytes:
+            return
+        anterior = self._memoria.pop(chave, None)
+        if anterior is not None:
+            self._bytes_memoria -= len(anterior)
+        self._memoria[chave] = conteudo
+        self._bytes_memoria += len(conteudo)
+        while self._bytes_memoria > self.max_memoria_bytes:
+            _, removido = self._memoria.popitem(last=False)
+            self._bytes_memoria -= len(removido)
+            self.removidos_memoria += 1
+
+    # ===== DISCO =====
+    # Os arquivos têm dados de pagamento: diretório 0700, arquivos 0600, mtime = gravação (validade) e atime = último uso (remoção)
+    def _caminho(self, chave: str) -> str:
+        return os.path.join(self.diretorio, chave + EXTENSAO)
+
+    def _expirado(self, gravado: float, agora: float) -> bool:
+        return bool(self.ttl_disco) and agora - gravado > self.ttl_disco
+
+    def _ler_disco(self, chave: str) -> Optional[bytes]:
+        if not self.disco_ativo:
+            return None
+        caminho = self._caminho(chave)
+        try:
+            gravado = os.stat(caminho).st_mtime
+            agora = time.time()
+            if self._expirado(gravado, agora):
+                os.remove(caminho)
+                return None
+            with open(caminho, "rb") as arquivo:
+                conteudo = arquivo.read()
+            os.utime(caminho, (agora, gravado))
+            return conteudo
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            print(f"Erro ao ler relatório do cache: {e}")
+            return None
+
+    def _gravar_disco(self, chave: str, conteudo: bytes):
+        if not self.disco_ativo or len(conteudo) > self.max_disco_bytes:
+            return
+        caminho = self._caminho(chave)
+        temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.diretorio, mode=0o700, exist_ok=True)
+            os.chmod(self.diretorio, 0o700)
+            descritor = os.open(temporario, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(descritor, "wb") as arquivo:
+                arquivo.write(conteudo)
+            os.replace(temporario, caminho)
+        except OSError as e:
+            # Sem disco utilizável o cache segue só em memória, em vez de repetir o erro a cada relatório
+            print(f"Erro ao gravar relatório no cache, desativando cache em disco: {e}")
+            self.max_disco_bytes = 0
+            try:
+                os.remove(temporario)
+            except OSError:
+                pass
+            return
+        self._remover_excedente_disco()
+
+    def _arquivos_disco(self) -> list:
+        arquivos = []
+        try:
+            with os.scandir(self.diretorio) as entradas:
+                for entrada in entradas:
+                    if entrada.is_file() and entrada.name.endswith(EXTENSAO):
+                        info = entrada.stat()
+                        arquivos.append((entrada.path, info.st_atime, info.st_mtime, info.st_size))
+        except FileNotFoundError:
+            pass
+        return arquivos
+
+    def _remover_excedente_disco(self):
+        with self._lock_disco:
+            agora = time.time()
+            restantes = []
+            ocupado = 0
+            for arquivo in self._arquivos_disco():
+                caminho, _, gravado, tamanho = arquivo
+                if self._expirado(gravado, agora):
+                    self._remover_arquivo(caminho)
+                    continue
+                restantes.append(arquivo)
+                ocupado += tamanho
+            if ocupado <= self.max_disco_bytes:
+                return
+            for caminho, _, _, tamanho in sorted(restantes, key=lambda a: a[1]):
+                if not self._remover_arquivo(caminho):
+                    continue
+                ocupado -= tamanho
+                if ocupado <= self.max_disco_bytes:
+                    break
+
+    def _remover_arquivo(self, caminho: str) -> bool:
+        try:
+            os.remove(caminho)
+        except OSError:
+            return False
+        self.removidos_disco += 1
+        return True
+
+
+report_cache = ReportCache(
+    settings.REPORT_CACHE_MEMORY_MB * 1024 * 1024,
+    settings.REPORT_CACHE_DIR,
+    settings.REPORT_CACHE_DISK_MB * 1024 * 1024,
+    settings.REPORT_CACHE_DISK_TTL_SECONDS
+)
@@ -1,7 +1,16 @@
+import atexit
 import json
 import csv
 import io
-from typing import List
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from collections.abc import Mapping
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Union
 from datetime import date
 from docx import Document
 from docx.shared import Inches, Pt, RGBColor
@@ -10,28 +19,100 @@ import openpyxl
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
 from xml.etree.ElementTree import Element, SubElement, tostring
 from xml.dom import minidom
+from data.models.dinheiro import ResumoValores
 from data.models.funcionario import Funcionario
+from data.models.horarios import formatar_duracao, horas, minutos_trabalhados, total_minutos
+from services.report_cache import chave_relatorio, report_cache
+from services.templates_html import Template
 from config.settings import settings
 
+VERSAO_RELATORIO = 2
+
+
+class RelatorioTimeoutError(Exception):
+    """Formatos que excederam o tempo de geração; `arquivos` traz os que foram gerados."""
+
+    def __init__(self, formatos: List[str], arquivos: Dict[str, bytes]):
+        super().__init__(f"Tempo esgotado ao gerar relatório: {', '.join(formatos)}")
+        self.formatos = formatos
+        self.arquivos = arquivos
+
+# ===== TEMPLATES HTML =====
+LINHA_HTML = Template("""
+            <tr>
+                <td>{{nome}}</td>
+                <td>R$ {{!valor}}</td>
+                <td>{{entrada}}</td>
+                <td>{{saida}}</td>
+                <td>{{!horas}}</td>
+                <td>{{observacao}}</td>
+            </tr>""")
+
+RELATORIO_HTML = Template("""<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+    <meta charset="UTF-8">
+    <title>Relatório de Salários - {{data}}</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 40px; }
+        h1 { color: #2E7D32; text-align: center; }
+        .info { background: #E8F5E9; padding: 15px; border-radius: 8px; margin: 20px 0; }
+        .info p { margin: 5px 0; }
+        table { width: 100%; border-collapse: collapse; margin-top: 20px; }
+        th { background: #1565C0; color: white; padding: 12px; text-align: left; }
+        td { padding: 10px; border-bottom: 1px solid #ddd; }
+        tr:nth-child(even) { background: #f9f9f9; }
+        .total { font-weight: bold; font-size: 18px; color: #2E7D32; }
+        .footer { margin-top: 30px; text-align: center; color: #666; font-size: 12px; }
+    </style>
+</head>
+<body>
+    <h1>RELATÓRIO DE SALÁRIOS DOS GARÇONS</h1>
+    <div class="info">
+        <p><strong>Data:</strong> {{data}}</p>
+        <p><strong>Dia da Semana:</strong> {{dia_semana}}</p>
+        <p><strong>Total de Funcionários:</strong> {{total_funcionarios}}</p>
+        <p><strong>Total de Horas:</strong> {{total_horas}}</p>
+        <p class="total">Total a Pagar: R$ {{total}}</p>
+    </div>
+    <table>
+        <thead>
+            <tr>
+                <th>Nome</th>
+                <th>10% (R$)</th>
+                <th>Entrada</th>
+                <th>Saída</th>
+                <th>Horas</th>
+                <th>Observação</th>
+            </tr>
+        </thead>
+        <tbody>
+            {{!linhas}}
+        </tbody>
+    </table>
+    <div class="footer">
+        Gerado em {{gerado_em}}
+    </div>
+</body>
+</html>""")
+
+
 class ReportGenerator:
     def __init__(self, funcionarios: List[Funcionario], dia_trabalho: date):
         self.funcionarios = funcionarios
         self.dia_trabalho = dia_trabalho
         self.dia_semana = settings.DIAS_SEMANA.get(dia_trabalho.weekday(), "")
-        self.total = sum(f.valor_10_percent for f in funcionarios)
+        self.resumo = ResumoValores.de_funcionarios(funcionarios)
+        self.total = self.resumo.total
+        self.minutos = minutos_trabalhados(funcionarios)
+        self.total_minutos = total_minutos(self.minutos)
+        self._chave_base = None
 
     def _get_table_html(self) -> str:
-        rows = ""
-        for f in self.funcionarios:
-            rows += f"""
-            <tr>
-                <td>{f.nome}</td>
-                <td>R$ {f.valor_10_percent:.2f}</td>
-                <td>{f.hora_entrada}</td>
-                <td>{f.hora_saida}</td>
-                <td>{f.observacao or '-'}</td>
-            </tr>"""
-        return rows
+        return LINHA_HTML.renderizar_linhas(
+            (f.nome, f"{f.valor_10_percent:.2f}", f.hora_entrada, f.hora_saida, formatar_duracao(minutos), f.observacao or '-')
+            for f, minutos in zip(self.funcionarios, self.minutos)
+        )
 
     def _format_xml(self, xml_str: str) -> str:
         dom = minidom.parseString(xml_str)
@@ -47,23 +128,25 @@ class ReportGenerator:
         info.add_run(f"Data: {self.dia_trabalho.strftime('%d/%m/%Y')}\n").bold = True
         info.add_run(f"Dia da Semana: {self.dia_semana}\n").bold = True
         info.add_run(f"Total de Funcionários: {len(self.funcionarios)}\n").bold = True
+        info.add_run(f"Total de Horas: {formatar_duracao(self.total_minutos)}\n").bold = True
         info.add_run(f"Total a Pagar: R$ {self.total:.2f}").bold = True
         
-        table = doc.add_table(rows=1, cols=5, style='Table Grid')
-        headers = ['Nome', '10% (R$)', 'Entrada', 'Saída', 'Observação']
+        table = doc.add_table(rows=1, cols=6, style='Table Grid')
+        headers = ['Nome', '10% (R$)', 'Entrada', 'Saída', 'Horas', 'Observação']
         
         hdr_cells = table.rows[0].cells
         for i, header in enumerate(headers):
             hdr_cells[i].text = header
             hdr_cells[i].paragraphs[0].runs[0].bold = True
         
-        for f in self.funcionarios:
+        for f, minutos in zip(self.funcionarios, self.minutos):
             row_cells = table.add_row().cells
             row_cells[0].text = f.nome
             row_cells[1].text = f"{f.valor_10_percent:.2f}"
             row_cells[2].text = f.hora_entrada
             row_cells[3].text = f.hora_saida
-            row_cells[4].text = f.observacao or "-"
+            row_cells[4].text = formatar_duracao(minutos)
+            row_cells[5].text = f.observacao or "-"
         
         doc.add_paragraph(f"\nGerado em: {date.today().strftime('%d/%m/%Y às %H:%M')}")
         
@@ -77,7 +160,7 @@ class ReportGenerator:
         ws = wb.active
         ws.title = "Relatório"
         
-        ws.merge_cells('A1:E1')
+        ws.merge_cells('A1:F1')
         ws['A1'] = 'RELATÓRIO DE SALÁRIOS DOS GARÇONS'
         ws['A1'].font = Font(size=14, bold=True, color="FFFFFF")
         ws['A1'].fill = PatternFill("solid", fgColor="2E7D32")
@@ -87,26 +170,29 @@ class ReportGenerator:
         ws['B2'] = f"Dia: {self.dia_semana}"
         ws['A3'] = f"Total Funcionários: {len(self.funcionarios)}"
         ws['B3'] = f"Total a Pagar: R$ {self.total:.2f}"
+        ws['C3'] = f"Total de Horas: {formatar_duracao(self.total_minutos)}"
         
-        headers = ['Nome', '10% (R$)', 'Entrada', 'Saída', 'Observação']
+        headers = ['Nome', '10% (R$)', 'Entrada', 'Saída', 'Horas', 'Observação']
         for col, header in enumerate(headers, 1):
             cell = ws.cell(row=5, column=col, value=header)
             cell.font = Font(bold=True, color="FFFFFF")
             cell.fill = PatternFill("solid", fgColor="1565C0")
             cell.alignment = Alignment(horizontal="center")
         
-        for row, f in enumerate(self.funcionarios, 6):
+        for row, (f, minutos) in enumerate(zip(self.funcionarios, self.minutos), 6):
             ws.cell(row=row, column=1, value=f.nome)
             ws.cell(row=row, column=2, value=f.valor_10_percent)
             ws.cell(row=row, column=3, value=f.hora_entrada)
             ws.cell(row=row, column=4, value=f.hora_saida)
-            ws.cell(row=row, column=5, value=f.observacao or "-")
+            ws.cell(row=row, column=5, value=horas(minutos))
+            ws.cell(row=row, column=6, value=f.observacao or "-")
         
         ws.column_dimensions['A'].width = 25
         ws.column_dimensions['B'].width = 15
         ws.column_dimensions['C'].width = 12
         ws.column_dimensions['D'].width = 12
-        ws.column_dimensions['E'].width = 30
+        ws.column_dimensions['E'].width = 10
+        ws.column_dimensions['F'].width = 30
         
         buffer = io.BytesIO()
         wb.save(buffer)
@@ -116,14 +202,15 @@ class ReportGenerator:
     def generate_csv(self) -> str:
         output = io.StringIO()
         writer = csv.writer(output)
-        writer.writerow(['Nome', '10% (R$)', 'Entrada', 'Saída', 'Observação'])
+        writer.writerow(['Nome', '10% (R$)', 'Entrada', 'Saída', 'Horas', 'Observação'])
         
-        for f in self.funcionarios:
+        for f, minutos in zip(self.funcionarios, self.minutos):
             writer.writerow([
                 f.nome,
                 f"{f.valor_10_percent:.2f}",
                 f.hora_entrada,
                 f.hora_saida,
+                f"{horas(minutos):.2f}" if minutos is not None else "",
                 f.observacao or ""
             ])
         
@@ -135,7 +222,8 @@ class ReportGenerator:
                 "data": self.dia_trabalho.isoformat(),
                 "dia_semana": self.dia_semana,
                 "total_funcionarios": len(self.funcionarios),
-                "total_valores": self.total
+                "total_valores": self.total,
+                "total_horas": horas(self.total_minutos)
             },
             "funcionarios": [
                 {
@@ -143,9 +231,10 @@ class ReportGenerator:
                     "valor_10_percent": f.valor_10_percent,
                     "hora_entrada": f.hora_entrada,
                     "hora_saida": f.hora_saida,
+                    "horas_trabalhadas": horas(minutos),
                     "observacao": f.observacao
                 }
-                for f in self.funcionarios
+                for f, minutos in zip(self.funcionarios, self.minutos)
             ]
         }
         return json.dumps(data, ensure_ascii=False, indent=2)
@@ -158,71 +247,232 @@ class ReportGenerator:
         meta = SubElement(root, 'resumo')
         SubElement(meta, 'total_funcionarios').text = str(len(self.funcionarios))
         SubElement(meta, 'total_valores').text = f"{self.total:.2f}"
+        SubElement(meta, 'total_horas').text = f"{horas(self.total_minutos):.2f}"
         
         funcs = SubElement(root, 'funcionarios')
-        for f in self.funcionarios:
+        for f, minutos in zip(self.funcionarios, self.minutos):
             func = SubElement(funcs, 'funcionario')
             SubElement(func, 'nome').text = f.nome
             SubElement(func, 'valor_10_percent').text = f"{f.valor_10_percent:.2f}"
             SubElement(func, 'hora_entrada').text = f.hora_entrada
             SubElement(func, 'hora_saida').text = f.hora_saida
+            SubElement(func, 'horas_trabalhadas').text = f"{horas(minutos):.2f}" if minutos is not None else ""
             SubElement(func, 'observacao').text = f.observacao or ""
         
         return self._format_xml(tostring(root, encoding='unicode'))
 
     def generate_html(self) -> str:
-        return f"""<!DOCTYPE html>
-<html lang="pt-BR">
-<head>
-    <meta charset="UTF-8">
-    <title>Relatório de Salários - {self.dia_trabalho.strftime('%d/%m/%Y')}</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 40px; }}
-        h1 {{ color: #2E7D32; text-align: center; }}
-        .info {{ background: #E8F5E9; padding: 15px; border-radius: 8px; margin: 20px 0; }}
-        .info p {{ margin: 5px 0; }}
-        table {{ width: 100%; border-collapse: collapse; margin-top: 20px; }}
-        th {{ background: #1565C0; color: white; padding: 12px; text-align: left; }}
-        td {{ padding: 10px; border-bottom: 1px solid #ddd; }}
-        tr:nth-child(even) {{ background: #f9f9f9; }}
-        .total {{ font-weight: bold; font-size: 18px; color: #2E7D32; }}
-        .footer {{ margin-top: 30px; text-align: center; color: #666; font-size: 12px; }}
-    </style>
-</head>
-<body>
-    <h1>RELATÓRIO DE SALÁRIOS DOS GARÇONS</h1>
-    <div class="info">
-        <p><strong>Data:</strong> {self.dia_trabalho.strftime('%d/%m/%Y')}</p>
-        <p><strong>Dia da Semana:</strong> {self.dia_semana}</p>
-        <p><strong>Total de Funcionários:</strong> {len(self.funcionarios)}</p>
-        <p class="total">Total a Pagar: R$ {self.total:.2f}</p>
-    </div>
-    <table>
-        <thead>
-            <tr>
-                <th>Nome</th>
-                <th>10% (R$)</th>
-                <th>Entrada</th>
-                <th>Saída</th>
-                <th>Observação</th>
-            </tr>
-        </thead>
-        <tbody>
-            {self._get_table_html()}
-        </tbody>
-    </table>
-    <div class="footer">
-        Gerado em {date.today().strftime('%d/%m/%Y às %H:%M')}
-    </div>
-</body>
-</html>"""
-
-    def generate_all(self) -> dict:
-        return {
-            "docx": self.generate_docx(),
-            "excel": self.generate_excel(),
-            "csv": self.generate_csv().encode('utf-8'),
-            "json": self.generate_json().encode('utf-8'),
-            "xml": self.generate_xml().encode('utf-8'),
-            "html": self.generate_html().encode('utf-8')
-        }
+        data = self.dia_trabalho.strftime('%d/%m/%Y')
+        return RELATORIO_HTML.renderizar(
+            data=data,
+            dia_semana=self.dia_semana,
+            total_funcionarios=len(self.funcionarios),
+            total_horas=formatar_duracao(self.total_minutos),
+            total=f"{self.total:.2f}",
+            linhas=self._get_table_html(),
+            gerado_em=date.today().strftime('%d/%m/%Y às %H:%M')
+        )
+
+    def generate_format(self, formato: str, usar_cache: bool = None) -> bytes:
+        if usar_cache is None:
+            usar_cache = settings.REPORT_CACHE_ENABLED
+        if not usar_cache:
+            return self._renderizar(formato)
+        return report_cache.obter_ou_gerar(self.chave_cache(formato), lambda: self._renderizar(formato))
+
+    def _renderizar(self, formato: str) -> bytes:
+        especificacao = FORMATOS_RELATORIO.get(formato)
+        if especificacao is None:
+            raise ValueError(f"formato de relatório desconhecido: {formato}")
+        conteudo = especificacao.gerar(self)
+        return conteudo.encode('utf-8') if isinstance(conteudo, str) else conteudo
+
+    def arquivos(self, formatos: List[str] = None) -> "ArquivosRelatorio":
+        return ArquivosRelatorio(self, formatos_configurados(formatos))
+
+    def chave_cache(self, formato: str) -> str:
+        # O rodapé "Gerado em" muda a cada dia, então a data de geração também entra na chave
+        if self._chave_base is None:
+            self._chave_base = chave_relatorio(VERSAO_RELATORIO, self.dados_compactos())
+        return chave_relatorio(self._chave_base, formato, date.today().isoformat())
+
+    def dados_compactos(self) -> tuple:
+        return (self.dia_trabalho.toordinal(), [
+            (f.nome, f.valor_10_percent, f.hora_entrada, f.hora_saida, f.observacao,
+             f.vale, f.tipo_vale, f.pago, f.tipo_pagamento)
+            for f in self.funcionarios
+        ])
+
+    @classmethod
+    def from_dados_compactos(cls, dados: tuple) -> "ReportGenerator":
+        dia, linhas = dados
+        return cls([Funcionario(nome=n, valor_10_percent=v, hora_entrada=he, hora_saida=hs, observacao=o,
+                                vale=vl, tipo_vale=tv, pago=pg, tipo_pagamento=tp)
+                    for n, v, he, hs, o, vl, tv, pg, tp in linhas], date.fromordinal(dia))
+
+    def generate_all(self, formatos: List[str] = None, paralelo: bool = None, timeout: float = None) -> dict:
+        formatos = formatos_configurados(formatos)
+        timeout = settings.REPORT_TIMEOUT_SECONDS if timeout is None else timeout
+        arquivos = {}
+        if settings.REPORT_CACHE_ENABLED:
+            for formato in formatos:
+                conteudo = report_cache.get(self.chave_cache(formato))
+                if conteudo is not None:
+                    arquivos[formato] = conteudo
+        faltantes = [f for f in formatos if f not in arquivos]
+        if paralelo is None:
+            paralelo = settings.REPORT_PARALLEL and len(faltantes) > 1 and len(self.funcionarios) >= MIN_LINHAS_PARALELO
+        gerados = None
+        estourados = []
+        if paralelo and faltantes:
+            try:
+                gerados, estourados = self._generate_all_paralelo(faltantes, timeout)
+            except BrokenProcessPool as e:
+                print(f"Erro no pool de relatórios, gerando em série: {e}")
+                _encerrar_pool()
+        if gerados is None:
+            gerados = {formato: self._renderizar(formato) for formato in faltantes}
+        if settings.REPORT_CACHE_ENABLED:
+            for formato, conteudo in gerados.items():
+                report_cache.set(self.chave_cache(formato), conteudo)
+        arquivos.update(gerados)
+        arquivos = {formato: arquivos[formato] for formato in formatos if formato in arquivos}
+        if estourados:
+            raise RelatorioTimeoutError(estourados, arquivos)
+        return arquivos
+
+    def _generate_all_paralelo(self, formatos: List[str], timeout: float) -> tuple:
+        dados = self.dados_compactos()
+        pool = _obter_pool()
+        pendentes = {pool.submit(_gerar_formato, dados, formato): formato for formato in formatos}
+        inicios = {}
+        arquivos = {}
+        estourados = []
+        while pendentes:
+            # O prazo de cada formato conta a partir de quando um worker começa a gerá-lo, não da submissão
+            agora = time.monotonic()
+            for futuro in pendentes:
+                if futuro not in inicios and futuro.running():
+                    inicios[futuro] = agora
+            for futuro in [f for f in pendentes if timeout and f in inicios and agora - inicios[f] >= timeout]:
+                formato = pendentes.pop(futuro)
+                print(f"Erro: relatório {formato} excedeu {timeout}s")
+                estourados.append(formato)
+            # Com todos os workers presos em formatos estourados, os que ainda esperam na fila nunca começariam
+            if len(estourados) >= pool._max_workers and not any(f in inicios for f in pendentes):
+                estourados.extend(pendentes.values())
+                break
+            prontos, _ = wait(pendentes, timeout=INTERVALO_PARALELO, return_when=FIRST_COMPLETED)
+            for futuro in prontos:
+                arquivos[pendentes.pop(futuro)] = futuro.result()
+        if estourados:
+            # cancel() não interrompe um worker em execução: o pool é morto depois que os demais formatos terminaram
+            _encerrar_pool(matar=True)
+        return arquivos, [formato for formato in formatos if formato in estourados]
+
+
+class ArquivosRelatorio(Mapping):
+    """Arquivos do relatório por formato; cada formato só é gerado quando seus bytes são lidos."""
+
+    def __init__(self, report: ReportGenerator, formatos: List[str]):
+        self._report = report
+        self._formatos = list(formatos)
+        self._gerados: Dict[str, bytes] = {}
+
+    def __getitem__(self, formato: str) -> bytes:
+        if formato not in self._formatos:
+            raise KeyError(formato)
+        conteudo = self._gerados.get(formato)
+        if conteudo is None:
+            conteudo = self._gerados[formato] = self._report.generate_format(formato)
+        return conteudo
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._formatos)
+
+    def __len__(self) -> int:
+        return len(self._formatos)
+
+    def carregar(self, paralelo: bool = None, timeout: float = None) -> "ArquivosRelatorio":
+        # Gera de uma vez (em paralelo, se valer a pena) os formatos ainda não lidos; num estouro de tempo os já gerados ficam guardados
+        faltantes = [f for f in self._formatos if f not in self._gerados]
+        if faltantes:
+            try:
+                self._gerados.update(self._report.generate_all(faltantes, paralelo, timeout))
+            except RelatorioTimeoutError as e:
+                self._gerados.update(e.arquivos)
+                raise
+        return self
+
+
+# ===== REGISTRO DE FORMATOS =====
+@dataclass(frozen=True, slots=True)
+class FormatoRelatorio:
+    nome: str
+    rotulo: str
+    extensao: str
+    mime: str
+    gerar: Callable[[ReportGenerator], Union[str, bytes]]
+
+    def nome_arquivo(self, dia_trabalho: date) -> str:
+        return f"relatorio_{dia_trabalho}.{self.extensao}"
+
+
+FORMATOS_RELATORIO: Dict[str, FormatoRelatorio] = {}
+
+
+def registrar_formato(nome: str, rotulo: str, extensao: str, mime: str,
+                      gerar: Callable[[ReportGenerator], Union[str, bytes]]) -> FormatoRelatorio:
+    especificacao = FORMATOS_RELATORIO[nome] = FormatoRelatorio(nome, rotulo, extensao, mime, gerar)
+    return especificacao
+
+
+def formatos_configurados(formatos: List[str] = None) -> List[str]:
+    return [f for f in (formatos or settings.REPORT_FORMATS) if f in FORMATOS_RELATORIO]
+
+
+registrar_formato("docx", "DOCX", "docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                  ReportGenerator.generate_docx)
+registrar_formato("excel", "Excel", "xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                  ReportGenerator.generate_excel)
+registrar_formato("csv", "CSV", "csv", "text/csv", ReportGenerator.generate_csv)
+registrar_formato("json", "JSON", "json", "application/json", ReportGenerator.generate_json)
+registrar_formato("xml", "XML", "xml", "application/xml", ReportGenerator.generate_xml)
+registrar_formato("html", "HTML", "html", "text/html", ReportGenerator.generate_html)
+
+
+# ===== GERAÇÃO EM PROCESSOS =====
+MIN_LINHAS_PARALELO = 200
+INTERVALO_PARALELO = 0.05
+
+_pool: Optional[ProcessPoolExecutor] = None
+_lock_pool = threading.Lock()
+
+
+def _gerar_formato(dados: tuple, formato: str) -> bytes:
+    return ReportGenerator.from_dados_compactos(dados)._renderizar(formato)
+
+
+def _obter_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _lock_pool:
+        if _pool is None:
+            workers = settings.REPORT_WORKERS or min(len(FORMATOS_RELATORIO), os.cpu_count() or 1)
+            # spawn: as interfaces (Tk, Streamlit) têm threads, e fork copiaria locks presos nelas para os workers
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def _encerrar_pool(matar: bool = False):
+    global _pool
+    with _lock_pool:
+        pool, _pool = _pool, None
+    if pool is None:
+        return
+    if matar:
+        for processo in list((pool._processes or {}).values()):
+            processo.kill()
+    pool.shutdown(wait=matar, cancel_futures=True)
+
+
+atexit.register(_encerrar_pool)
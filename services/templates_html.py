@@ -0,0 +1,46 @@
+import html
+import re
+from typing import Iterable
+
+MARCADOR = re.compile(r"\{\{\s*(!?)(\w+)\s*\}\}")
+
+
+def escapar(valor) -> str:
+    return html.escape(str(valor)) if valor is not None else ""
+
+
+class Template:
+    """Template HTML compilado na importação: {{campo}} entra escapado e {{!campo}} entra cru (fragmentos e números já formatados)."""
+
+    __slots__ = ("campos", "_partes", "_final")
+
+    def __init__(self, texto: str):
+        campos = []
+        partes = []
+        posicao = 0
+        for marcador in MARCADOR.finditer(texto):
+            cru, campo = marcador.groups()
+            if campo not in campos:
+                campos.append(campo)
+            partes.append((texto[posicao:marcador.start()], campos.index(campo), bool(cru)))
+            posicao = marcador.end()
+        self.campos = tuple(campos)
+        self._partes = tuple(partes)
+        self._final = texto[posicao:]
+
+    def _preencher(self, valores: tuple) -> str:
+        pedacos = []
+        for estatico, indice, cru in self._partes:
+            valor = valores[indice]
+            pedacos.append(estatico)
+            pedacos.append(str(valor) if cru else escapar(valor))
+        pedacos.append(self._final)
+        return "".join(pedacos)
+
+    def renderizar(self, **valores) -> str:
+        return self._preencher(tuple(valores[campo] for campo in self.campos))
+
+    def renderizar_linhas(self, linhas: Iterable[tuple]) -> str:
+        """Uma tupla por linha, na ordem de `campos`."""
+        preencher = self._preencher
+        return "".join([preencher(linha) for linha in linhas])
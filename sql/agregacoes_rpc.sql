@@ -0,0 +1,123 @@
+-- =====================================================
+-- Script SQL para Agregações do Histórico (RPC)
+-- Sistema de Relatório de Salários de Garçons
+-- =====================================================
+-- Funções chamadas pelo SupabaseRepository via rpc().
+-- Devolvem uma linha por funcionário (ou uma linha de totais),
+-- evitando baixar a tabela funcionarios inteira para agregar no Python.
+-- Os parâmetros p_inicio/p_fim são opcionais e filtram por dia_trabalho.
+
+-- =====================================================
+-- 1. ÍNDICE DE APOIO
+-- =====================================================
+CREATE INDEX IF NOT EXISTS idx_funcionarios_nome_dia ON public.funcionarios(nome, dia_trabalho);
+
+-- =====================================================
+-- 2. FUNÇÃO - Total de Funcionários
+-- =====================================================
+CREATE OR REPLACE FUNCTION public.fn_total_funcionarios(p_inicio DATE DEFAULT NULL, p_fim DATE DEFAULT NULL)
+RETURNS TABLE (
+    total_cadastrados BIGINT,
+    total_registros BIGINT,
+    total_dias_trabalhados BIGINT,
+    total_geral_pago NUMERIC,
+    total_pago NUMERIC,
+    total_pendente NUMERIC,
+    primeiro_registro DATE,
+    ultimo_registro DATE
+) AS $$
+    SELECT
+        COUNT(DISTINCT f.nome),
+        COUNT(*),
+        COUNT(DISTINCT f.dia_trabalho),
+        COALESCE(SUM(f.valor_10_percent), 0),
+        COALESCE(SUM(CASE WHEN f.pago THEN f.valor_10_percent ELSE 0 END), 0),
+        COALESCE(SUM(CASE WHEN f.pago THEN 0 ELSE f.valor_10_percent END), 0),
+        MIN(f.dia_trabalho),
+        MAX(f.dia_trabalho)
+    FROM public.funcionarios f
+    WHERE (p_inicio IS NULL OR f.dia_trabalho >= p_inicio)
+      AND (p_fim IS NULL OR f.dia_trabalho <= p_fim);
+$$ LANGUAGE sql STABLE;
+
+-- =====================================================
+-- 3. FUNÇÃO - Ranking de Pagamentos
+-- =====================================================
+-- total_horas soma a duração dos turnos; saída antes da entrada conta como turno que vira a noite.
+DROP FUNCTION IF EXISTS public.fn_ranking_pagamentos(DATE, DATE);
+CREATE OR REPLACE FUNCTION public.fn_ranking_pagamentos(p_inicio DATE DEFAULT NULL, p_fim DATE DEFAULT NULL)
+RETURNS TABLE (
+    posicao BIGINT,
+    nome TEXT,
+    dias_trabalhados BIGINT,
+    total_recebido NUMERIC,
+    media_diaria NUMERIC,
+    maior_diaria NUMERIC,
+    menor_diaria NUMERIC,
+    total_pago NUMERIC,
+    total_pendente NUMERIC,
+    total_horas NUMERIC
+) AS $$
+    SELECT
+        ROW_NUMBER() OVER (ORDER BY SUM(f.valor_10_percent) DESC, f.nome),
+        f.nome,
+        COUNT(*),
+        SUM(f.valor_10_percent),
+        AVG(f.valor_10_percent),
+        MAX(f.valor_10_percent),
+        MIN(f.valor_10_percent),
+        SUM(CASE WHEN f.pago THEN f.valor_10_percent ELSE 0 END),
+        SUM(CASE WHEN f.pago THEN 0 ELSE f.valor_10_percent END),
+        COALESCE(SUM(EXTRACT(EPOCH FROM (
+            f.hora_saida - f.hora_entrada
+            + CASE WHEN f.hora_saida < f.hora_entrada THEN INTERVAL '24 hours' ELSE INTERVAL '0' END
+        )) / 3600), 0)
+    FROM public.funcionarios f
+    WHERE (p_inicio IS NULL OR f.dia_trabalho >= p_inicio)
+      AND (p_fim IS NULL OR f.dia_trabalho <= p_fim)
+    GROUP BY f.nome
+    ORDER BY SUM(f.valor_10_percent) DESC, f.nome;
+$$ LANGUAGE sql STABLE;
+
+-- =====================================================
+-- 4. FUNÇÃO - Data de Cadastramento
+-- =====================================================
+CREATE OR REPLACE FUNCTION public.fn_data_cadastramento(p_inicio DATE DEFAULT NULL, p_fim DATE DEFAULT NULL)
+RETURNS TABLE (
+    nome TEXT,
+    primeiro_dia_trabalho DATE,
+    ultimo_dia_trabalho DATE,
+    total_dias_trabalhados BIGINT,
+    total_recebido NUMERIC,
+    data_cadastro_banco TIMESTAMP WITH TIME ZONE,
+    dias_trabalhados DATE[]
+) AS $$
+    SELECT
+        f.nome,
+        MIN(f.dia_trabalho),
+        MAX(f.dia_trabalho),
+        COUNT(*),
+        SUM(f.valor_10_percent),
+        MIN(f.created_at),
+        ARRAY_AGG(DISTINCT f.dia_trabalho ORDER BY f.dia_trabalho)
+    FROM public.funcionarios f
+    WHERE (p_inicio IS NULL OR f.dia_trabalho >= p_inicio)
+      AND (p_fim IS NULL OR f.dia_trabalho <= p_fim)
+    GROUP BY f.nome
+    ORDER BY MIN(f.dia_trabalho) DESC, f.nome;
+$$ LANGUAGE sql STABLE;
+
+-- =====================================================
+-- 5. PERMISSÕES
+-- =====================================================
+GRANT EXECUTE ON FUNCTION public.fn_total_funcionarios(DATE, DATE) TO anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.fn_ranking_pagamentos(DATE, DATE) TO anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.fn_data_cadastramento(DATE, DATE) TO anon, authenticated;
+
+-- Verificar criação
+SELECT 'Funções de agregação criadas com sucesso!' as resultado;
+
+-- Testar as funções
+-- SELECT * FROM public.fn_total_funcionarios();
+-- SELECT * FROM public.fn_ranking_pagamentos();
+-- SELECT * FROM public.fn_data_cadastramento('2026-01-01', '2026-01-31');
@@ -0,0 +1,31 @@
+-- =====================================================
+-- Script SQL para Leitura Incremental de Logs
+-- Sistema de Relatório de Salários de Garçons
+-- =====================================================
+-- Apoia o SupabaseRepository.listar_logs_novos, que busca apenas os
+-- logs mais novos que o cursor (created_at, id), com filtro combinado
+-- de acao + tabela feito no servidor.
+
+-- =====================================================
+-- 1. ÍNDICE DO CURSOR (created_at, id)
+-- =====================================================
+CREATE INDEX IF NOT EXISTS idx_logs_created_at_id ON public.logs(created_at DESC, id DESC);
+
+-- =====================================================
+-- 2. ÍNDICES DOS FILTROS COMBINADOS
+-- =====================================================
+CREATE INDEX IF NOT EXISTS idx_logs_acao_tabela_created_at ON public.logs(acao, tabela, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_logs_tabela_created_at ON public.logs(tabela, created_at DESC, id DESC);
+
+-- =====================================================
+-- 3. REMOVER ÍNDICES SUBSTITUÍDOS
+-- =====================================================
+-- idx_logs_acao é coberto pelo prefixo de idx_logs_acao_tabela_created_at,
+-- idx_logs_tabela por idx_logs_tabela_created_at e idx_logs_created_at
+-- por idx_logs_created_at_id.
+DROP INDEX IF EXISTS public.idx_logs_acao;
+DROP INDEX IF EXISTS public.idx_logs_tabela;
+DROP INDEX IF EXISTS public.idx_logs_created_at;
+
+-- Verificar criação
+SELECT 'Índices de logs criados com sucesso!' as resultado;
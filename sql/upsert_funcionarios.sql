@@ -0,0 +1,33 @@
+-- =====================================================
+-- Script SQL para Upsert de Registros Diários
+-- Sistema de Relatório de Salários de Garçons
+-- =====================================================
+-- Garante um único registro por funcionário e dia de trabalho,
+-- permitindo que o SupabaseRepository.upsert_funcionarios grave
+-- N turnos em uma única requisição (on_conflict=nome,dia_trabalho).
+
+-- =====================================================
+-- 1. REMOVER DUPLICATAS (mantém o registro mais recente;
+--    updated_at nulo cai para created_at, senão -infinity)
+-- =====================================================
+DELETE FROM public.funcionarios f
+USING public.funcionarios d
+WHERE f.nome = d.nome
+  AND f.dia_trabalho = d.dia_trabalho
+  AND (COALESCE(f.updated_at, f.created_at, '-infinity'), f.id)
+    < (COALESCE(d.updated_at, d.created_at, '-infinity'), d.id);
+
+-- =====================================================
+-- 2. RESTRIÇÃO ÚNICA (nome, dia_trabalho)
+-- =====================================================
+ALTER TABLE public.funcionarios
+    DROP CONSTRAINT IF EXISTS funcionarios_nome_dia_trabalho_key;
+
+ALTER TABLE public.funcionarios
+    ADD CONSTRAINT funcionarios_nome_dia_trabalho_key UNIQUE (nome, dia_trabalho);
+
+-- Verificar criação
+SELECT 'Restrição única criada com sucesso!' as resultado;
+
+-- Verificar duplicatas restantes (deve retornar vazio)
+-- SELECT * FROM public.verificar_duplicatas();
@@ -0,0 +1,37 @@
+import os
+import sys
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Todos os testes rodam contra o backend em memória; nada é lido de um Supabase real
+os.environ.update({
+    "SUPABASE_CLIENT_FACTORY": "data.repositories.fake_supabase:create_client",
+    "SUPABASE_URL": "fake://testes",
+    "SUPABASE_KEY": "chave-de-teste",
+    "LOCAL_REPLICA_ENABLED": "false",
+    "QUERY_CACHE_ENABLED": "false",
+    "INSTRUMENTATION_ENABLED": "false",
+    "LOG_BUFFER_ENABLED": "false",
+    "REPORT_CACHE_DISK_MB": "0"
+})
+
+import pytest
+from config.settings import settings
+from data.repositories import fake_supabase
+from data.repositories.supabase_repository import SupabaseRepository
+
+
+@pytest.fixture
+def banco(monkeypatch):
+    """Banco em memória novo para cada teste."""
+    url = f"fake://{uuid.uuid4().hex}"
+    monkeypatch.setattr(settings, "SUPABASE_URL", url)
+    return fake_supabase.obter_banco(url)
+
+
+@pytest.fixture
+def repositorio(banco):
+    repo = SupabaseRepository()
+    yield repo
+    repo.fechar()
@@ -0,0 +1,30 @@
+import pytest
+from benchmarks.dados import gerar_linhas
+from config.settings import settings
+from data.repositories.async_supabase_repository import AsyncSupabaseRepository
+
+
+@pytest.mark.parametrize("usar_rpc", [True, False])
+def test_snapshot_assincrono_igual_ao_sincrono(banco, repositorio, monkeypatch, usar_rpc):
+    banco.carregar("funcionarios", gerar_linhas(120, garcons=15))
+    monkeypatch.setattr(settings, "SUPABASE_USE_RPC", usar_rpc)
+    assincrono = AsyncSupabaseRepository(repositorio)
+
+    snapshot = assincrono.executar(assincrono.get_historico_snapshot(limite_presenca=20, limite_pagamentos=30))
+
+    assert snapshot == repositorio.get_historico_snapshot(limite_presenca=20, limite_pagamentos=30)
+    assert snapshot.total.total_registros == 120
+    assert (len(snapshot.presenca), len(snapshot.pagamentos)) == (20, 30)
+
+
+def test_consultas_em_paralelo(banco, repositorio):
+    banco.carregar("funcionarios", gerar_linhas(10, garcons=5))
+    assincrono = AsyncSupabaseRepository(repositorio)
+
+    r = assincrono.executar_em_paralelo(
+        total=assincrono.get_total_funcionarios(),
+        ranking=assincrono.listar_ranking_pagamentos()
+    )
+
+    assert r["total"].total_registros == 10
+    assert len(r["ranking"]) == 5
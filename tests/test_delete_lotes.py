@@ -0,0 +1,23 @@
+from data.repositories import supabase_repository
+from benchmarks.dados import gerar_linhas
+
+
+def test_delete_em_lotes_remove_so_os_ids_pedidos(banco, repositorio, monkeypatch):
+    monkeypatch.setattr(supabase_repository, "TAMANHO_LOTE_DELETE", 20)
+    linhas = gerar_linhas(75, garcons=25)
+    banco.carregar("funcionarios", linhas)
+    alvo = [linha["id"] for linha in linhas[:50]]
+    progresso = []
+
+    removidos = repositorio.deletar_funcionarios_por_ids(alvo, lambda feitos, total: progresso.append((feitos, total)))
+
+    assert removidos == 50
+    assert progresso == [(0, 50), (20, 50), (40, 50), (50, 50)]
+    assert set(banco.tabela("funcionarios").linhas) == {linha["id"] for linha in linhas[50:]}
+
+
+def test_delete_em_lotes_sem_ids_nao_consulta(banco, repositorio):
+    banco.carregar("funcionarios", gerar_linhas(5, garcons=5))
+
+    assert repositorio.deletar_funcionarios_por_ids([]) == 0
+    assert len(banco.tabela("funcionarios").linhas) == 5
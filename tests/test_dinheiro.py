@@ -0,0 +1,52 @@
+from decimal import Decimal
+import pytest
+from data.models.dinheiro import ResumoValores, de_centavos, para_centavos, somar_centavos
+from data.models.funcionario import Funcionario
+from data.models.frame import FuncionarioFrame
+
+
+@pytest.mark.parametrize("valor, centavos", [
+    (10, 1000),
+    (10.5, 1050),
+    (0.1 + 0.2, 30),
+    (1.005, 101),
+    (2.675, 268),
+    ("12.5", 1250),
+    (Decimal("3.333"), 333),
+    (None, 0),
+    ("", 0),
+    ("abc", 0)
+])
+def test_para_centavos(valor, centavos):
+    assert para_centavos(valor) == centavos
+
+
+def test_soma_em_centavos_e_exata():
+    valores = [0.1] * 10
+    assert somar_centavos(valores) == 100
+    assert de_centavos(somar_centavos(valores)) == 1.0
+
+
+def test_funcionario_guarda_centavos():
+    f = Funcionario(valor_10_percent=10.005, vale=2.5)
+
+    assert (f.valor_centavos, f.vale_centavos) == (1001, 250)
+    assert (f.valor_10_percent, f.vale) == (10.01, 2.5)
+
+    f.vale = None
+    f.valor_10_percent = "3.10"
+    assert (f.valor_centavos, f.vale_centavos, f.vale) == (310, None, None)
+
+
+def test_resumo_igual_pelo_modelo_e_pelo_frame():
+    funcionarios = [
+        Funcionario(nome="Ana", valor_10_percent=0.1, vale=1.0, pago=True),
+        Funcionario(nome="Bruno", valor_10_percent=0.2),
+        Funcionario(nome="Carla", valor_10_percent=120.35, vale=0.05, pago=True)
+    ]
+
+    resumo = ResumoValores.de_funcionarios(funcionarios)
+
+    assert resumo == FuncionarioFrame.from_funcionarios(funcionarios).resumo()
+    assert (resumo.total_centavos, resumo.pago_centavos, resumo.pendente_centavos, resumo.vales_centavos) == (12065, 12045, 20, 105)
+    assert (resumo.quantidade, resumo.pagos, resumo.pendentes) == (3, 2, 1)
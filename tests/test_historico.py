@@ -0,0 +1,105 @@
+from datetime import date
+import pytest
+from config.settings import settings
+from data.repositories.agregacoes import AgregadorHistorico
+
+# Totais calculados à mão; o agregador em Python não pode ser conferido contra as RPCs do
+# backend em memória, que usam o mesmo AgregadorHistorico
+LINHAS = [
+    {"nome": "Ana", "dia_trabalho": "2025-01-02", "hora_entrada": "08:00", "hora_saida": "16:00",
+     "valor_10_percent": 100.0, "pago": True, "created_at": "2025-01-02T16:00:00+00:00"},
+    {"nome": "Ana", "dia_trabalho": "2025-01-03", "hora_entrada": "18:00", "hora_saida": "02:00",
+     "valor_10_percent": 50.5, "pago": False, "created_at": "2025-01-04T02:00:00+00:00"},
+    {"nome": "Bruno", "dia_trabalho": "2025-01-02", "hora_entrada": "10:00", "hora_saida": "16:30",
+     "valor_10_percent": 80.25, "pago": True, "created_at": "2025-01-02T16:30:00+00:00"},
+    {"nome": "Carla", "dia_trabalho": "2025-01-04", "hora_entrada": "12:00", "hora_saida": "18:00",
+     "valor_10_percent": 30.0, "pago": False, "created_at": "2025-01-04T18:00:00+00:00"}
+]
+
+
+@pytest.fixture
+def sem_rpc(monkeypatch):
+    monkeypatch.setattr(settings, "SUPABASE_USE_RPC", False)
+
+
+def test_total_em_python(banco, repositorio, sem_rpc):
+    banco.carregar("funcionarios", LINHAS)
+
+    total = repositorio.get_total_funcionarios()
+
+    assert (total.total_cadastrados, total.total_registros, total.total_dias_trabalhados) == (3, 4, 3)
+    assert total.total_geral_pago == pytest.approx(260.75)
+    assert total.total_pago == pytest.approx(180.25)
+    assert total.total_pendente == pytest.approx(80.5)
+    assert (total.primeiro_registro, total.ultimo_registro) == (date(2025, 1, 2), date(2025, 1, 4))
+
+
+def test_ranking_em_python(banco, repositorio, sem_rpc):
+    banco.carregar("funcionarios", LINHAS)
+
+    ranking = repositorio.listar_ranking_pagamentos()
+
+    assert [(r.posicao, r.nome) for r in ranking] == [(1, "Ana"), (2, "Bruno"), (3, "Carla")]
+    ana = ranking[0]
+    assert ana.dias_trabalhados == 2
+    assert (ana.total_recebido, ana.media_diaria) == pytest.approx((150.5, 75.25))
+    assert (ana.maior_diaria, ana.menor_diaria) == pytest.approx((100.0, 50.5))
+    assert (ana.total_pago, ana.total_pendente) == pytest.approx((100.0, 50.5))
+    assert ana.total_horas == pytest.approx(16.0)
+    assert [r.total_horas for r in ranking[1:]] == pytest.approx([6.5, 6.0])
+
+
+def test_intervalo_de_datas_em_python(banco, repositorio, sem_rpc):
+    banco.carregar("funcionarios", LINHAS)
+
+    total = repositorio.get_total_funcionarios(date(2025, 1, 3), date(2025, 1, 4))
+
+    assert total.total_registros == 2
+    assert total.total_geral_pago == pytest.approx(80.5)
+
+
+def test_snapshot_em_python(banco, repositorio, sem_rpc):
+    banco.carregar("funcionarios", LINHAS)
+
+    snapshot = repositorio.get_historico_snapshot(limite_presenca=2, limite_pagamentos=3)
+
+    assert snapshot.total.total_geral_pago == pytest.approx(260.75)
+    assert [r.nome for r in snapshot.ranking] == ["Ana", "Bruno", "Carla"]
+    assert [p.dia_trabalho for p in snapshot.presenca] == [date(2025, 1, 4), date(2025, 1, 3)]
+    assert len(snapshot.pagamentos) == 3
+    cadastro = {c.nome: c for c in snapshot.cadastramento}
+    assert cadastro["Ana"].data_cadastro_banco == "2025-01-02T16:00:00+00:00"
+    assert cadastro["Ana"].dias_trabalhados == ["2025-01-02", "2025-01-03"]
+
+
+def test_fallback_percorre_varias_paginas(banco, repositorio, sem_rpc, monkeypatch):
+    from benchmarks.dados import gerar_linhas
+    linhas = gerar_linhas(100, garcons=12)
+    banco.carregar("funcionarios", linhas)
+    monkeypatch.setattr(settings, "SUPABASE_PAGE_SIZE", 7)
+    paginas = []
+    tabela = repositorio.client.table
+    monkeypatch.setattr(repositorio.client, "table", lambda nome: paginas.append(nome) or tabela(nome))
+    # Memória constante: a primeira linha é agregada antes de a segunda página ser pedida
+    paginas_na_primeira_linha = []
+    adicionar = AgregadorHistorico.adicionar
+    monkeypatch.setattr(AgregadorHistorico, "adicionar",
+                        lambda self, item: paginas_na_primeira_linha.append(len(paginas)) or adicionar(self, item))
+
+    total = repositorio.get_total_funcionarios()
+    paginas_do_total = paginas_na_primeira_linha[0]
+    ranking = repositorio.listar_ranking_pagamentos()
+
+    assert len(paginas) == 2 * 15
+    assert paginas_do_total == 1
+    centavos = [round(l["valor_10_percent"] * 100) for l in linhas]
+    assert total.total_registros == 100
+    assert total.total_cadastrados == 12
+    assert total.total_geral_pago == pytest.approx(sum(centavos) / 100)
+    assert total.total_pago == pytest.approx(sum(c for c, l in zip(centavos, linhas) if l["pago"]) / 100)
+    por_nome = {}
+    for c, l in zip(centavos, linhas):
+        por_nome[l["nome"]] = por_nome.get(l["nome"], 0) + c
+    esperado = sorted(por_nome.items(), key=lambda item: (-item[1], item[0]))
+    assert [(r.nome, r.total_recebido) for r in ranking] == [(nome, pytest.approx(c / 100)) for nome, c in esperado]
+    assert sum(r.dias_trabalhados for r in ranking) == 100
@@ -0,0 +1,74 @@
+import pytest
+from data.models.funcionario import Funcionario, HistoricoPresenca
+from data.models.frame import FuncionarioFrame
+from data.models.horarios import duracao_turno, formatar_duracao, formatar_minutos, para_minutos
+
+
+@pytest.mark.parametrize("texto, minutos", [
+    ("08:00", 480),
+    ("08:30:00", 510),
+    (" 7:05 ", 425),
+    ("24:00", 0),
+    ("24:00:00", 0),
+    ("23:59", 1439),
+    ("", None),
+    (None, None)
+])
+def test_para_minutos(texto, minutos):
+    assert para_minutos(texto) == minutos
+
+
+@pytest.mark.parametrize("texto", ["8h", "8", "abc", "24:30", "24:00:01", "25:00", "10:60", "-1:00", "08:00:00:00"])
+def test_horario_ilegivel_ou_fora_do_intervalo_e_rejeitado(texto):
+    with pytest.raises(ValueError):
+        para_minutos(texto)
+
+
+def test_duracao_de_turno_que_vira_a_noite():
+    assert duracao_turno(para_minutos("18:30"), para_minutos("00:30")) == 360
+    assert duracao_turno(para_minutos("08:00"), para_minutos("08:00")) == 0
+    assert duracao_turno(None, 480) is None
+
+
+def test_formatacao():
+    assert formatar_minutos(65) == "01:05"
+    assert formatar_minutos(None) == ""
+    assert formatar_duracao(425) == "7h05"
+    assert formatar_duracao(None) == "-"
+
+
+def test_funcionario_guarda_minutos_e_deriva_o_texto():
+    f = Funcionario(hora_entrada="22:00:00", hora_saida="02:30")
+
+    assert (f.minutos_entrada, f.minutos_saida, f.minutos_trabalhados) == (1320, 150, 270)
+    assert (f.hora_entrada, f.hora_saida) == ("22:00", "02:30")
+
+    f.hora_saida = "23:00"
+    assert f.minutos_trabalhados == 60
+    assert f.to_dict()["hora_saida"] == "23:00"
+
+
+def test_horario_invalido_e_rejeitado_ao_ser_atribuido():
+    with pytest.raises(ValueError):
+        Funcionario(hora_entrada="8h")
+
+    f = Funcionario(hora_saida="16:00")
+    with pytest.raises(ValueError):
+        f.hora_saida = "24:30"
+    assert f.hora_saida == "16:00"
+
+
+def test_historico_calcula_os_minutos_uma_vez():
+    assert HistoricoPresenca(hora_entrada="16:00", hora_saida="23:30").minutos_trabalhados == 450
+
+
+def test_frame_guarda_minutos_em_array():
+    frame = FuncionarioFrame.from_dicts([
+        {"nome": "Ana", "hora_entrada": "18:00:00", "hora_saida": "01:00:00"},
+        {"nome": "Bruno", "hora_entrada": None, "hora_saida": "16:00"}
+    ])
+
+    assert frame._minutos_entrada.typecode == "h"
+    assert frame.minutos_trabalhados() == [420, None]
+    assert frame[0].hora_entrada == "18:00"
+    assert frame[1].minutos_entrada is None
@@ -0,0 +1,105 @@
+import json
+import os
+import threading
+import time
+import pytest
+from config.settings import settings
+from data.repositories.log_buffer import BufferLogs
+
+
+@pytest.fixture
+def pendentes(tmp_path):
+    return str(tmp_path / "logs_pendentes.jsonl")
+
+
+def _ler_pendentes(caminho: str) -> list:
+    with open(caminho, encoding="utf-8") as f:
+        return [json.loads(linha) for linha in f]
+
+
+def test_flush_espera_o_lote_que_a_thread_ja_tirou_da_fila(pendentes):
+    enviados = []
+    enviando = threading.Event()
+
+    def enviar(lote):
+        enviando.set()
+        time.sleep(0.2)
+        enviados.extend(lote)
+
+    buffer = BufferLogs(enviar, pendentes, tamanho_lote=10, intervalo=0.01)
+    try:
+        buffer.registrar({"acao": "CRIAR"})
+        assert enviando.wait(1)
+        buffer.registrar({"acao": "ATUALIZAR"})
+
+        buffer.flush()
+
+        assert [r["acao"] for r in enviados] == ["CRIAR", "ATUALIZAR"]
+    finally:
+        buffer.fechar()
+
+
+def test_falha_no_envio_vai_para_o_arquivo_e_e_reenviada(pendentes):
+    enviados = []
+    falhar = [True]
+
+    def enviar(lote):
+        if falhar[0]:
+            raise ConnectionError("offline")
+        enviados.extend(lote)
+
+    buffer = BufferLogs(enviar, pendentes, tamanho_lote=10, intervalo=0.01)
+    try:
+        buffer.registrar({"acao": "CRIAR"})
+        buffer.flush()
+        assert _ler_pendentes(pendentes) == [{"acao": "CRIAR"}]
+
+        falhar[0] = False
+        buffer.registrar({"acao": "DELETAR"})
+        buffer.flush()
+
+        assert sorted(r["acao"] for r in enviados) == ["CRIAR", "DELETAR"]
+        assert not os.path.exists(pendentes)
+    finally:
+        buffer.fechar()
+
+
+def test_fila_cheia_grava_direto_no_arquivo(pendentes):
+    liberar = threading.Event()
+    buffer = BufferLogs(lambda lote: liberar.wait(2), pendentes, tamanho_lote=1, intervalo=0.01, capacidade=1)
+    try:
+        for i in range(5):
+            buffer.registrar({"i": i})
+        assert len(_ler_pendentes(pendentes)) >= 3
+    finally:
+        liberar.set()
+        buffer.fechar()
+
+
+def test_fechar_envia_o_que_restou(pendentes):
+    enviados = []
+    buffer = BufferLogs(enviados.extend, pendentes, tamanho_lote=50, intervalo=5)
+    for i in range(3):
+        buffer.registrar({"i": i})
+
+    buffer.fechar(timeout=0.2)
+
+    assert sorted(r["i"] for r in enviados) == [0, 1, 2]
+
+
+def test_salvar_log_em_lote_deixa_o_created_at_para_o_banco(banco, repositorio, monkeypatch):
+    monkeypatch.setattr(settings, "LOG_BUFFER_ENABLED", True)
+
+    log = repositorio.salvar_log("CRIAR", "funcionarios", "1")
+    repositorio.flush_logs()
+
+    assert log is None
+    linhas = list(banco.tabela("logs").linhas.values())
+    assert len(linhas) == 1 and linhas[0]["created_at"]
+
+
+def test_salvar_log_sem_lote_retorna_o_log_gravado(banco, repositorio):
+    log = repositorio.salvar_log("CRIAR", "funcionarios", "1")
+
+    assert log.id and log.created_at
+    assert str(log.id) in banco.tabela("logs").linhas
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta, timezone
+from data.repositories.log_buffer import CursorLogs
+
+AGORA = datetime(2025, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _log(banco, segundos: float, acao: str = "CRIAR", tabela: str = "funcionarios"):
+    return banco.tabela("logs").inserir({
+        "acao": acao,
+        "tabela": tabela,
+        "created_at": (AGORA + timedelta(seconds=segundos)).isoformat()
+    })
+
+
+def _acoes(logs):
+    return [log.acao for log in logs]
+
+
+def test_primeira_leitura_traz_os_mais_recentes_em_ordem(banco, repositorio):
+    for i in range(5):
+        _log(banco, i, acao=f"A{i}")
+    cursor = CursorLogs(10)
+
+    assert _acoes(repositorio.listar_logs_novos(cursor, limite=3)) == ["A2", "A3", "A4"]
+    assert repositorio.listar_logs_novos(cursor) == []
+
+
+def test_logs_com_o_mesmo_created_at_nao_se_perdem_nem_repetem(banco, repositorio):
+    _log(banco, 0, acao="A")
+    cursor = CursorLogs(10)
+    repositorio.listar_logs_novos(cursor)
+
+    _log(banco, 0, acao="B")
+    _log(banco, 0, acao="C")
+
+    assert sorted(_acoes(repositorio.listar_logs_novos(cursor))) == ["B", "C"]
+    assert repositorio.listar_logs_novos(cursor) == []
+
+
+def test_commit_atrasado_dentro_da_janela_aparece_uma_vez(banco, repositorio):
+    _log(banco, 0, acao="A")
+    _log(banco, 5, acao="B")
+    cursor = CursorLogs(10)
+    repositorio.listar_logs_novos(cursor)
+
+    # Carimbado antes de B pelo servidor, mas só visível depois da última leitura
+    _log(banco, 3, acao="ATRASADO")
+
+    assert _acoes(repositorio.listar_logs_novos(cursor)) == ["ATRASADO"]
+    assert repositorio.listar_logs_novos(cursor) == []
+
+
+def test_filtros_sao_aplicados_na_releitura(banco, repositorio):
+    cursor = CursorLogs(10)
+    _log(banco, 0, acao="CRIAR")
+    repositorio.listar_logs_novos(cursor, acao="CRIAR")
+
+    _log(banco, 1, acao="DELETAR")
+    _log(banco, 2, acao="CRIAR")
+
+    assert _acoes(repositorio.listar_logs_novos(cursor, acao="CRIAR")) == ["CRIAR"]
+
+
+def test_cursor_esquece_ids_fora_da_janela():
+    cursor = CursorLogs(10)
+
+    class Log:
+        def __init__(self, log_id, segundos):
+            self.id = log_id
+            self.created_at = (AGORA + timedelta(seconds=segundos)).isoformat()
+
+    cursor.filtrar_novos([Log("a", 0), Log("b", 5)])
+    cursor.filtrar_novos([Log("c", 30)])
+
+    assert len(cursor) == 1
+    assert cursor.inicio == (AGORA + timedelta(seconds=20)).isoformat()
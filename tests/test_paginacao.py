@@ -0,0 +1,57 @@
+from datetime import date
+from benchmarks.dados import gerar_linhas
+
+
+def _chaves(linhas):
+    return [(linha["dia_trabalho"], linha["id"]) for linha in linhas]
+
+
+def test_iter_funcionarios_percorre_todas_as_linhas_em_ordem(banco, repositorio):
+    linhas = gerar_linhas(250, garcons=30)
+    banco.carregar("funcionarios", linhas)
+
+    ids = [str(f.id) for f in repositorio.iter_funcionarios(page_size=7)]
+
+    esperado = [func_id for _, func_id in sorted(_chaves(linhas))]
+    assert ids == esperado
+
+
+def test_pagina_que_termina_no_meio_de_um_dia_nao_perde_nem_repete(banco, repositorio):
+    # 40 turnos no mesmo dia e página de 6: todas as fronteiras de página caem dentro do dia
+    linhas = [dict(linha, dia_trabalho="2025-03-10") for linha in gerar_linhas(40, garcons=40)]
+    banco.carregar("funcionarios", linhas)
+
+    ids = [str(f.id) for f in repositorio.iter_funcionarios(page_size=6)]
+
+    assert len(ids) == len(set(ids)) == 40
+    assert ids == sorted(ids)
+
+
+def test_ultima_pagina_cheia_encerra_com_pagina_vazia(banco, repositorio):
+    banco.carregar("funcionarios", gerar_linhas(30, garcons=10))
+
+    ids = [str(f.id) for f in repositorio.iter_funcionarios(page_size=10)]
+
+    assert len(ids) == len(set(ids)) == 30
+
+
+def test_ordem_decrescente(banco, repositorio):
+    linhas = gerar_linhas(60, garcons=9)
+    banco.carregar("funcionarios", linhas)
+
+    ids = [str(f.id) for f in repositorio.iter_funcionarios(page_size=8, desc=True)]
+
+    esperado = [func_id for _, func_id in sorted(_chaves(linhas), reverse=True)]
+    assert ids == esperado
+
+
+def test_intervalo_de_datas(banco, repositorio):
+    linhas = gerar_linhas(90, garcons=9)
+    banco.carregar("funcionarios", linhas)
+    inicio, fim = date(2025, 1, 3), date(2025, 1, 5)
+
+    dias = [f.dia_trabalho for f in repositorio.iter_funcionarios(page_size=4, since=inicio, until=fim)]
+
+    esperado = [l for l in linhas if inicio.isoformat() <= l["dia_trabalho"] <= fim.isoformat()]
+    assert len(dias) == len(esperado)
+    assert all(inicio <= dia <= fim for dia in dias)
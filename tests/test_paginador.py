@@ -0,0 +1,38 @@
+from benchmarks.dados import gerar_linhas
+from data.repositories import paginador as modulo
+from data.repositories.paginador import COLUNAS_TABELAS, PaginadorTabela, filtro_coluna
+
+
+def test_ilike_so_em_colunas_de_texto():
+    assert filtro_coluna("funcionarios", "nome", " ana ") == {"nome": ("ilike", "%ana%")}
+    assert filtro_coluna("funcionarios", "nome", "Ana", contem=False) == {"nome": "Ana"}
+    assert filtro_coluna("funcionarios", "pago", "true") == {"pago": "true"}
+    assert filtro_coluna("funcionarios", "valor_10_percent", "50") == {"valor_10_percent": "50"}
+    assert filtro_coluna("logs", "dados_novos", "x") == {"dados_novos": "x"}
+    assert filtro_coluna("funcionarios", "nome", "  ") == {}
+
+
+def test_filtro_de_texto_no_servidor(banco, repositorio):
+    linhas = gerar_linhas(40, garcons=8)
+    banco.carregar("funcionarios", linhas)
+    paginador = PaginadorTabela(repositorio, "funcionarios", COLUNAS_TABELAS["funcionarios"], tamanho_pagina=5)
+    trecho = linhas[0]["nome"].split()[1].lower()
+
+    paginador.filtro_texto("nome", trecho)
+    paginador.pagina()
+
+    assert paginador.total == sum(1 for l in linhas if trecho in l["nome"].lower())
+    paginador.fechar()
+
+
+def test_paginadores_compartilham_o_executor_e_fechar_nao_o_encerra(banco, repositorio):
+    banco.carregar("funcionarios", gerar_linhas(30, garcons=6))
+    primeiro = PaginadorTabela(repositorio, "funcionarios", COLUNAS_TABELAS["funcionarios"], tamanho_pagina=5)
+    primeiro.pagina()
+    primeiro.fechar()
+
+    segundo = PaginadorTabela(repositorio, "funcionarios", COLUNAS_TABELAS["funcionarios"], tamanho_pagina=5)
+    assert len(segundo.pagina()) == 5
+    assert len(segundo.proxima()) == 5
+    assert not modulo._executor._shutdown
+    segundo.fechar()
@@ -0,0 +1,80 @@
+import io
+import json
+from collections import defaultdict
+from datetime import date
+import openpyxl
+import pytest
+from data.models.dinheiro import para_centavos
+from data.models.horarios import duracao_turno, para_minutos
+from services.period_report_generator import PeriodReportGenerator, periodo_mes, periodo_semana
+from benchmarks.dados import gerar_linhas
+
+
+@pytest.fixture
+def linhas(banco):
+    linhas = gerar_linhas(120, garcons=12)
+    banco.carregar("funcionarios", linhas)
+    return linhas
+
+
+def _esperado(linhas, inicio: date, fim: date) -> dict:
+    por_nome = defaultdict(lambda: [0, 0, 0, 0])
+    for linha in linhas:
+        if inicio.isoformat() <= linha["dia_trabalho"] <= fim.isoformat():
+            sub = por_nome[linha["nome"]]
+            sub[0] += 1
+            sub[1] += para_centavos(linha["valor_10_percent"])
+            sub[2] += para_centavos(linha["vale"])
+            sub[3] += duracao_turno(para_minutos(linha["hora_entrada"]), para_minutos(linha["hora_saida"]))
+    return por_nome
+
+
+def test_periodos():
+    assert periodo_semana(date(2025, 1, 8)) == (date(2025, 1, 6), date(2025, 1, 12))
+    assert periodo_mes(date(2024, 2, 10)) == (date(2024, 2, 1), date(2024, 2, 29))
+
+
+def test_fim_antes_do_inicio(repositorio):
+    with pytest.raises(ValueError):
+        PeriodReportGenerator(repositorio, date(2025, 1, 2), date(2025, 1, 1))
+
+
+def test_subtotais_por_funcionario_dia_e_periodo(repositorio, linhas):
+    relatorio = PeriodReportGenerator.semana(repositorio, date(2025, 1, 8), page_size=7)
+
+    acumulador = relatorio.resumir()
+
+    esperado = _esperado(linhas, relatorio.inicio, relatorio.fim)
+    assert esperado
+    obtido = {nome: [s.registros, s.centavos, s.vales, s.minutos] for nome, s in acumulador.por_funcionario.items()}
+    assert obtido == esperado
+    assert acumulador.total.registros == sum(sub[0] for sub in esperado.values())
+    assert acumulador.total.centavos == sum(sub[1] for sub in esperado.values())
+    assert sum(s.centavos for s in acumulador.por_dia.values()) == acumulador.total.centavos
+    assert all(relatorio.inicio <= dia <= relatorio.fim for dia in acumulador.por_dia)
+
+
+def test_jsonl_fecha_cada_dia_e_o_periodo(repositorio, linhas):
+    relatorio = PeriodReportGenerator(repositorio, date(2025, 1, 1), date(2025, 1, 10), page_size=9)
+
+    registros = [json.loads(linha) for linha in relatorio.generate_jsonl().decode("utf-8").splitlines()]
+
+    dias = [r for r in registros if r["tipo"] == "dia"]
+    periodo = registros[-1]
+    assert periodo["tipo"] == "periodo"
+    assert periodo["registros"] == sum(1 for r in registros if r["tipo"] == "registro")
+    assert sum(d["registros"] for d in dias) == periodo["registros"]
+    assert [d["data"] for d in dias] == sorted({r["data"] for r in registros if r["tipo"] == "registro"})
+
+
+def test_excel_tem_uma_aba_por_semana_e_o_resumo(repositorio, linhas):
+    relatorio = PeriodReportGenerator.mes(repositorio, date(2025, 1, 15), page_size=25)
+
+    wb = openpyxl.load_workbook(io.BytesIO(relatorio.generate_excel()))
+
+    semanas = {date.fromisoformat(l["dia_trabalho"]).isocalendar()[:2] for l in linhas if l["dia_trabalho"].startswith("2025-01")}
+    assert len(wb.sheetnames) == len(semanas) + 2
+    resumo = wb["Resumo do Período"]
+    total = [linha for linha in resumo.iter_rows(values_only=True) if linha[0] == "Total do período"][0]
+    assert round(total[1] * 100) == relatorio.acumulador.total.centavos
+    assert total[2] == relatorio.acumulador.total.registros
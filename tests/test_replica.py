@@ -0,0 +1,42 @@
+import pytest
+from config.settings import settings
+from data.repositories.supabase_repository import SupabaseRepository
+
+
+def _linha(nome: str, atualizado: str) -> dict:
+    return {"nome": nome, "dia_trabalho": "2025-02-01", "hora_entrada": "08:00", "hora_saida": "16:00",
+            "valor_10_percent": 50.0, "pago": False, "created_at": atualizado, "updated_at": atualizado}
+
+
+@pytest.fixture
+def repositorio_com_replica(banco, monkeypatch):
+    monkeypatch.setattr(settings, "LOCAL_REPLICA_ENABLED", True)
+    monkeypatch.setattr(settings, "LOCAL_REPLICA_PATH", ":memory:")
+    monkeypatch.setattr(settings, "LOCAL_REPLICA_OVERLAP_SECONDS", 30)
+    repo = SupabaseRepository()
+    yield repo
+    repo.fechar()
+
+
+def test_linha_que_comita_atrasada_entra_na_proxima_sincronizacao(banco, repositorio_com_replica):
+    repo = repositorio_com_replica
+    banco.tabela("funcionarios").inserir(_linha("Ana", "2025-02-01T12:00:10+00:00"))
+    repo.sincronizar_replica(forcar=True)
+    assert repo._replica.watermark == "2025-02-01T12:00:10+00:00"
+
+    # updated_at carimbado antes do watermark, mas a transação só comitou depois da leitura
+    banco.tabela("funcionarios").inserir(_linha("Bruno", "2025-02-01T12:00:05+00:00"))
+    repo.sincronizar_replica(forcar=True)
+
+    assert sorted(f.nome for f in repo._replica.listar()) == ["Ana", "Bruno"]
+    assert repo._replica.watermark == "2025-02-01T12:00:10+00:00"
+
+
+def test_releitura_fica_limitada_a_janela_e_nao_duplica_linhas(banco, repositorio_com_replica):
+    repo = repositorio_com_replica
+    banco.tabela("funcionarios").inserir(_linha("Ana", "2025-02-01T12:00:00+00:00"))
+    repo.sincronizar_replica(forcar=True)
+    banco.tabela("funcionarios").inserir(_linha("Carla", "2025-02-01T11:00:00+00:00"))
+
+    assert repo.sincronizar_replica(forcar=True) == 1
+    assert repo._replica.contar() == 1
@@ -0,0 +1,79 @@
+import os
+import stat
+import time
+from services.report_cache import ReportCache, chave_relatorio
+
+
+def test_chave_depende_so_do_conteudo():
+    assert chave_relatorio("csv", 2, ("Ana", 10.0)) == chave_relatorio("csv", 2, ("Ana", 10.0))
+    assert chave_relatorio("csv", 2, ("Ana", 10.0)) != chave_relatorio("csv", 2, ("Ana", 10.5))
+
+
+def test_memoria_remove_o_menos_usado_quando_passa_do_limite():
+    cache = ReportCache(max_memoria_bytes=30)
+    cache.set("a", b"x" * 10)
+    cache.set("b", b"y" * 10)
+    cache.set("c", b"z" * 10)
+    cache.get("a")
+
+    cache.set("d", b"w" * 10)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"x" * 10
+    assert cache.estatisticas()["bytes_memoria"] == 30
+    assert cache.estatisticas()["removidos_memoria"] == 1
+
+
+def test_conteudo_maior_que_a_memoria_nao_entra():
+    cache = ReportCache(max_memoria_bytes=5)
+    cache.set("grande", b"x" * 6)
+    assert cache.get("grande") is None
+
+
+def test_obter_ou_gerar_so_gera_uma_vez():
+    cache = ReportCache(max_memoria_bytes=100)
+    chamadas = []
+
+    def gerar():
+        chamadas.append(1)
+        return b"relatorio"
+
+    assert cache.obter_ou_gerar("k", gerar) == cache.obter_ou_gerar("k", gerar) == b"relatorio"
+    assert len(chamadas) == 1
+
+
+def test_disco_desligado_por_padrao(tmp_path):
+    cache = ReportCache(max_memoria_bytes=100, diretorio=str(tmp_path / "cache"))
+    cache.set("k", b"relatorio")
+    assert not cache.disco_ativo
+    assert not os.path.exists(tmp_path / "cache")
+
+
+def test_disco_privado_e_limitado_por_tamanho(tmp_path):
+    diretorio = tmp_path / "cache"
+    cache = ReportCache(max_memoria_bytes=100, diretorio=str(diretorio), max_disco_bytes=250)
+    for i in range(4):
+        cache.set(f"k{i}", bytes([i]) * 80)
+        os.utime(diretorio / f"k{i}.bin", (time.time() - 100 + i, time.time()))
+
+    assert stat.S_IMODE(os.stat(diretorio).st_mode) == 0o700
+    assert stat.S_IMODE(os.stat(diretorio / "k3.bin").st_mode) == 0o600
+    assert sorted(os.listdir(diretorio)) == ["k1.bin", "k2.bin", "k3.bin"]
+
+    cache.limpar()
+    assert os.listdir(diretorio) == []
+
+
+def test_disco_respeita_a_validade(tmp_path):
+    diretorio = tmp_path / "cache"
+    cache = ReportCache(max_memoria_bytes=100, diretorio=str(diretorio), max_disco_bytes=1000, ttl_disco=60)
+    cache.set("velho", b"1")
+    cache.set("novo", b"2")
+    antigo = time.time() - 120
+    os.utime(diretorio / "velho.bin", (antigo, antigo))
+
+    outro_processo = ReportCache(max_memoria_bytes=100, diretorio=str(diretorio), max_disco_bytes=1000, ttl_disco=60)
+
+    assert outro_processo.get("velho") is None
+    assert outro_processo.get("novo") == b"2"
+    assert sorted(os.listdir(diretorio)) == ["novo.bin"]
@@ -0,0 +1,84 @@
+import time
+from datetime import date
+import pytest
+from config.settings import settings
+from services import report_generator
+from services.report_generator import RelatorioTimeoutError, ReportGenerator
+from benchmarks.dados import gerar_funcionarios
+
+FORMATOS = ["csv", "json", "xml", "html"]
+
+
+@pytest.fixture
+def sem_cache(monkeypatch):
+    monkeypatch.setattr(settings, "REPORT_CACHE_ENABLED", False)
+
+
+def _gerar_json_travado(dados, formato):
+    # Roda no worker (spawn importa este módulo de novo): o JSON trava e os demais formatos saem normalmente
+    if formato == "json":
+        time.sleep(60)
+    return report_generator._gerar_formato(dados, formato)
+
+
+@pytest.fixture
+def json_travado(monkeypatch, sem_cache):
+    report_generator._encerrar_pool(matar=True)
+    monkeypatch.setattr(settings, "REPORT_WORKERS", 3)
+    monkeypatch.setattr(report_generator, "_gerar_formato", _gerar_json_travado)
+    yield
+    report_generator._encerrar_pool(matar=True)
+
+
+def test_paralelo_gera_os_mesmos_bytes_que_em_serie(sem_cache):
+    report = ReportGenerator(gerar_funcionarios(50), date(2025, 1, 6))
+
+    serie = report.generate_all(FORMATOS, paralelo=False)
+    paralelo = report.generate_all(FORMATOS, paralelo=True, timeout=60)
+
+    assert paralelo == serie
+
+
+def test_pool_morto_e_recriado_na_proxima_geracao(sem_cache):
+    report = ReportGenerator(gerar_funcionarios(20), date(2025, 1, 6))
+    report.generate_all(["csv", "json"], paralelo=True, timeout=60)
+
+    report_generator._encerrar_pool(matar=True)
+
+    assert report_generator._pool is None
+    assert set(report.generate_all(["csv", "json"], paralelo=True, timeout=60)) == {"csv", "json"}
+
+
+
+def test_formato_que_estoura_o_tempo_e_informado_e_os_demais_sao_mantidos(json_travado):
+    report = ReportGenerator(gerar_funcionarios(20), date(2025, 1, 6))
+    inicio = time.monotonic()
+
+    with pytest.raises(RelatorioTimeoutError) as erro:
+        report.generate_all(["csv", "json", "xml"], paralelo=True, timeout=2)
+
+    assert time.monotonic() - inicio < 20
+    assert erro.value.formatos == ["json"]
+    assert erro.value.arquivos == report.generate_all(["csv", "xml"], paralelo=False)
+    assert report_generator._pool is None
+
+
+def test_arquivos_guardam_os_formatos_gerados_antes_do_estouro(json_travado):
+    arquivos = ReportGenerator(gerar_funcionarios(20), date(2025, 1, 6)).arquivos(["csv", "json"])
+
+    with pytest.raises(RelatorioTimeoutError):
+        arquivos.carregar(paralelo=True, timeout=2)
+
+    assert list(arquivos) == ["csv", "json"]
+    assert set(arquivos._gerados) == {"csv"}
+
+
+def test_fila_parada_atras_de_worker_travado_tambem_falha(json_travado, monkeypatch):
+    monkeypatch.setattr(settings, "REPORT_WORKERS", 1)
+    report = ReportGenerator(gerar_funcionarios(20), date(2025, 1, 6))
+
+    with pytest.raises(RelatorioTimeoutError) as erro:
+        report.generate_all(["json", "csv"], paralelo=True, timeout=1)
+
+    assert erro.value.formatos == ["json", "csv"]
+    assert erro.value.arquivos == {}
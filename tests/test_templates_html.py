@@ -0,0 +1,48 @@
+from datetime import date
+import pytest
+from data.models.funcionario import Funcionario
+from services.report_generator import ReportGenerator
+from services.templates_html import Template, escapar
+
+
+def test_campos_na_ordem_da_primeira_ocorrencia():
+    assert Template("{{b}} {{ a }} {{!b}}").campos == ("b", "a")
+
+
+def test_campo_normal_e_escapado_e_cru_nao():
+    t = Template("<td>{{nome}}</td><td>{{!html}}</td>")
+    assert t.renderizar(nome="<b>Ana & Cia</b>", html="<i>ok</i>") == "<td>&lt;b&gt;Ana &amp; Cia&lt;/b&gt;</td><td><i>ok</i></td>"
+
+
+def test_aspas_sao_escapadas():
+    assert Template('<a title="{{t}}">').renderizar(t='"x\'') == '<a title="&quot;x&#x27;">'
+
+
+@pytest.mark.parametrize("valor, texto", [(True, "True"), (1, "1"), (1.0, "1.0"), (None, ""), ([1, "<"], "[1, &#x27;&lt;&#x27;]")])
+def test_valores_de_tipos_diferentes_nao_se_confundem(valor, texto):
+    t = Template("{{v}}")
+    t.renderizar(v=1)
+    assert t.renderizar(v=valor) == texto
+
+
+def test_renderizar_linhas_usa_tuplas_na_ordem_dos_campos():
+    t = Template("<tr><td>{{nome}}</td><td>{{!valor}}</td></tr>")
+    assert t.renderizar_linhas([("A&B", "1.00"), ("C", "2.00")]) == "<tr><td>A&amp;B</td><td>1.00</td></tr><tr><td>C</td><td>2.00</td></tr>"
+
+
+def test_campo_faltando_levanta_erro():
+    with pytest.raises(KeyError):
+        Template("{{a}}").renderizar()
+
+
+def test_escapar():
+    assert escapar(None) == ""
+    assert escapar("<") == "&lt;"
+
+
+def test_relatorio_html_escapa_o_nome():
+    report = ReportGenerator([Funcionario(nome="<script>", valor_10_percent=10.0, observacao="a&b")], date(2025, 1, 6))
+    html = report.generate_html()
+    html = html.decode("utf-8") if isinstance(html, bytes) else html
+    assert "<script>" not in html
+    assert "&lt;script&gt;" in html and "a&amp;b" in html
@@ -0,0 +1,35 @@
+from datetime import date
+from data.models.funcionario import Funcionario
+
+DIA = date(2025, 2, 3)
+
+
+def test_upsert_atualiza_o_turno_existente_em_vez_de_duplicar(banco, repositorio):
+    repositorio.upsert_funcionarios([Funcionario(nome="Ana", valor_10_percent=100.0, dia_trabalho=DIA)])
+
+    repositorio.upsert_funcionarios([Funcionario(nome="Ana", valor_10_percent=150.5, hora_saida="18:00", dia_trabalho=DIA)])
+
+    linhas = list(banco.tabela("funcionarios").linhas.values())
+    assert len(linhas) == 1
+    assert linhas[0]["valor_10_percent"] == 150.5
+    assert linhas[0]["hora_saida"] == "18:00"
+
+
+def test_upsert_deduplica_o_lote_mantendo_o_ultimo(banco, repositorio):
+    salvos = repositorio.upsert_funcionarios([
+        Funcionario(nome="Ana", valor_10_percent=10.0, dia_trabalho=DIA),
+        Funcionario(nome="Bruno", valor_10_percent=20.0, dia_trabalho=DIA),
+        Funcionario(nome="Ana", valor_10_percent=30.0, dia_trabalho=DIA)
+    ])
+
+    assert sorted((f.nome, f.valor_10_percent) for f in salvos) == [("Ana", 30.0), ("Bruno", 20.0)]
+    assert len(banco.tabela("funcionarios").linhas) == 2
+
+
+def test_upsert_separa_o_mesmo_nome_em_dias_diferentes(banco, repositorio):
+    repositorio.upsert_funcionarios([
+        Funcionario(nome="Ana", dia_trabalho=DIA),
+        Funcionario(nome="Ana", dia_trabalho=date(2025, 2, 4))
+    ])
+
+    assert len(banco.tabela("funcionarios").linhas) == 2
@@ -2,14 +2,22 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from datetime import date, datetime
 from typing import List
+import multiprocessing
 import os
 import sys
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from data.models.funcionario import Funcionario, ObservacaoGeral
+from data.models.dinheiro import ResumoValores, de_centavos
+from data.models.horarios import formatar_duracao
 from data.repositories.supabase_repository import SupabaseRepository
-from services.report_generator import ReportGenerator
+from data.repositories.async_supabase_repository import AsyncSupabaseRepository
+from data.repositories.instrumentacao import instrumentacao
+from data.repositories.log_buffer import CursorLogs
+from data.repositories.paginador import COLUNAS_TABELAS, PaginadorTabela
+from services.report_generator import FORMATOS_RELATORIO, ReportGenerator
+from services.period_report_generator import FORMATOS_PERIODO, PeriodReportGenerator, periodo_mes, periodo_semana
 from services.email_service import EmailService
 from config.settings import settings
 
@@ -23,7 +31,11 @@ class AppTkinter:
         self.root.configure(bg="#1e1e2f")
         
         self.repository = SupabaseRepository()
+        self.repository_async = AsyncSupabaseRepository(self.repository)
         self.funcionarios: List[Funcionario] = []
+        self.dia_carregado = None
+        self.cursor_logs = None
+        self.job_tail_logs = None
         
         self.setup_styles()
         self.create_widgets()
@@ -109,6 +121,7 @@ class AppTkinter:
         self.tab_codigo, self.tab_frames['codigo'] = self._create_scrollable_tab()
         self.tab_docs, self.tab_frames['docs'] = self._create_scrollable_tab()
         self.tab_config, self.tab_frames['config'] = self._create_scrollable_tab()
+        self.tab_diagnostico, self.tab_frames['diagnostico'] = self._create_scrollable_tab()
         
         self.notebook.add(self.tab_cadastro, text="  👥  Cadastrar Funcionários  ")
         self.notebook.add(self.tab_registrar, text="  📝  Registrar Dia de Trabalho  ")
@@ -119,6 +132,7 @@ class AppTkinter:
         self.notebook.add(self.tab_codigo, text="  💻  Código Fonte  ")
         self.notebook.add(self.tab_docs, text="  📚  Documentação  ")
         self.notebook.add(self.tab_config, text="  ⚙️  Configurações  ")
+        self.notebook.add(self.tab_diagnostico, text="  🩺  Diagnóstico  ")
         
         self.create_tab_cadastro()
         self.create_tab_registrar()
@@ -129,6 +143,7 @@ class AppTkinter:
         self.create_tab_codigo()
         self.create_tab_docs()
         self.create_tab_config()
+        self.create_tab_diagnostico()
 
     def _create_scrollable_tab(self):
         container = ttk.Frame(self.notebook, style='Content.TFrame')
@@ -484,16 +499,117 @@ class AppTkinter:
         format_frame.pack(fill=tk.X, pady=10)
         
         self._create_label(format_frame, "Gerar Relatório em:", fg='#a0a0a0').grid(row=0, column=0, sticky=tk.W, pady=10)
-        self.formato_var = tk.StringVar(value="Excel")
-        formatos = ["Excel", "DOCX", "CSV", "JSON", "XML", "HTML"]
+        self.formato_var = tk.StringVar(value="excel")
+        formatos = list(FORMATOS_RELATORIO.values())
         
         for i, fmt in enumerate(formatos):
-            rb = tk.Radiobutton(format_frame, text=fmt, variable=self.formato_var, value=fmt,
+            rb = tk.Radiobutton(format_frame, text=fmt.rotulo, variable=self.formato_var, value=fmt.nome,
                                bg='#323244', fg='#ffffff', selectcolor='#00d4ff', font=('Segoe UI', 10))
             rb.grid(row=0, column=i+1, padx=15, pady=10)
         
         self._create_button(format_frame, "📄 Gerar Relatório", self.gerar_relatorio, 
                            bg='#9b59b6', padx=25).grid(row=0, column=len(formatos)+1, padx=15, pady=10)
+        
+        periodo_card = ttk.LabelFrame(frame, text="Relatório de Período", style='Card.TLabelframe', padding=25)
+        periodo_card.pack(fill=tk.X, padx=30, pady=(0, 30))
+        
+        periodo_frame = tk.Frame(periodo_card, bg='#323244')
+        periodo_frame.pack(fill=tk.X, pady=5)
+        
+        self.periodo_var = tk.StringVar(value="Semana")
+        for i, tipo in enumerate(["Semana", "Mês", "Personalizado"]):
+            tk.Radiobutton(periodo_frame, text=tipo, variable=self.periodo_var, value=tipo, command=self.atualizar_periodo,
+                           bg='#323244', fg='#ffffff', selectcolor='#00d4ff', font=('Segoe UI', 10)).grid(row=0, column=i, padx=10, pady=10)
+        
+        self._create_label(periodo_frame, "Início:", fg='#a0a0a0').grid(row=0, column=3, sticky=tk.W, padx=(20, 5))
+        self.entry_periodo_inicio = self._create_entry(periodo_frame, width=12)
+        self.entry_periodo_inicio.grid(row=0, column=4, padx=5)
+        self._create_label(periodo_frame, "Fim:", fg='#a0a0a0').grid(row=0, column=5, sticky=tk.W, padx=(15, 5))
+        self.entry_periodo_fim = self._create_entry(periodo_frame, width=12)
+        self.entry_periodo_fim.grid(row=0, column=6, padx=5)
+        
+        self.formato_periodo_var = tk.StringVar(value="Excel")
+        for i, fmt in enumerate(["Excel", "CSV", "JSON Lines"]):
+            tk.Radiobutton(periodo_frame, text=fmt, variable=self.formato_periodo_var, value=fmt,
+                           bg='#323244', fg='#ffffff', selectcolor='#00d4ff', font=('Segoe UI', 10)).grid(row=1, column=i, padx=10, pady=10)
+        
+        self._create_button(periodo_frame, "📆 Exportar Período", self.exportar_periodo, 
+                           bg='#9b59b6', padx=25).grid(row=1, column=3, columnspan=2, padx=15, pady=10)
+        self.lbl_periodo = self._create_label(periodo_frame, "", fg='#a0a0a0')
+        self.lbl_periodo.grid(row=1, column=5, columnspan=2, sticky=tk.W, padx=10)
+        self.atualizar_periodo()
+
+    def create_tab_diagnostico(self):
+        frame = self.tab_frames['diagnostico']
+        
+        title_frame = tk.Frame(frame, bg='#27293d')
+        title_frame.pack(fill=tk.X, padx=30, pady=(30, 20))
+        
+        self._create_label(title_frame, "🩺 Diagnóstico do Repositório", 
+                         font=('Segoe UI', 20, 'bold'), fg='#00d4ff').pack(side=tk.LEFT)
+        
+        self._create_button(title_frame, "🔄 Atualizar", self.atualizar_diagnostico, 
+                          bg='#3498db', fg='#ffffff', padx=20).pack(side=tk.RIGHT, padx=5)
+        self._create_button(title_frame, "🧹 Zerar", self.zerar_diagnostico, 
+                          bg='#e74c3c', fg='#ffffff', padx=20).pack(side=tk.RIGHT, padx=5)
+        self._create_button(title_frame, "📄 Exportar JSON", lambda: self.exportar_diagnostico("json"), 
+                          bg='#9b59b6', fg='#ffffff', padx=20).pack(side=tk.RIGHT, padx=5)
+        self._create_button(title_frame, "📈 Exportar Prometheus", lambda: self.exportar_diagnostico("prom"), 
+                          bg='#9b59b6', fg='#ffffff', padx=20).pack(side=tk.RIGHT, padx=5)
+        
+        table_card = tk.Frame(frame, bg='#323244', padx=20, pady=15)
+        table_card.pack(fill=tk.BOTH, expand=True, padx=30, pady=10)
+        
+        cols = ('Método', 'Chamadas', 'Erros', 'p50', 'p90', 'p99', 'Linhas', 'Recebido', 'Consultas', 'Backend')
+        widths = [300, 80, 60, 90, 90, 90, 90, 100, 80, 80]
+        self.tree_diagnostico = ttk.Treeview(table_card, columns=cols, show='headings', height=18)
+        for col, width in zip(cols, widths):
+            self.tree_diagnostico.heading(col, text=col)
+            self.tree_diagnostico.column(col, width=width, anchor=tk.W if col == 'Método' else tk.E)
+        
+        scrollbar = ttk.Scrollbar(table_card, orient=tk.VERTICAL, command=self.tree_diagnostico.yview)
+        self.tree_diagnostico.configure(yscrollcommand=scrollbar.set)
+        self.tree_diagnostico.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        self.lbl_diagnostico = self._create_label(frame, "Backend = parcela do tempo gasta esperando o Supabase; o restante é decodificação e agregação em Python.", 
+                                                  font=('Segoe UI', 10), fg='#a0a0a0')
+        self.lbl_diagnostico.pack(anchor=tk.W, padx=30, pady=(0, 20))
+
+    def atualizar_diagnostico(self):
+        for item in self.tree_diagnostico.get_children():
+            self.tree_diagnostico.delete(item)
+        
+        for m in instrumentacao.snapshot():
+            backend = m["tempo_consultas"] / m["tempo_total"] if m["tempo_total"] else 0
+            self.tree_diagnostico.insert('', tk.END, values=(
+                m["metodo"].split(".")[-1],
+                m["chamadas"],
+                m["erros"],
+                f"{m['p50'] * 1000:.1f} ms",
+                f"{m['p90'] * 1000:.1f} ms",
+                f"{m['p99'] * 1000:.1f} ms",
+                m["linhas"],
+                f"{m['bytes'] / 1024:.1f} KB",
+                m["consultas"],
+                f"{min(backend, 1):.0%}"
+            ))
+
+    def zerar_diagnostico(self):
+        instrumentacao.limpar()
+        self.atualizar_diagnostico()
+
+    def exportar_diagnostico(self, formato):
+        ext = "json" if formato == "json" else "prom"
+        filename = filedialog.asksaveasfilename(defaultextension=f".{ext}", initialfile=f"metricas_repositorio.{ext}")
+        if not filename:
+            return
+        try:
+            with open(filename, 'w', encoding='utf-8') as f:
+                f.write(instrumentacao.exportar_json() if formato == "json" else instrumentacao.exportar_prometheus())
+            messagebox.showinfo("Sucesso", f"Métricas exportadas para {os.path.basename(filename)}")
+        except Exception as e:
+            messagebox.showerror("Erro", str(e))
 
     def create_tab_config(self):
         frame = self.tab_frames['config']
@@ -557,12 +673,16 @@ class AppTkinter:
         self._create_label(title_frame, "Gerenciamento do Banco de Dados Supabase", 
                          font=('Segoe UI', 20, 'bold'), fg='#00d4ff').pack(side=tk.LEFT)
         
+        self._create_button(title_frame, "🔄 Contagens", lambda: self.atualizar_contagens_tabelas(forcar=True),
+                          bg='#3498db', fg='#ffffff', padx=15).pack(side=tk.RIGHT)
+        
         info_card = tk.Frame(frame, bg='#323244', padx=20, pady=15)
         info_card.pack(fill=tk.X, padx=30, pady=10)
         
         self._create_label(info_card, "📊 Tabelas do Banco de Dados", 
                          font=('Segoe UI', 14, 'bold'), fg='#00d4ff', bg='#323244').pack(anchor=tk.W, pady=(0, 10))
         
+        self.labels_contagem = {}
         tables = [
             ("funcionarios", "Funcionários - Registros de salários e dados dos garçons"),
             ("configuracoes", "Configurações - Configurações de e-mail do sistema"),
@@ -575,8 +695,13 @@ class AppTkinter:
             table_frame = tk.Frame(info_card, bg='#2c2c3e', padx=15, pady=10)
             table_frame.pack(fill=tk.X, pady=5)
             
-            self._create_label(table_frame, f"📋 {table_name}", 
-                             font=('Segoe UI', 12, 'bold'), fg='#ffffff', bg='#2c2c3e').pack(anchor=tk.W)
+            header_frame = tk.Frame(table_frame, bg='#2c2c3e')
+            header_frame.pack(fill=tk.X)
+            self._create_label(header_frame, f"📋 {table_name}", 
+                             font=('Segoe UI', 12, 'bold'), fg='#ffffff', bg='#2c2c3e').pack(side=tk.LEFT)
+            self.labels_contagem[table_name] = self._create_label(header_frame, "…", 
+                             font=('Segoe UI', 11, 'bold'), fg='#00d4ff', bg='#2c2c3e')
+            self.labels_contagem[table_name].pack(side=tk.RIGHT)
             self._create_label(table_frame, description, 
                              font=('Segoe UI', 9), fg='#a0a0a0', bg='#2c2c3e').pack(anchor=tk.W)
             
@@ -610,6 +735,14 @@ class AppTkinter:
         
         self._create_label(db_info_card, "Status: 🟢 Conectado", 
                          font=('Segoe UI', 10), fg='#27ae60', bg='#323244').pack(anchor=tk.W)
+        
+        self.root.after(0, self.atualizar_contagens_tabelas)
+
+    def atualizar_contagens_tabelas(self, forcar=False):
+        contagens = self.repository.estatisticas_tabelas(tuple(self.labels_contagem), forcar=forcar)
+        for tabela, label in self.labels_contagem.items():
+            total = contagens.get(tabela)
+            label.config(text=f"{total} registros" if total is not None else "erro")
 
     def create_tab_logs(self):
         frame = self.tab_frames['logs']
@@ -646,6 +779,10 @@ class AppTkinter:
         self._create_button(filtros_card, "🗑️ Limpar Logs", self.limpar_logs, 
                           bg='#e74c3c', fg='#ffffff', padx=20).pack(side=tk.LEFT, padx=10)
         
+        self.tail_logs_var = tk.BooleanVar()
+        tk.Checkbutton(filtros_card, text="⏱️ Tempo Real", variable=self.tail_logs_var, command=self.alternar_tail_logs,
+                       bg='#323244', fg='#ffffff', selectcolor='#27ae60', font=('Segoe UI', 11, 'bold')).pack(side=tk.LEFT, padx=10)
+        
         table_card = tk.Frame(frame, bg='#323244', padx=20, pady=15)
         table_card.pack(fill=tk.BOTH, expand=True, padx=30, pady=10)
         
@@ -686,8 +823,7 @@ class AppTkinter:
             self.lbl_status_logs.config(text="Status: Carregando...", fg='#f39c12')
             self.root.update()
             
-            logs = self.repository.listar_logs(limite=200)
-            self.atualizar_tree_logs(logs)
+            logs = self.recarregar_logs()
             
             self.lbl_status_logs.config(text=f"Status: {len(logs)} logs carregados", fg='#27ae60')
             messagebox.showinfo("Sucesso", f"Carregados {len(logs)} logs")
@@ -695,10 +831,52 @@ class AppTkinter:
             self.lbl_status_logs.config(text=f"Status: Erro - {str(e)[:50]}", fg='#e74c3c')
             messagebox.showerror("Erro", f"Erro ao carregar logs: {str(e)}")
     
-    def atualizar_tree_logs(self, logs):
-        for item in self.tree_logs.get_children():
-            self.tree_logs.delete(item)
-        
+    def get_filtros_logs(self):
+        acao = self.combo_filtro_acao.get()
+        tabela = self.combo_filtro_tabela.get()
+        return (None if acao == 'Todos' else acao), (None if tabela == 'Todas' else tabela)
+    
+    def recarregar_logs(self):
+        acao, tabela = self.get_filtros_logs()
+        self.cursor_logs = CursorLogs(settings.LOGS_TAIL_OVERLAP_SECONDS)
+        logs = self.repository.listar_logs_novos(self.cursor_logs, acao=acao, tabela=tabela, limite=settings.LOGS_TAIL_MAX_ROWS)
+        self.atualizar_tree_logs(list(reversed(logs)))
+        return logs
+    
+    def carregar_logs_novos(self):
+        if self.cursor_logs is None:
+            return self.recarregar_logs()
+        acao, tabela = self.get_filtros_logs()
+        novos = self.repository.listar_logs_novos(self.cursor_logs, acao=acao, tabela=tabela, limite=settings.LOGS_TAIL_MAX_ROWS)
+        if novos:
+            for log in novos:
+                self.tree_logs.insert('', 0, values=self._valores_log(log))
+            excedentes = self.tree_logs.get_children()[settings.LOGS_TAIL_MAX_ROWS:]
+            if excedentes:
+                self.tree_logs.delete(*excedentes)
+            self.lbl_total_logs.config(text=f"Total de logs: {len(self.tree_logs.get_children())}")
+        return novos
+    
+    def alternar_tail_logs(self):
+        if self.job_tail_logs is not None:
+            self.root.after_cancel(self.job_tail_logs)
+            self.job_tail_logs = None
+        if self.tail_logs_var.get():
+            self.lbl_status_logs.config(text="Status: Tempo real ativo", fg='#27ae60')
+            self._tick_tail_logs()
+        else:
+            self.lbl_status_logs.config(text="Status: Tempo real pausado", fg='#f39c12')
+    
+    def _tick_tail_logs(self):
+        try:
+            novos = self.carregar_logs_novos()
+            if novos:
+                self.lbl_status_logs.config(text=f"Status: +{len(novos)} logs ({datetime.now().strftime('%H:%M:%S')})", fg='#27ae60')
+        except Exception as e:
+            print(f"Erro ao acompanhar logs: {e}")
+        self.job_tail_logs = self.root.after(settings.LOGS_TAIL_INTERVAL_MS, self._tick_tail_logs)
+    
+    def _valores_log(self, log):
         acao_icone = {
             'CRIAR': '✅',
             'ATUALIZAR': '✏️',
@@ -706,43 +884,34 @@ class AppTkinter:
             'VISUALIZAR': '👁️',
             'ENVIAR_EMAIL': '📧'
         }
+        icone = acao_icone.get(log.acao, '📋')
+        data_formatada = log.created_at[:19] if log.created_at else '-'
+        log_id = str(log.id)[:8] if log.id else '-'
+        return (
+            log_id,
+            data_formatada,
+            f"{icone} {log.acao}",
+            log.tabela,
+            log.registro_id or '-',
+            log.usuario
+        )
+    
+    def atualizar_tree_logs(self, logs):
+        for item in self.tree_logs.get_children():
+            self.tree_logs.delete(item)
         
         for log in logs:
-            icone = acao_icone.get(log.acao, '📋')
-            data_formatada = log.created_at[:19] if log.created_at else '-'
-            
-            log_id = str(log.id)[:8] if log.id else '-'
-            
-            self.tree_logs.insert('', tk.END, values=(
-                log_id,
-                data_formatada,
-                f"{icone} {log.acao}",
-                log.tabela,
-                log.registro_id or '-',
-                log.usuario
-            ))
+            self.tree_logs.insert('', tk.END, values=self._valores_log(log))
         
         self.lbl_total_logs.config(text=f"Total de logs: {len(logs)}")
     
     def aplicar_filtro_logs(self):
         try:
-            acao = self.combo_filtro_acao.get()
-            tabela = self.combo_filtro_tabela.get()
-            
             self.lbl_status_logs.config(text="Status: Filtrando...", fg='#f39c12')
             self.root.update()
             
-            if acao == 'Todos' and tabela == 'Todas':
-                logs = self.repository.listar_logs(limite=200)
-            elif acao != 'Todos' and tabela == 'Todas':
-                logs = self.repository.listar_logs_por_acao(acao, limite=200)
-            elif acao == 'Todos' and tabela != 'Todas':
-                logs = self.repository.listar_logs_por_tabela(tabela, limite=200)
-            else:
-                logs = self.repository.listar_logs(limite=200)
-                logs = [l for l in logs if l.acao == acao and l.tabela == tabela]
+            logs = self.recarregar_logs()
             
-            self.atualizar_tree_logs(logs)
             self.lbl_status_logs.config(text=f"Status: {len(logs)} logs encontrados", fg='#27ae60')
             messagebox.showinfo("Sucesso", f"Encontrados {len(logs)} logs")
         except Exception as e:
@@ -756,6 +925,7 @@ class AppTkinter:
                 self.root.update()
                 
                 self.repository.limpar_logs()
+                self.cursor_logs = None
                 self.atualizar_tree_logs([])
                 
                 self.lbl_status_logs.config(text="Status: Logs limpos", fg='#27ae60')
@@ -833,11 +1003,11 @@ class AppTkinter:
         table_card = tk.Frame(parent, bg='#323244', padx=20, pady=15)
         table_card.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
         
-        cols = ('Posição', 'Funcionário', 'Dias Trab.', 'Total Recebido', 'Média Diária', 'Maior', 'Menor', 'Pago', 'Pendente')
+        cols = ('Posição', 'Funcionário', 'Dias Trab.', 'Horas', 'Total Recebido', 'Média Diária', 'Maior', 'Menor', 'Pago', 'Pendente')
         self.tree_ranking = ttk.Treeview(table_card, columns=cols, show='headings', height=18)
         
-        widths = [60, 150, 80, 100, 90, 80, 80, 90, 90]
-        headings = ['Posição', 'Funcionário', 'Dias', 'Total', 'Média', 'Maior', 'Menor', 'Pago', 'Pendente']
+        widths = [60, 150, 80, 70, 100, 90, 80, 80, 90, 90]
+        headings = ['Posição', 'Funcionário', 'Dias', 'Horas', 'Total', 'Média', 'Maior', 'Menor', 'Pago', 'Pendente']
         
         for col, width, heading in zip(cols, widths, headings):
             self.tree_ranking.heading(col, text=heading)
@@ -928,7 +1098,9 @@ class AppTkinter:
 
     def atualizar_historico(self):
         try:
-            total = self.repository.get_total_funcionarios()
+            snapshot = self.repository_async.executar(
+                self.repository_async.get_historico_snapshot(limite_presenca=200, limite_pagamentos=200))
+            total = snapshot.total
             
             self.stats_labels['total_cadastrados'].config(text=str(total.total_cadastrados))
             self.stats_labels['total_registros'].config(text=str(total.total_registros))
@@ -937,17 +1109,10 @@ class AppTkinter:
             self.stats_labels['total_pago'].config(text=f"R$ {total.total_pago:,.2f}")
             self.stats_labels['total_pendente'].config(text=f"R$ {total.total_pendente:,.2f}")
             
-            ranking = self.repository.listar_ranking_pagamentos()
-            self.atualizar_tree_ranking(ranking)
-            
-            presenca = self.repository.listar_historico_presenca(limite=200)
-            self.atualizar_tree_presenca(presenca)
-            
-            pagamentos = self.repository.listar_historico_pagamentos(limite=200)
-            self.atualizar_tree_pagamentos(pagamentos)
-            
-            cadastramento = self.repository.listar_data_cadastramento()
-            self.atualizar_tree_cadastramento(cadastramento)
+            self.atualizar_tree_ranking(snapshot.ranking)
+            self.atualizar_tree_presenca(snapshot.presenca)
+            self.atualizar_tree_pagamentos(snapshot.pagamentos)
+            self.atualizar_tree_cadastramento(snapshot.cadastramento)
             
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao atualizar histórico: {str(e)}")
@@ -961,6 +1126,7 @@ class AppTkinter:
                 f"#{r.posicao}",
                 r.nome,
                 r.dias_trabalhados,
+                formatar_duracao(round(r.total_horas * 60)),
                 f"R$ {r.total_recebido:,.2f}",
                 f"R$ {r.media_diaria:,.2f}",
                 f"R$ {r.maior_diaria:,.2f}",
@@ -1360,15 +1526,34 @@ Clique nos botões abaixo para visualizar a documentação.
         tk.Label(janela, text=f"📊 Tabela: {table_name}", font=('Segoe UI', 14, 'bold'), 
                 fg='#00d4ff', bg="#1e1e2f").pack(pady=10)
         
+        colunas = self.get_colunas_tabela(table_name)
+        paginador = PaginadorTabela(self.repository, table_name, colunas, tamanho_pagina=settings.TABLE_BROWSER_PAGE_SIZE)
+        
+        filtro_frame = tk.Frame(janela, bg="#1e1e2f")
+        filtro_frame.pack(fill=tk.X, padx=20)
+        
+        tk.Label(filtro_frame, text="Filtrar:", fg='#ffffff', bg="#1e1e2f").pack(side=tk.LEFT)
+        combo_coluna = ttk.Combobox(filtro_frame, values=colunas, width=18, state='readonly')
+        combo_coluna.current(1 if len(colunas) > 1 else 0)
+        combo_coluna.pack(side=tk.LEFT, padx=5)
+        entry_filtro = tk.Entry(filtro_frame, width=30)
+        entry_filtro.pack(side=tk.LEFT, padx=5)
+        contem_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(filtro_frame, text="contém", variable=contem_var, fg='#ffffff', bg="#1e1e2f",
+                      selectcolor="#323244").pack(side=tk.LEFT, padx=5)
+        
         frame_tabela = tk.Frame(janela, bg="#323244")
         frame_tabela.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
         
-        colunas = self.get_colunas_tabela(table_name)
-        
         tree = ttk.Treeview(frame_tabela, columns=colunas, show='headings')
+        info_label = tk.Label(janela, text="", fg='#27ae60', bg="#1e1e2f")
+        
+        def ordenar(col):
+            paginador.ordenar(col)
+            self.atualizar_tree_view(tree, paginador, colunas, info_label)
         
         for col in colunas:
-            tree.heading(col, text=col)
+            tree.heading(col, text=col, command=lambda c=col: ordenar(c))
             tree.column(col, width=120)
         
         scrollbar_y = ttk.Scrollbar(frame_tabela, orient=tk.VERTICAL, command=tree.yview)
@@ -1382,65 +1567,76 @@ Clique nos botões abaixo para visualizar a documentação.
         frame_tabela.grid_rowconfigure(0, weight=1)
         frame_tabela.grid_columnconfigure(0, weight=1)
         
-        try:
-            dados = self.repository.client.table(table_name).select("*").execute()
-            
-            for registro in dados.data:
-                valores = []
-                for col in colunas:
-                    val = registro.get(col, '')
-                    if isinstance(val, dict):
-                        val = str(val)
-                    elif val is None:
-                        val = ''
-                    valores.append(val)
-                tree.insert('', tk.END, values=valores)
-            
-            tk.Label(janela, text=f"Total de registros: {len(dados.data)}", 
-                    fg='#27ae60', bg="#1e1e2f").pack(pady=5)
-            
-        except Exception as e:
-            tk.Label(janela, text=f"Erro ao carregar dados: {str(e)}", 
-                    fg='#e74c3c', bg="#1e1e2f").pack(pady=10)
+        info_label.pack(pady=5)
+        
+        def filtrar(event=None):
+            paginador.filtro_texto(combo_coluna.get(), entry_filtro.get(), contem_var.get())
+            self.atualizar_tree_view(tree, paginador, colunas, info_label)
+        
+        def navegar(numero):
+            paginador.pagina_atual = max(0, min(numero, paginador.total_paginas - 1))
+            self.atualizar_tree_view(tree, paginador, colunas, info_label)
+        
+        def recarregar():
+            paginador.recarregar()
+            self.atualizar_tree_view(tree, paginador, colunas, info_label)
+        
+        def fechar():
+            paginador.fechar()
+            janela.destroy()
+        
+        entry_filtro.bind('<Return>', filtrar)
+        tk.Button(filtro_frame, text="🔍 Aplicar", command=filtrar,
+                 bg='#3498db', fg='#ffffff', padx=10).pack(side=tk.LEFT, padx=5)
         
         btn_frame = tk.Frame(janela, bg="#1e1e2f")
         btn_frame.pack(pady=10)
         
-        tk.Button(btn_frame, text="🔄 Atualizar", command=lambda: self.atualizar_tree_view(tree, table_name, colunas),
+        tk.Button(btn_frame, text="⏮", command=lambda: navegar(0),
+                 bg='#323244', fg='#ffffff', padx=10).pack(side=tk.LEFT, padx=2)
+        tk.Button(btn_frame, text="◀ Anterior", command=lambda: navegar(paginador.pagina_atual - 1),
+                 bg='#323244', fg='#ffffff', padx=10).pack(side=tk.LEFT, padx=2)
+        tk.Button(btn_frame, text="Próxima ▶", command=lambda: navegar(paginador.pagina_atual + 1),
+                 bg='#323244', fg='#ffffff', padx=10).pack(side=tk.LEFT, padx=2)
+        tk.Button(btn_frame, text="⏭", command=lambda: navegar(paginador.total_paginas - 1),
+                 bg='#323244', fg='#ffffff', padx=10).pack(side=tk.LEFT, padx=(2, 15))
+        tk.Button(btn_frame, text="🔄 Atualizar", command=recarregar,
                  bg='#3498db', fg='#ffffff', padx=20).pack(side=tk.LEFT, padx=5)
-        tk.Button(btn_frame, text="❌ Fechar", command=janela.destroy,
+        tk.Button(btn_frame, text="❌ Fechar", command=fechar,
                  bg='#e74c3c', fg='#ffffff', padx=20).pack(side=tk.LEFT, padx=5)
-
-    def atualizar_tree_view(self, tree, table_name, colunas):
-        for item in tree.get_children():
-            tree.delete(item)
+        janela.protocol("WM_DELETE_WINDOW", fechar)
         
+        self.atualizar_tree_view(tree, paginador, colunas, info_label)
+
+    def atualizar_tree_view(self, tree, paginador, colunas, info_label=None):
         try:
-            dados = self.repository.client.table(table_name).select("*").execute()
-            
-            for registro in dados.data:
-                valores = []
-                for col in colunas:
-                    val = registro.get(col, '')
-                    if isinstance(val, dict):
-                        val = str(val)
-                    elif val is None:
-                        val = ''
-                    valores.append(val)
-                tree.insert('', tk.END, values=valores)
+            registros = paginador.pagina()
         except Exception as e:
-            messagebox.showerror("Erro", str(e))
+            messagebox.showerror("Erro", f"Erro ao carregar dados: {e}")
+            return
+        
+        tree.delete(*tree.get_children())
+        for registro in registros:
+            valores = []
+            for col in colunas:
+                val = registro.get(col, '')
+                if isinstance(val, dict):
+                    val = str(val)
+                elif val is None:
+                    val = ''
+                valores.append(val)
+            tree.insert('', tk.END, values=valores)
+        
+        for col in colunas:
+            seta = (" ▼" if paginador.desc else " ▲") if col == paginador.ordenar_por else ""
+            tree.heading(col, text=f"{col}{seta}")
+        
+        if info_label is not None:
+            info_label.config(text=f"Página {paginador.pagina_atual + 1} de {paginador.total_paginas}  •  "
+                                   f"Total de registros: {paginador.total or 0}")
 
     def get_colunas_tabela(self, table_name):
-        colunas = {
-            'funcionarios': ['id', 'nome', 'valor_10_percent', 'hora_entrada', 'hora_saida', 
-                           'dia_trabalho', 'observacao', 'vale', 'tipo_vale', 'pago', 'tipo_pagamento', 'created_at'],
-            'configuracoes': ['id', 'email_destinatario', 'email_remetente', 'senha_app', 'smtp_host', 'smtp_port', 'created_at'],
-            'observacoes_gerais': ['id', 'dia_trabalho', 'observacao', 'created_at'],
-            'registros_trabalho': ['id', 'dia_trabalho', 'dia_semana', 'total_funcionarios', 'total_valores', 'email_enviado', 'data_envio'],
-            'logs': ['id', 'acao', 'tabela', 'registro_id', 'dados_anteriores', 'dados_novos', 'usuario', 'created_at']
-        }
-        return colunas.get(table_name, ['id', 'created_at'])
+        return list(COLUNAS_TABELAS.get(table_name, ['id', 'created_at']))
 
     def inserir_registro(self, table_name):
         janela = tk.Toplevel(self.root)
@@ -1483,6 +1679,7 @@ Clique nos botões abaixo para visualizar a documentação.
             
             try:
                 self.repository.client.table(table_name).insert(dados).execute()
+                self.repository.invalidar_cache(table_name)
                 messagebox.showinfo("Sucesso", "Registro inserido com sucesso!")
                 janela.destroy()
             except Exception as e:
@@ -1574,6 +1771,7 @@ Clique nos botões abaixo para visualizar a documentação.
             
             try:
                 self.repository.client.table(table_name).update(dados).eq("id", record_id).execute()
+                self.repository.invalidar_cache(table_name)
                 messagebox.showinfo("Sucesso", "Registro atualizado com sucesso!")
                 janela.destroy()
             except Exception as e:
@@ -1620,6 +1818,7 @@ Clique nos botões abaixo para visualizar a documentação.
             
             try:
                 self.repository.client.table(table_name).delete().eq("id", record_id).execute()
+                self.repository.invalidar_cache(table_name)
                 messagebox.showinfo("Sucesso", "Registro deletado com sucesso!")
                 janela.destroy()
             except Exception as e:
@@ -1656,9 +1855,8 @@ Clique nos botões abaixo para visualizar a documentação.
             self.atualizar_tree_cadastro()
             
             try:
-                logs = self.repository.listar_logs(limite=200)
-                self.atualizar_tree_logs(logs)
-                self.lbl_status_logs.config(text=f"Status: {len(logs)} logs carregados", fg='#27ae60')
+                self.carregar_logs_novos()
+                self.lbl_status_logs.config(text=f"Status: {len(self.tree_logs.get_children())} logs carregados", fg='#27ae60')
             except Exception as log_e:
                 print(f"Erro ao carregar logs: {log_e}")
                 self.lbl_status_logs.config(text="Status: Erro ao carregar logs", fg='#e74c3c')
@@ -1693,12 +1891,11 @@ Clique nos botões abaixo para visualizar a documentação.
         try:
             dia = datetime.strptime(self.entry_dia.get(), "%Y-%m-%d").date()
             self.funcionarios = []
+            self.dia_carregado = None
             print(f"DEBUG: Carregando registros para a data: {dia}")
             
-            todos_funcs = self.repository.listar_todos_funcionarios()
-            print(f"DEBUG: Total de funcionários no banco: {len(todos_funcs)}")
-            
             self.funcionarios = self.repository.listar_funcionarios(dia)
+            self.dia_carregado = dia
             print(f"DEBUG: Registros encontrados para {dia}: {len(self.funcionarios)}")
             for f in self.funcionarios:
                 print(f"  - {f.nome}: {f.valor_10_percent}, dia: {f.dia_trabalho}")
@@ -1813,13 +2010,6 @@ Clique nos botões abaixo para visualizar a documentação.
                 except ValueError:
                     pass
             
-            print(f"DEBUG: Verificando se {nome} já existe no banco para {dia}")
-            
-            existente = self.repository.buscar_funcionario_por_nome_e_data(nome, dia)
-            
-            if existente:
-                print(f"DEBUG: Encontrou registro existente no banco: ID={existente.id}")
-            
             tipo_vale = self.combo_tipo.get() if self.combo_tipo.get() else None
             tipo_pagamento = self.combo_pagamento.get() if self.combo_pagamento.get() else "pix"
             
@@ -1836,13 +2026,8 @@ Clique nos botões abaixo para visualizar a documentação.
                 observacao=self.entry_obs.get().strip()
             )
             
-            if existente:
-                func.id = existente.id
-                self.repository.atualizar_funcionario(func)
-                msg = f"Registro de {nome} atualizado com sucesso!"
-            else:
-                self.repository.cadastrar_funcionario(func)
-                msg = f"Registro de {nome} adicionado com sucesso!"
+            salvos = self.repository.upsert_funcionarios([func])
+            msg = f"Registro de {nome} salvo com sucesso!"
             
             print(f"DEBUG: Registro salvo com sucesso")
             
@@ -1858,11 +2043,22 @@ Clique nos botões abaixo para visualizar a documentação.
             self.pago_var.set(False)
             self.entry_obs.delete(0, tk.END)
             
-            self.carregar_dia()
+            self.mesclar_registros_do_dia(dia, salvos)
             messagebox.showinfo("Sucesso", msg)
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao salvar: {str(e)}")
 
+    def mesclar_registros_do_dia(self, dia, salvos: List[Funcionario]):
+        if self.dia_carregado != dia:
+            self.funcionarios = self.repository.listar_funcionarios(dia)
+            self.dia_carregado = dia
+        else:
+            salvos_por_nome = {f.nome: f for f in salvos}
+            registros = [salvos_por_nome.pop(f.nome, f) for f in self.funcionarios]
+            registros.extend(salvos_por_nome.values())
+            self.funcionarios = registros
+        self.atualizar_tree_registrar()
+
     def salvar_registros(self):
         self.carregar_dia()
         messagebox.showinfo("Sucesso", "Dados salvos!")
@@ -1871,6 +2067,7 @@ Clique nos botões abaixo para visualizar a documentação.
         try:
             dia = datetime.strptime(self.entry_dia_envio.get(), "%Y-%m-%d").date()
             self.funcionarios = self.repository.listar_funcionarios(dia)
+            self.dia_carregado = dia
             self.atualizar_tree_envio()
             
             obs = self.repository.get_observacao_geral(dia)
@@ -1882,6 +2079,7 @@ Clique nos botões abaixo para visualizar a documentação.
 
     def limpar_dados_envio(self):
         self.funcionarios = []
+        self.dia_carregado = None
         for item in self.tree_envio.get_children():
             self.tree_envio.delete(item)
         self.txt_obs.delete('1.0', tk.END)
@@ -1892,16 +2090,15 @@ Clique nos botões abaixo para visualizar a documentação.
         for item in self.tree_envio.get_children():
             self.tree_envio.delete(item)
         
-        total = 0
         for f in self.funcionarios:
             self.tree_envio.insert('', tk.END, values=(
                 f.nome, f"{f.valor_10_percent:.2f}", f.hora_entrada, f.hora_saida,
                 f"{f.vale:.2f}" if f.vale else "-", f.tipo_vale or "pix",
                 "✅" if f.pago else "❌", f.observacao or "-"
             ))
-            total += f.valor_10_percent
         
-        self.lbl_total.config(text=f"Total: {len(self.funcionarios)} funcionários | Total 10%: R$ {total:.2f}")
+        resumo = ResumoValores.de_funcionarios(self.funcionarios)
+        self.lbl_total.config(text=f"Total: {resumo.quantidade} funcionários | Total 10%: R$ {resumo.total:.2f}")
 
     def salvar_obs_geral(self):
         try:
@@ -1940,10 +2137,7 @@ Clique nos botões abaixo para visualizar a documentação.
             return
         nome = self.tree_cadastro.item(sel[0])['values'][0]
         if messagebox.askyesno("Confirmar", f"Deseja deletar {nome}?"):
-            for f in self.repository.listar_funcionarios_base():
-                if f.nome == nome:
-                    self.repository.deletar_funcionario_base(str(f.id))
-                    break
+            self.repository.deletar_funcionario_base_por_nome(nome)
             self.carregar_dados()
             messagebox.showinfo("Sucesso", "Funcionário deletado!")
 
@@ -1951,15 +2145,36 @@ Clique nos botões abaixo para visualizar a documentação.
         if not messagebox.askyesno("Confirmar", "Deseja deletar TODOS os funcionários da base? Esta ação não pode ser desfeita!"):
             return
         
+        janela, progresso = self._criar_janela_progresso("Deletando funcionários")
         try:
             todos = self.repository.listar_funcionarios_base()
-            for f in todos:
-                self.repository.deletar_funcionario_base(str(f.id))
+            self.repository.deletar_funcionarios_base_por_ids([str(f.id) for f in todos], progresso=progresso)
+            janela.destroy()
             self.carregar_dados()
             messagebox.showinfo("Sucesso", "Todos os funcionários foram deletados!")
         except Exception as e:
+            janela.destroy()
             messagebox.showerror("Erro", str(e))
 
+    def _criar_janela_progresso(self, titulo):
+        janela = tk.Toplevel(self.root)
+        janela.title(titulo)
+        janela.configure(bg='#27293d')
+        janela.resizable(False, False)
+        janela.transient(self.root)
+        
+        lbl = self._create_label(janela, "Preparando...")
+        lbl.pack(padx=20, pady=(15, 5))
+        barra = ttk.Progressbar(janela, length=320, mode='determinate')
+        barra.pack(padx=20, pady=(0, 15))
+        
+        def progresso(feitos, total):
+            barra.config(maximum=max(total, 1), value=feitos)
+            lbl.config(text=f"{feitos} de {total} removidos")
+            janela.update()
+        
+        return janela, progresso
+
     def salvar_config(self):
         try:
             from data.models.funcionario import Configuracao
@@ -1980,31 +2195,47 @@ Clique nos botões abaixo para visualizar a documentação.
         try:
             dia = datetime.strptime(self.entry_dia_envio.get(), "%Y-%m-%d").date()
             report = ReportGenerator(self.funcionarios, dia)
-            ext = {"HTML": "html", "Excel": "xlsx", "DOCX": "docx", "CSV": "csv", "JSON": "json", "XML": "xml"}[self.formato_var.get()]
-            filename = filedialog.asksaveasfilename(defaultextension=f".{ext}")
+            formato = FORMATOS_RELATORIO[self.formato_var.get()]
+            filename = filedialog.asksaveasfilename(defaultextension=f".{formato.extensao}",
+                                                    initialfile=formato.nome_arquivo(dia))
             if filename:
-                if self.formato_var.get() == "HTML":
-                    with open(filename, 'w', encoding='utf-8') as f:
-                        f.write(report.generate_html())
-                elif self.formato_var.get() == "Excel":
-                    with open(filename, 'wb') as f:
-                        f.write(report.generate_excel())
-                elif self.formato_var.get() == "DOCX":
-                    with open(filename, 'wb') as f:
-                        f.write(report.generate_docx())
-                elif self.formato_var.get() == "CSV":
-                    with open(filename, 'w', encoding='utf-8') as f:
-                        f.write(report.generate_csv())
-                elif self.formato_var.get() == "JSON":
-                    with open(filename, 'wb') as f:
-                        f.write(report.generate_json())
-                elif self.formato_var.get() == "XML":
-                    with open(filename, 'wb') as f:
-                        f.write(report.generate_xml())
+                with open(filename, 'wb') as f:
+                    f.write(report.generate_format(formato.nome))
                 messagebox.showinfo("Sucesso", "Relatório gerado com sucesso!")
         except Exception as e:
             messagebox.showerror("Erro", str(e))
 
+    def atualizar_periodo(self):
+        tipo = self.periodo_var.get()
+        if tipo == "Personalizado":
+            return
+        try:
+            dia = datetime.strptime(self.entry_dia_envio.get(), "%Y-%m-%d").date()
+        except ValueError:
+            dia = date.today()
+        inicio, fim = periodo_semana(dia) if tipo == "Semana" else periodo_mes(dia)
+        for entry, valor in ((self.entry_periodo_inicio, inicio), (self.entry_periodo_fim, fim)):
+            entry.delete(0, tk.END)
+            entry.insert(0, valor.isoformat())
+
+    def exportar_periodo(self):
+        try:
+            inicio = datetime.strptime(self.entry_periodo_inicio.get(), "%Y-%m-%d").date()
+            fim = datetime.strptime(self.entry_periodo_fim.get(), "%Y-%m-%d").date()
+            formato = {"Excel": "excel", "CSV": "csv", "JSON Lines": "jsonl"}[self.formato_periodo_var.get()]
+            gerador = PeriodReportGenerator(self.repository, inicio, fim)
+            ext = FORMATOS_PERIODO[formato]
+            filename = filedialog.asksaveasfilename(defaultextension=f".{ext}",
+                                                    initialfile=f"relatorio_{inicio}_{fim}.{ext}")
+            if filename:
+                gerador.generate_format(formato, filename)
+                total = gerador.acumulador.total
+                self.lbl_periodo.config(text=f"{total.registros} registros • {len(gerador.acumulador.por_funcionario)} funcionários "
+                                             f"• R$ {de_centavos(total.centavos):.2f}")
+                messagebox.showinfo("Sucesso", f"Relatório do período salvo com {total.registros} registros!")
+        except Exception as e:
+            messagebox.showerror("Erro", str(e))
+
     def enviar_email(self):
         if not self.funcionarios:
             messagebox.showwarning("Aviso", "Carregue os dados primeiro")
@@ -2084,7 +2315,10 @@ def main():
             login_frame.destroy()
             app = AppTkinter(root)
             root.state('zoomed')
-            root.mainloop()
+            try:
+                root.mainloop()
+            finally:
+                app.repository.fechar()
         else:
             msg_label.config(text=result.get("error", "Erro ao fazer login"), fg='#e74c3c')
             entry_senha.delete(0, tk.END)
@@ -2099,4 +2333,5 @@ def main():
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
@@ -3,12 +3,20 @@ import pandas as pd
 from datetime import date, datetime, timedelta
 import sys
 import os
+import atexit
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from data.models.funcionario import Funcionario, Configuracao, ObservacaoGeral
+from data.models.dinheiro import ResumoValores, de_centavos
+from data.models.horarios import formatar_duracao
 from data.repositories.supabase_repository import SupabaseRepository
-from services.report_generator import ReportGenerator
+from data.repositories.async_supabase_repository import AsyncSupabaseRepository
+from data.repositories.instrumentacao import instrumentacao
+from data.repositories.log_buffer import CursorLogs
+from data.repositories.paginador import COLUNAS_TABELAS, PaginadorTabela, filtro_coluna
+from services.report_generator import FORMATOS_RELATORIO, ReportGenerator
+from services.period_report_generator import FORMATOS_PERIODO, PeriodReportGenerator, periodo_mes, periodo_semana
 from services.email_service import EmailService
 from services.auth_service import auth_service
 from config.settings import settings
@@ -95,12 +103,17 @@ with st.sidebar:
 
 if 'repository' not in st.session_state:
     st.session_state.repository = SupabaseRepository()
+    atexit.register(st.session_state.repository.fechar)
+if 'repository_async' not in st.session_state:
+    st.session_state.repository_async = AsyncSupabaseRepository(st.session_state.repository)
 
 if 'funcionarios' not in st.session_state:
     st.session_state.funcionarios = []
+    st.session_state.resumo_funcionarios = ResumoValores()
 
 def carregar_dados():
     st.session_state.funcionarios = st.session_state.repository.listar_todos_funcionarios()
+    st.session_state.resumo_funcionarios = ResumoValores.de_funcionarios(st.session_state.funcionarios)
 
 def get_funcionarios_do_dia(dia: date) -> list:
     return [f for f in st.session_state.funcionarios if f.dia_trabalho == dia]
@@ -120,7 +133,8 @@ def main():
             "🗄️ Banco de Dados",
             "📋 Logs",
             "📥 Download App Desktop",
-            "⚙️ Configurações"
+            "⚙️ Configurações",
+            "🩺 Diagnóstico"
         ]
     )
     
@@ -153,6 +167,8 @@ def main():
         pagina_download_desktop()
     elif menu == "⚙️ Configurações":
         pagina_configuracoes()
+    elif menu == "🩺 Diagnóstico":
+        pagina_diagnostico()
 
 def pagina_home():
     st.header("🏠 Bem-vindo ao Sistema!")
@@ -282,7 +298,7 @@ def pagina_home():
         
         st.metric("Funcionários", nomes)
         st.metric("Registros", len(todos))
-        st.metric("Total", f"R$ {sum(f.valor_10_percent for f in todos):.2f}")
+        st.metric("Total", f"R$ {st.session_state.resumo_funcionarios.total:.2f}")
         st.markdown('</div>', unsafe_allow_html=True)
     
     st.markdown("---")
@@ -331,13 +347,13 @@ def pagina_registro_diario():
             with col_d2:
                 st.info(f"**{dia_selecionado.strftime('%d/%m/%Y')}**")
             
-            carregar_dados()
-            funcs_dia = get_funcionarios_do_dia(dia_selecionado)
+            funcs_dia = st.session_state.repository.listar_funcionarios(dia_selecionado)
             
             st.markdown("---")
             st.markdown("### 💵 Registrar Valores")
             
             if funcs_dia:
+                alterados = []
                 for func in funcs_dia:
                     with st.expander(f"👤 {func.nome}"):
                         col_v1, col_v2 = st.columns(2)
@@ -352,12 +368,16 @@ def pagina_registro_diario():
                         with col_p2:
                             pago = st.checkbox("Pago", value=func.pago, key=f"pg_{func.id}")
                         
-                        func.valor_10_percent = valor
-                        func.vale = vale if vale > 0 else None
-                        func.tipo_pagamento = tipo_pag
-                        func.pago = pago
-                        st.session_state.repository.atualizar_funcionario(func)
+                        novo_vale = vale if vale > 0 else None
+                        if (valor, novo_vale, tipo_pag, pago) != (func.valor_10_percent, func.vale, func.tipo_pagamento, func.pago):
+                            func.valor_10_percent = valor
+                            func.vale = novo_vale
+                            func.tipo_pagamento = tipo_pag
+                            func.pago = pago
+                            alterados.append(func)
                 
+                if alterados:
+                    st.session_state.repository.upsert_funcionarios(alterados)
                 st.success(f"✅ {len(funcs_dia)} registros atualizados!")
             else:
                 st.warning("⚠️ Nenhum funcionário. Cadastre primeiro!")
@@ -369,9 +389,6 @@ def pagina_registro_diario():
             st.markdown('<div class="card">', unsafe_allow_html=True)
             st.markdown(f"### 📋 Registros de {dia_selecionado.strftime('%d/%m/%Y')}")
             
-            carregar_dados()
-            funcs_dia = get_funcionarios_do_dia(dia_selecionado)
-            
             if funcs_dia:
                 df = pd.DataFrame([
                     {"Nome": f.nome, "10%": f"R$ {f.valor_10_percent:.2f}", "Vale": f"R$ {f.vale:.2f}" if f.vale else "-", 
@@ -380,14 +397,13 @@ def pagina_registro_diario():
                 ])
                 st.dataframe(df, hide_index=True)
                 
-                total = sum(f.valor_10_percent for f in funcs_dia)
-                total_vale = sum(f.vale or 0 for f in funcs_dia)
+                resumo = ResumoValores.de_funcionarios(funcs_dia)
                 
                 st.markdown("---")
                 col_m1, col_m2, col_m3 = st.columns(3)
-                with col_m1: st.metric("Funcionários", len(funcs_dia))
-                with col_m2: st.metric("Total 10%", f"R$ {total:.2f}")
-                with col_m3: st.metric("Total Vales", f"R$ {total_vale:.2f}")
+                with col_m1: st.metric("Funcionários", resumo.quantidade)
+                with col_m2: st.metric("Total 10%", f"R$ {resumo.total:.2f}")
+                with col_m3: st.metric("Total Vales", f"R$ {resumo.total_vales:.2f}")
             else:
                 st.info(f"Nenhum registro")
             
@@ -468,12 +484,15 @@ def pagina_cadastro_funcionarios():
                 
                 st.markdown("---")
                 col_t1, col_t2 = st.columns(2)
-                with col_t1: st.metric("Total Geral", f"R$ {sum(f.valor_10_percent for f in todos):.2f}")
+                with col_t1: st.metric("Total Geral", f"R$ {st.session_state.resumo_funcionarios.total:.2f}")
                 with col_t2: st.metric("Registros", len(todos))
                 
                 if st.button("🗑️ Deletar Todos"):
                     try:
-                        for f in todos: st.session_state.repository.deletar_funcionario(str(f.id))
+                        barra = st.progress(0.0, text="Deletando...")
+                        st.session_state.repository.deletar_funcionarios_por_ids(
+                            [str(f.id) for f in todos if f.id],
+                            progresso=lambda feitos, total: barra.progress(feitos / total if total else 1.0, text=f"{feitos} de {total} removidos"))
                         st.success("Deletado!")
                         carregar_dados()
                         st.rerun()
@@ -512,7 +531,8 @@ def pagina_enviar_email():
             st.markdown('<div class="card">', unsafe_allow_html=True)
             st.markdown("### 📊 Gerar e Enviar Relatório")
             
-            formato = st.selectbox("Formato", ["HTML", "Excel", "DOCX", "CSV", "JSON", "XML"], index=0)
+            formato = st.selectbox("Formato", list(FORMATOS_RELATORIO), index=list(FORMATOS_RELATORIO).index("html"),
+                                   format_func=lambda nome: FORMATOS_RELATORIO[nome].rotulo)
             
             carregar_dados()
             funcs = get_funcionarios_do_dia(data_rel)
@@ -521,8 +541,8 @@ def pagina_enviar_email():
                 df = pd.DataFrame([{"Nome": f.nome, "10%": f.valor_10_percent, "Entrada": f.hora_entrada, "Saída": f.hora_saida, "Vale": f.vale or 0} for f in funcs])
                 st.dataframe(df, hide_index=True)
                 
-                total = sum(f.valor_10_percent for f in funcs)
-                st.metric("Total", f"R$ {total:.2f}")
+                resumo = ResumoValores.de_funcionarios(funcs)
+                st.metric("Total", f"R$ {resumo.total:.2f}")
                 
                 st.markdown("---")
                 col_b1, col_b2 = st.columns(2)
@@ -531,12 +551,9 @@ def pagina_enviar_email():
                     if st.button("📥 Gerar Relatório"):
                         try:
                             report = ReportGenerator(funcs, data_rel)
-                            if formato == "HTML": dados = report.generate_html(); st.download_button("📥 Download", dados, f"relatorio_{data_rel}.html", "text/html")
-                            elif formato == "Excel": dados = report.generate_excel(); st.download_button("📥 Download", dados, f"relatorio_{data_rel}.xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
-                            elif formato == "DOCX": dados = report.generate_docx(); st.download_button("📥 Download", dados, f"relatorio_{data_rel}.docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document")
-                            elif formato == "CSV": dados = report.generate_csv(); st.download_button("📥 Download", dados, f"relatorio_{data_rel}.csv", "text/csv")
-                            elif formato == "JSON": dados = report.generate_json(); st.download_button("📥 Download", dados, f"relatorio_{data_rel}.json", "application/json")
-                            elif formato == "XML": dados = report.generate_xml(); st.download_button("📥 Download", dados, f"relatorio_{data_rel}.xml", "application/xml")
+                            especificacao = FORMATOS_RELATORIO[formato]
+                            st.download_button("📥 Download", report.generate_format(formato),
+                                               especificacao.nome_arquivo(data_rel), especificacao.mime)
                             st.success("✅ Gerado!")
                         except Exception as e: st.error(f"❌ {e}")
                 
@@ -554,23 +571,54 @@ def pagina_enviar_email():
             else: st.warning(f"Nenhum para {data_rel.strftime('%d/%m/%Y')}")
             
             st.markdown('</div>', unsafe_allow_html=True)
+    
+    st.markdown("---")
+    st.markdown("### 📆 Relatório de Período")
+    
+    col_p1, col_p2, col_p3 = st.columns([1, 2, 1])
+    with col_p1:
+        tipo_periodo = st.radio("Período", ["Semana", "Mês", "Personalizado"], horizontal=True)
+    with col_p2:
+        if tipo_periodo == "Personalizado":
+            intervalo = st.date_input("Intervalo", (data_rel - timedelta(days=6), data_rel))
+            inicio, fim = intervalo if isinstance(intervalo, tuple) and len(intervalo) == 2 else (data_rel, data_rel)
+        else:
+            inicio, fim = periodo_semana(data_rel) if tipo_periodo == "Semana" else periodo_mes(data_rel)
+        st.caption(f"De {inicio.strftime('%d/%m/%Y')} a {fim.strftime('%d/%m/%Y')}")
+    with col_p3:
+        formato_periodo = st.selectbox("Formato do período", ["Excel", "CSV", "JSON Lines"])
+    
+    if st.button("📆 Gerar Relatório do Período"):
+        try:
+            chave, mime = {
+                "Excel": ("excel", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+                "CSV": ("csv", "text/csv"),
+                "JSON Lines": ("jsonl", "application/x-ndjson")
+            }[formato_periodo]
+            gerador = PeriodReportGenerator(st.session_state.repository, inicio, fim)
+            dados = gerador.generate_format(chave)
+            total = gerador.acumulador.total
+            st.success(f"✅ {total.registros} registros • {len(gerador.acumulador.por_funcionario)} funcionários • R$ {de_centavos(total.centavos):.2f}")
+            st.download_button("📥 Download", dados, f"relatorio_{inicio}_{fim}.{FORMATOS_PERIODO[chave]}", mime)
+        except Exception as e: st.error(f"❌ {e}")
 
 def pagina_historico():
     st.header("📊 Histórico e Estatísticas")
     
-    carregar_dados()
-    todos = st.session_state.funcionarios
+    repo_async = st.session_state.repository_async
+    snapshot = repo_async.executar(repo_async.get_historico_snapshot(limite_presenca=500, limite_pagamentos=500))
+    total = snapshot.total
     
-    if not todos: st.warning("Nenhum dado"); return
+    if not total.total_registros: st.warning("Nenhum dado"); return
     
-    nomes = list(set(f.nome for f in todos if f.nome))
+    nomes = sorted(r.nome for r in snapshot.ranking if r.nome)
     
     col_m1, col_m2, col_m3, col_m4, col_m5 = st.columns(5)
-    with col_m1: st.metric("👥", len(nomes))
-    with col_m2: st.metric("📝", len(todos))
-    with col_m3: st.metric("💰", f"R$ {sum(f.valor_10_percent for f in todos):.2f}")
-    with col_m4: st.metric("✅", f"R$ {sum(f.valor_10_percent for f in todos if f.pago):.2f}")
-    with col_m5: st.metric("⏳", f"R$ {sum(f.valor_10_percent for f in todos if not f.pago):.2f}")
+    with col_m1: st.metric("👥", total.total_cadastrados)
+    with col_m2: st.metric("📝", total.total_registros)
+    with col_m3: st.metric("💰", f"R$ {total.total_geral_pago:.2f}")
+    with col_m4: st.metric("✅", f"R$ {total.total_pago:.2f}")
+    with col_m5: st.metric("⏳", f"R$ {total.total_pendente:.2f}")
     
     st.markdown("---")
     
@@ -578,47 +626,43 @@ def pagina_historico():
     
     with tab1:
         st.markdown("### 🏆 Ranking")
-        dados = {}
-        for f in todos:
-            if f.nome not in dados: dados[f.nome] = {"dias": 0, "total": 0, "pago": 0, "pendente": 0}
-            dados[f.nome]["dias"] += 1
-            dados[f.nome]["total"] += f.valor_10_percent
-            if f.pago: dados[f.nome]["pago"] += f.valor_10_percent
-            else: dados[f.nome]["pendente"] += f.valor_10_percent
-        
-        ranking = [{"Pos": i+1, "Nome": n, "Dias": d["dias"], "Total": f"R$ {d['total']:.2f}", "Média": f"R$ {d['total']/d['dias']:.2f}", "Pago": f"R$ {d['pago']:.2f}", "Pendente": f"R$ {d['pendente']:.2f}"} for i, (n, d) in enumerate(sorted(dados.items(), key=lambda x: x[1]["total"], reverse=True))]
+        ranking = [{"Pos": r.posicao, "Nome": r.nome, "Dias": r.dias_trabalhados, "Horas": formatar_duracao(round(r.total_horas * 60)), "Total": f"R$ {r.total_recebido:.2f}", "Média": f"R$ {r.media_diaria:.2f}", "Pago": f"R$ {r.total_pago:.2f}", "Pendente": f"R$ {r.total_pendente:.2f}"} for r in snapshot.ranking]
         if ranking: st.dataframe(pd.DataFrame(ranking), hide_index=True)
     
     with tab2:
         st.markdown("### 📅 Presença")
         filtro = st.date_input("Filtrar", value=None, key="f_pres")
-        pres = todos if not filtro else [f for f in todos if f.dia_trabalho == filtro]
-        df = pd.DataFrame([{"Data": f.dia_trabalho.strftime('%d/%m/%Y') if f.dia_trabalho else "-", "Nome": f.nome, "Entrada": f.hora_entrada, "Saída": f.hora_saida, "Valor": f"R$ {f.valor_10_percent:.2f}"} for f in pres])
+        if filtro:
+            pres = [(f.dia_trabalho, f.nome, f.hora_entrada, f.hora_saida, f.valor_10_percent) for f in st.session_state.repository.listar_funcionarios(filtro)]
+        else:
+            pres = [(p.dia_trabalho, p.nome, p.hora_entrada, p.hora_saida, p.valor_10_percent) for p in snapshot.presenca]
+            st.caption(f"Últimos {len(pres)} registros")
+        df = pd.DataFrame([{"Data": d.strftime('%d/%m/%Y') if d else "-", "Nome": n, "Entrada": e, "Saída": s, "Valor": f"R$ {v:.2f}"} for d, n, e, s, v in pres])
         st.dataframe(df, hide_index=True)
     
     with tab3:
         st.markdown("### 💵 Pagamentos")
         fnome = st.selectbox("Funcionário", ["Todos"] + nomes, key="f_pag")
-        pgts = todos if fnome == "Todos" else [f for f in todos if f.nome == fnome]
-        df = pd.DataFrame([{"Nome": f.nome, "Data": f.dia_trabalho.strftime('%d/%m/%Y') if f.dia_trabalho else "-", "Valor": f"R$ {f.valor_10_percent:.2f}", "Tipo": f.tipo_pagamento, "Status": "✅" if f.pago else "⏳"} for f in pgts])
+        pgts = snapshot.pagamentos if fnome == "Todos" else [p for p in st.session_state.repository.buscar_historico_funcionario(fnome) if p.nome == fnome]
+        df = pd.DataFrame([{"Nome": p.nome, "Data": p.dia_trabalho.strftime('%d/%m/%Y') if p.dia_trabalho else "-", "Valor": f"R$ {p.valor_10_percent:.2f}", "Tipo": p.tipo_pagamento, "Status": "✅" if p.pago else "⏳"} for p in pgts])
         st.dataframe(df, hide_index=True)
     
     with tab4:
         st.markdown("### 📋 Cadastro")
-        cads = {}
-        for f in todos:
-            if f.nome not in cads: cads[f.nome] = {"prim": f.dia_trabalho, "ult": f.dia_trabalho, "dias": 0, "total": 0}
-            cads[f.nome]["dias"] += 1; cads[f.nome]["total"] += f.valor_10_percent
-            if f.dia_trabalho:
-                if cads[f.nome]["prim"] is None or f.dia_trabalho < cads[f.nome]["prim"]: cads[f.nome]["prim"] = f.dia_trabalho
-                if cads[f.nome]["ult"] is None or f.dia_trabalho > cads[f.nome]["ult"]: cads[f.nome]["ult"] = f.dia_trabalho
-        df = pd.DataFrame([{"Nome": n, "Primeiro": d["prim"].strftime('%d/%m/%Y') if d["prim"] else "-", "Último": d["ult"].strftime('%d/%m/%Y') if d["ult"] else "-", "Dias": d["dias"], "Total": f"R$ {d['total']:.2f}"} for n, d in cads.items()])
+        df = pd.DataFrame([{"Nome": c.nome, "Primeiro": c.primeiro_dia_trabalho.strftime('%d/%m/%Y') if c.primeiro_dia_trabalho else "-", "Último": c.ultimo_dia_trabalho.strftime('%d/%m/%Y') if c.ultimo_dia_trabalho else "-", "Dias": c.total_dias_trabalhados, "Total": f"R$ {c.total_recebido:.2f}"} for c in snapshot.cadastramento])
         st.dataframe(df, hide_index=True)
 
 def pagina_banco_dados():
     st.header("🗄️ Gerenciar Banco de Dados")
     
-    tabela = st.selectbox("Tabela", ["funcionarios", "configuracoes", "observacoes_gerais", "registros_trabalho", "logs"])
+    tabela = st.selectbox("Tabela", list(COLUNAS_TABELAS))
+    colunas = COLUNAS_TABELAS[tabela]
+    
+    paginadores = st.session_state.setdefault("paginadores", {})
+    if tabela not in paginadores:
+        paginadores[tabela] = PaginadorTabela(st.session_state.repository, tabela, colunas,
+                                              tamanho_pagina=settings.TABLE_BROWSER_PAGE_SIZE)
+    paginador = paginadores[tabela]
     
     col1, col2 = st.columns([1, 3])
     
@@ -627,12 +671,23 @@ def pagina_banco_dados():
             st.markdown('<div class="card">', unsafe_allow_html=True)
             st.markdown(f"### 📋 {tabela}")
             
-            if st.button("🔄 Carregar"):
-                try:
-                    dados = st.session_state.repository.client.table(tabela).select("*").execute()
-                    st.session_state.dados = dados.data
-                    st.success(f"{len(dados.data)} registros")
-                except Exception as e: st.error(f"Erro: {e}")
+            ordenar_por = st.selectbox("Ordenar por", colunas, index=colunas.index(paginador.ordenar_por), key=f"ordem_{tabela}")
+            desc = st.checkbox("Decrescente", value=paginador.desc, key=f"desc_{tabela}")
+            if (ordenar_por, desc) != (paginador.ordenar_por, paginador.desc):
+                paginador.ordenar(ordenar_por, desc)
+                st.session_state.pop(f"pagina_{tabela}", None)
+            
+            coluna_filtro = st.selectbox("Filtrar coluna", colunas, index=1 if len(colunas) > 1 else 0, key=f"filtro_col_{tabela}")
+            texto_filtro = st.text_input("Valor", key=f"filtro_txt_{tabela}")
+            contem = st.checkbox("Contém", value=True, key=f"filtro_contem_{tabela}")
+            filtros = filtro_coluna(tabela, coluna_filtro, texto_filtro, contem)
+            if filtros != paginador.filtros:
+                paginador.filtrar(filtros)
+                st.session_state.pop(f"pagina_{tabela}", None)
+            
+            if st.button("🔄 Recarregar"):
+                paginador.recarregar()
+                st.session_state.pop(f"pagina_{tabela}", None)
             
             st.markdown('</div>', unsafe_allow_html=True)
     
@@ -640,20 +695,39 @@ def pagina_banco_dados():
         with st.container():
             st.markdown('<div class="card">', unsafe_allow_html=True)
             st.markdown("### 📊 Dados")
-            if 'dados' in st.session_state and st.session_state.dados:
-                st.dataframe(pd.DataFrame(st.session_state.dados), hide_index=True)
-            else: st.info("Carregue os dados")
+            try:
+                dados = paginador.pagina()
+                if paginador.total_paginas > 1:
+                    numero = st.number_input("Página", min_value=1, max_value=paginador.total_paginas,
+                                             value=paginador.pagina_atual + 1, key=f"pagina_{tabela}")
+                    if numero - 1 != paginador.pagina_atual:
+                        dados = paginador.pagina(numero - 1)
+                st.caption(f"Página {paginador.pagina_atual + 1} de {paginador.total_paginas} • {paginador.total or 0} registros")
+                if dados:
+                    st.dataframe(pd.DataFrame(dados, columns=colunas), hide_index=True)
+                else: st.info("Nenhum registro encontrado")
+            except Exception as e: st.error(f"Erro: {e}")
             st.markdown('</div>', unsafe_allow_html=True)
 
 def pagina_logs():
     st.header("📋 Logs do Sistema")
     
-    col_l1, _ = st.columns([1, 4])
+    col_l1, col_l2, col_l3, _ = st.columns([1, 1, 1, 2])
+    with col_l2: acao = st.selectbox("Ação", ["Todos", "CRIAR", "ATUALIZAR", "DELETAR", "VISUALIZAR", "ENVIAR_EMAIL"])
+    with col_l3: tabela = st.selectbox("Tabela", ["Todas", "funcionarios", "configuracoes", "observacoes_gerais", "logs", "registros_trabalho"])
+    filtros = (None if acao == "Todos" else acao, None if tabela == "Todas" else tabela)
+    if st.session_state.get("logs_filtros") != filtros:
+        st.session_state.logs = []
+        st.session_state.logs_cursor = CursorLogs(settings.LOGS_TAIL_OVERLAP_SECONDS)
+        st.session_state.logs_filtros = filtros
+    
     with col_l1:
         if st.button("🔄 Atualizar"):
             try:
-                logs = st.session_state.repository.listar_logs(limite=200)
-                st.session_state.logs = logs
+                novos = st.session_state.repository.listar_logs_novos(
+                    st.session_state.logs_cursor, acao=filtros[0], tabela=filtros[1], limite=settings.LOGS_TAIL_MAX_ROWS)
+                if novos:
+                    st.session_state.logs = (list(reversed(novos)) + st.session_state.logs)[:settings.LOGS_TAIL_MAX_ROWS]
             except Exception as e: st.error(f"Erro: {e}")
     
     st.markdown("---")
@@ -761,14 +835,52 @@ def pagina_configuracoes():
             
             st.markdown("---")
             st.markdown("### 📋 Tabelas")
-            for t in ["funcionarios", "configuracoes", "observacoes_gerais", "registros_trabalho", "logs"]:
-                try:
-                    d = st.session_state.repository.client.table(t).select("*").execute()
-                    st.write(f"📊 **{t}**: {len(d.data)}")
-                except: st.write(f"📊 **{t}**: erro")
+            for t, total in st.session_state.repository.estatisticas_tabelas().items():
+                st.write(f"📊 **{t}**: {total if total is not None else 'erro'}")
+            
+            cache = st.session_state.repository.estatisticas_cache()
+            if cache:
+                st.markdown("---")
+                st.markdown("### ⚡ Cache de Consultas")
+                col_c1, col_c2, col_c3 = st.columns(3)
+                with col_c1: st.metric("Hits", cache["hits"])
+                with col_c2: st.metric("Misses", cache["misses"])
+                with col_c3: st.metric("Acerto", f"{cache['taxa_acerto']:.0%}")
             
             st.markdown('</div>', unsafe_allow_html=True)
 
+def pagina_diagnostico():
+    st.header("🩺 Diagnóstico do Repositório")
+    st.caption("Tempo por método do repositório. Backend = parcela do tempo esperando o Supabase; o restante é decodificação e agregação em Python.")
+    
+    col_d1, col_d2, col_d3, _ = st.columns([1, 1, 1, 2])
+    with col_d1:
+        if st.button("🧹 Zerar métricas"):
+            instrumentacao.limpar()
+    with col_d2:
+        st.download_button("📄 JSON", instrumentacao.exportar_json(), file_name="metricas_repositorio.json", mime="application/json")
+    with col_d3:
+        st.download_button("📈 Prometheus", instrumentacao.exportar_prometheus(), file_name="metricas_repositorio.prom", mime="text/plain")
+    
+    metricas = instrumentacao.snapshot()
+    if not metricas:
+        st.info("Nenhuma chamada registrada ainda" if instrumentacao.ativa else "Métricas desativadas; defina INSTRUMENTATION_ENABLED=true")
+        return
+    
+    df = pd.DataFrame([{
+        "Método": m["metodo"].split(".")[-1],
+        "Chamadas": m["chamadas"],
+        "Erros": m["erros"],
+        "p50 (ms)": round(m["p50"] * 1000, 1),
+        "p90 (ms)": round(m["p90"] * 1000, 1),
+        "p99 (ms)": round(m["p99"] * 1000, 1),
+        "Linhas": m["linhas"],
+        "Recebido (KB)": round(m["bytes"] / 1024, 1),
+        "Consultas": m["consultas"],
+        "Backend": f"{min(m['tempo_consultas'] / m['tempo_total'], 1) if m['tempo_total'] else 0:.0%}"
+    } for m in metricas])
+    st.dataframe(df, hide_index=True)
+
 
 if __name__ == "__main__":
     main()